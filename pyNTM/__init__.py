@@ -12,6 +12,7 @@ from .model import Model  # noqa: F401
 from .master_model import _MasterModel  # noqa: F401
 from .interface import Interface  # noqa: F401
 from .rsvp import RSVP_LSP  # noqa: F401
+from .simulation_result import SimulationResult  # noqa: F401
 
 # Backward compatibility aliases
 from .flex_model import FlexModel  # noqa: F401
@@ -0,0 +1,180 @@
+"""Constrained shortest path first (CSPF) for RSVP LSP placement"""
+
+import heapq
+import random
+
+
+class CSPF(object):
+    """
+    Constrained SPF engine for placing RSVP LSPs on the Model's routing graph.
+
+    Each LSP path search is a single Dijkstra run over the RSVP enabled
+    Interfaces in the routing graph that skips the Interfaces without enough
+    reservable bandwidth as it goes, reading it from the reservable_bandwidth
+    column of the Model's Interface state (see pyNTM.interface_state) by
+    Interface row.  No filtered graph is built and the shortest paths are
+    never enumerated: the number of lowest cost paths through each Node is
+    counted during the search and one path is drawn at random from the
+    counts.
+
+    The column is kept up to date as bandwidth is reserved or released on the
+    Interfaces, so the searches always see the current reservations.  The
+    adjacency is a snapshot of G, so a new CSPF is needed after G changes.
+
+    :param G: the Model's routing graph (see Model._sync_routing_graph)
+    :param interface_state: the InterfaceState holding the Interfaces in G
+    """
+
+    def __init__(self, G, interface_state):
+        self._interface_state = interface_state
+        self._interface_count = 0
+        # (remote node name, Interface row, cost) for each RSVP enabled
+        # Interface, keyed by the name of the Node the Interface is on
+        self._adjacency = {node_name: [] for node_name in G}
+        for node_name, remote_node_name, interface in G.edges(keys=True):
+            if interface.rsvp_enabled is not True:
+                continue
+            self._interface_count += 1
+            self._adjacency[node_name].append(
+                (remote_node_name, interface._row, interface.cost)
+            )
+
+    def __repr__(self):
+        return "CSPF(nodes = %s, interfaces = %s)" % (
+            len(self._adjacency),
+            self._interface_count,
+        )
+
+    def find_path(
+        self,
+        source_node_name,
+        dest_node_name,
+        needed_bw,
+        fewest_hops=True,
+        credit=None,
+    ):
+        """
+        Finds a lowest cost path from source_node_name to dest_node_name over
+        Interfaces with at least needed_bw of residual bandwidth.
+
+        If there is more than one lowest cost path, the paths with the fewest
+        hops are kept if fewest_hops is True, and one of the remaining paths
+        is chosen at random, each with the same chance.
+
+        :param source_node_name: name of source Node
+        :param dest_node_name: name of destination Node
+        :param needed_bw: bandwidth each Interface on the path must have available
+        :param fewest_hops: break ties between lowest cost paths on hop count
+        :param credit: (optional) dict of bandwidth to add back to the residual
+                       bandwidth of Interfaces, keyed by Interface; used for an
+                       LSP that already holds a reservation on those Interfaces
+        :return: list of Interfaces from source to destination, or None if
+                 there is no path with enough bandwidth
+        """
+        if source_node_name not in self._adjacency:
+            return None
+
+        credit_by_row = {}
+        if credit:
+            for interface, bandwidth in credit.items():
+                if interface._state is self._interface_state:
+                    credit_by_row[interface._row] = bandwidth
+
+        in_links, path_counts = self._search(
+            source_node_name, dest_node_name, needed_bw, fewest_hops, credit_by_row
+        )
+        if dest_node_name not in path_counts:
+            return None
+        return self._draw_path(source_node_name, dest_node_name, in_links, path_counts)
+
+    def _search(
+        self, source_node_name, dest_node_name, needed_bw, fewest_hops, credit_by_row
+    ):
+        """
+        Runs Dijkstra from source_node_name over the Interfaces with at least
+        needed_bw of residual bandwidth, settling Nodes until dest_node_name
+        is settled, and counts the lowest cost paths into each settled Node.
+
+        :return: (in_links, path_counts); in_links is a dict of the
+                 (Interface row, previous Node name) tuples on the lowest
+                 cost paths into each Node, and path_counts a dict of the
+                 number of those paths to each settled Node
+        """
+        adjacency = self._adjacency
+        reservable_bandwidth = self._interface_state.reservable_bandwidth
+        infinity = float("inf")
+
+        dist = {source_node_name: 0}
+        in_links = {source_node_name: []}
+        # Hop count and number of paths for the lowest cost paths to each
+        # settled Node; the hop count is only used if fewest_hops is True
+        hops = {}
+        path_counts = {}
+
+        heap = [(0, source_node_name)]
+        while heap:
+            node_dist, node_name = heapq.heappop(heap)
+            if node_name in path_counts or node_dist > dist[node_name]:
+                continue
+
+            # Every lowest cost path into node_name comes from a Node
+            # settled before it, so its counts are complete
+            if node_name == source_node_name:
+                hops[node_name] = 0
+                path_counts[node_name] = 1
+            else:
+                links = in_links[node_name]
+                if fewest_hops:
+                    min_hops = min(hops[previous] for _, previous in links)
+                    links = [link for link in links if hops[link[1]] == min_hops]
+                    in_links[node_name] = links
+                    hops[node_name] = min_hops + 1
+                path_counts[node_name] = sum(
+                    path_counts[previous] for _, previous in links
+                )
+
+            if node_name == dest_node_name:
+                break
+
+            for remote_node_name, row, cost in adjacency[node_name]:
+                available = reservable_bandwidth[row]
+                if credit_by_row:
+                    available += credit_by_row.get(row, 0)
+                if available < needed_bw or remote_node_name in path_counts:
+                    continue
+                next_dist = node_dist + cost
+                remote_dist = dist.get(remote_node_name, infinity)
+                if next_dist < remote_dist:
+                    dist[remote_node_name] = next_dist
+                    in_links[remote_node_name] = [(row, node_name)]
+                    heapq.heappush(heap, (next_dist, remote_node_name))
+                elif next_dist == remote_dist:
+                    in_links[remote_node_name].append((row, node_name))
+
+        return in_links, path_counts
+
+    def _draw_path(self, source_node_name, dest_node_name, in_links, path_counts):
+        """
+        Walks back from dest_node_name to source_node_name, choosing each hop
+        in proportion to the number of paths through it, so each lowest cost
+        path is drawn with the same chance.
+
+        :return: list of Interfaces from source to destination
+        """
+        interfaces = self._interface_state.interfaces
+        path = []
+        node_name = dest_node_name
+        while node_name != source_node_name:
+            links = in_links[node_name]
+            if len(links) == 1:
+                row, node_name = links[0]
+            else:
+                choice = random.randrange(path_counts[node_name])
+                for row, previous in links:
+                    choice -= path_counts[previous]
+                    if choice < 0:
+                        break
+                node_name = previous
+            path.append(interfaces[row])
+        path.reverse()
+        return path
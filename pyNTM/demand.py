@@ -1,8 +1,12 @@
 """A Demand is a traffic load that traverses the network from a source Node
 to a destination Node"""
 
+from .interface import Interface
+from .rsvp import RSVP_LSP
+from .versions import _Versioned
 
-class Demand(object):
+
+class Demand(_Versioned):
     """
     A representation of traffic load on the modeled network
     """
@@ -12,7 +16,10 @@ class Demand(object):
         self.dest_node_object = dest_node_object
         self.traffic = traffic
         self.name = name
-        self.path = "Unrouted"
+        self._path = "Unrouted"
+        # DagRoute for Demands that are IGP routed without LSP shortcuts;
+        # the explicit path list is built from it when self.path is read
+        self._dag_route = None
         self._path_detail = "Unrouted_detail"
 
         # Validate traffic value
@@ -24,6 +31,17 @@ class Demand(object):
         """Unique identifier for the demand: (Node('source').name, Node('dest').name, name)"""
         return (self.source_node_object.name, self.dest_node_object.name, self.name)
 
+    @property
+    def traffic(self):
+        """Magnitude of the Demand's traffic"""
+        return self._traffic
+
+    @traffic.setter
+    def traffic(self, traffic):
+        old_traffic = getattr(self, "_traffic", None)
+        self._traffic = traffic
+        self._bump_versions("demands", old_traffic)
+
     def __repr__(self):
         return "Demand(source = %s, dest = %s, traffic = %s, name = %r)" % (
             self.source_node_object.name,
@@ -32,6 +50,42 @@ class Demand(object):
             self.name,
         )
 
+    @property
+    def path(self):
+        """
+        Returns the Demand's path(s): 'Unrouted', or a list of paths where
+        each path is a list of the items (Interfaces and/or LSPs) that the
+        Demand takes from source to destination.
+
+        The paths of Demands that are IGP routed without any LSPs are kept as
+        a reference to the shortest path DAG from the source Node and are
+        expanded into explicit lists the first time they are read.
+        """
+        if self._path is None:
+            self._path = list(self._dag_route.paths())
+        return self._path
+
+    @path.setter
+    def path(self, value):
+        self._path = value
+        self._dag_route = None
+
+    def _set_dag_route(self, dag_route):
+        """
+        Sets the Demand's path to the shortest paths in dag_route (DagRoute)
+        without building the explicit path list
+        """
+        self._path = None
+        self._dag_route = dag_route
+
+    def _is_routed(self):
+        """
+        Is the Demand routed?  Does not build the explicit path list.
+
+        :return: Boolean
+        """
+        return self._path != "Unrouted"
+
     @property
     def path_detail(self):
         """
@@ -83,5 +137,75 @@ class Demand(object):
 
         :return: Dict of path entries (keys).  The value for each key is another dict with 3 keys: 'items', 'splits', and 'path_traffic'.  Each is described above.  # noqa E501
         """
+        # Demands whose load was propagated along a shortest path DAG
+        # have their path detail built the first time it is requested
+        if self._path_detail is None:
+            self._path_detail = self._make_path_detail()
 
         return self._path_detail
+
+    def _make_path_detail(self):
+        """
+        Builds the path detail (see path_detail) from self.path, splitting
+        the Demand traffic evenly across the unique next hops (Interfaces and/or
+        LSPs) at each Node along the paths.
+
+        :return: Dict of path entries; see path_detail
+        """
+        unique_next_hops = _find_unique_next_hops(
+            {item for path in self.path for item in path}
+        )
+
+        path_detail = {}
+        for path_counter, path in enumerate(self.path):
+            # Dict of cumulative splits per item
+            traffic_splits_per_item = {}
+
+            # Update the total cumulative splits in the path before
+            # traffic reaches each item in the path
+            total_splits = 1
+            for item in path:
+                total_splits = total_splits * len(
+                    unique_next_hops[_egress_node_name(item)]
+                )
+                traffic_splits_per_item[item] = total_splits
+
+            # Find path traffic
+            max_split = max([split for split in traffic_splits_per_item.values()])
+            path_traffic = float(self.traffic) / float(max_split)
+
+            path_detail["path_" + str(path_counter)] = {
+                "items": path,
+                "splits": traffic_splits_per_item,
+                "path_traffic": path_traffic,
+            }
+
+        return path_detail
+
+
+def _egress_node_name(item):
+    """
+    Returns the name of the Node that traffic egresses when it
+    takes item (Interface or RSVP_LSP)
+    """
+    if isinstance(item, Interface):
+        return item.node_object.name
+    elif isinstance(item, RSVP_LSP):
+        return item.source_node_object.name
+
+
+def _find_unique_next_hops(path_item_set):
+    """
+    From a set of items (Interfaces, RSVP_LSPs) from all of a Demand's paths,
+    determine the unique next hops from each Node.
+
+    :param path_item_set: a set of items (Interfaces, RSVP_LSPs) from all
+    the paths
+
+    :return: a dict with keys for each Node name and values being a list of each unique
+    next hop from that Node
+    """
+    unique_next_hops = {}
+    for item in path_item_set:
+        unique_next_hops.setdefault(_egress_node_name(item), []).append(item)
+    return unique_next_hops
@@ -0,0 +1,213 @@
+"""Columnar numpy table of Demands for very large traffic matrices"""
+
+import numpy as np
+
+from .exceptions import ModelException
+
+
+class DemandTable(object):
+    """
+    Demands held in numpy arrays, one row per Demand, instead of one Demand
+    object each: the source and destination Nodes as indexes into
+    node_names, the traffic, and the name as an index into names.  Millions
+    of Demands then take a few tens of bytes each.
+
+    A Model routes the Demands in its demand table (see
+    Model.set_demand_table) without making an object for each of them: the
+    rows with the same source and destination Nodes are routed together,
+    with their aggregate traffic.  A Demand object is made for a single row
+    when it is queried (see Model.get_table_demand).
+
+    The arrays can be changed in place, such as a new traffic column; the
+    Model reads them on each update_simulation().
+
+    Requires numpy.
+
+    :param node_names: list of Node names
+    :param source: array of source Node indexes into node_names
+    :param dest: array of destination Node indexes into node_names
+    :param traffic: array of Demand traffic
+    :param names: list of Demand names
+    :param name_index: array of Demand name indexes into names
+    """
+
+    def __init__(self, node_names, source, dest, traffic, names, name_index):
+        self.node_names = list(node_names)
+        self.source = np.asarray(source, dtype=np.int32)
+        self.dest = np.asarray(dest, dtype=np.int32)
+        self.traffic = np.asarray(traffic, dtype=float)
+        self.names = list(names)
+        self.name_index = np.asarray(name_index, dtype=np.int32)
+
+        for name in ("source", "dest", "traffic", "name_index"):
+            if getattr(self, name).shape != self.source.shape[:1]:
+                raise ModelException(
+                    "{} has shape {} for {} demands".format(
+                        name, getattr(self, name).shape, len(self.source)
+                    )
+                )
+        for name, values, size in (
+            ("source", self.source, len(self.node_names)),
+            ("dest", self.dest, len(self.node_names)),
+            ("name_index", self.name_index, len(self.names)),
+        ):
+            if len(values) and (values.min() < 0 or values.max() >= size):
+                raise ModelException("{} has indexes out of range".format(name))
+        if len(self.traffic) and not (self.traffic >= 0).all():
+            raise ModelException("traffic must be positive ints or floats")
+
+        # Index of each Node name and Demand name
+        self._node_index = {name: index for index, name in enumerate(self.node_names)}
+        self._name_index = {name: index for index, name in enumerate(self.names)}
+
+    def __repr__(self):
+        return "DemandTable(demands = %s, nodes = %s)" % (
+            len(self.source),
+            len(self.node_names),
+        )
+
+    def __len__(self):
+        return len(self.source)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Builds a table from rows of add_demand() arguments::
+
+            (source_node_name, dest_node_name, traffic, name)
+
+        traffic and name are optional.
+
+        :param rows: iterable of tuples
+        :return: DemandTable
+        """
+        node_index = {}
+        name_index = {}
+        source = []
+        dest = []
+        traffic = []
+        names = []
+        for row in rows:
+            source_node_name, dest_node_name, row_traffic, name = (
+                tuple(row) + (0, "none")[len(row) - 2 :]
+            )
+            source.append(node_index.setdefault(source_node_name, len(node_index)))
+            dest.append(node_index.setdefault(dest_node_name, len(node_index)))
+            traffic.append(row_traffic)
+            names.append(name_index.setdefault(name, len(name_index)))
+        return cls(list(node_index), source, dest, traffic, list(name_index), names)
+
+    @classmethod
+    def from_demands(cls, demands):
+        """
+        Builds a table from Demand objects
+
+        :param demands: iterable of Demand objects
+        :return: DemandTable
+        """
+        return cls.from_rows(
+            (
+                demand.source_node_object.name,
+                demand.dest_node_object.name,
+                demand.traffic,
+                demand.name,
+            )
+            for demand in demands
+        )
+
+    def key(self, row):
+        """
+        Returns the Demand key of row
+
+        :param row: row number
+        :return: (source node name, dest node name, demand name)
+        """
+        return (
+            self.node_names[self.source[row]],
+            self.node_names[self.dest[row]],
+            self.names[self.name_index[row]],
+        )
+
+    def find(self, source_node_name, dest_node_name, demand_name="none"):
+        """
+        Returns the row of the Demand with the given key
+
+        :param source_node_name: name of the Demand's source Node
+        :param dest_node_name: name of the Demand's destination Node
+        :param demand_name: name of the Demand
+        :return: row number; raises ModelException if there is no such Demand
+        """
+        try:
+            source = self._node_index[source_node_name]
+            dest = self._node_index[dest_node_name]
+            name = self._name_index[demand_name]
+        except KeyError:
+            raise ModelException("no matching demand")
+
+        rows = np.flatnonzero(
+            (self.source == source) & (self.dest == dest) & (self.name_index == name)
+        )
+        if not len(rows):
+            raise ModelException("no matching demand")
+        return int(rows[0])
+
+    def duplicate_keys(self):
+        """
+        Returns the Demand keys that are on more than one row
+
+        :return: list of Demand keys (source, dest, name)
+        """
+        key_codes, counts = np.unique(
+            self._pair_codes() * len(self.names) + self.name_index,
+            return_counts=True,
+        )
+        return [
+            self._pair(code // len(self.names)) + (self.names[code % len(self.names)],)
+            for code in key_codes[counts > 1].tolist()
+        ]
+
+    def _pair_codes(self):
+        """
+        Returns a code for the source and dest Node pair of each row
+        """
+        return self.source.astype(np.int64) * len(self.node_names) + self.dest
+
+    def _pair(self, pair_code):
+        """
+        Returns the (source node name, dest node name) pair for pair_code
+        """
+        return (
+            self.node_names[pair_code // len(self.node_names)],
+            self.node_names[pair_code % len(self.node_names)],
+        )
+
+    def pair_traffic(self):
+        """
+        Returns the aggregate traffic of the Demands for each distinct pair
+        of source and destination Nodes
+
+        :return: list of (source node name, dest node name, traffic) tuples
+        """
+        pair_codes, inverse = np.unique(self._pair_codes(), return_inverse=True)
+        traffic = np.bincount(
+            inverse.ravel(), weights=self.traffic, minlength=len(pair_codes)
+        )
+        return [
+            self._pair(pair_code) + (pair_traffic,)
+            for pair_code, pair_traffic in zip(pair_codes.tolist(), traffic.tolist())
+        ]
+
+    def pair_rows(self, pairs):
+        """
+        Returns the rows of the Demands from each (source node name,
+        dest node name) pair in pairs
+
+        :param pairs: iterable of (source node name, dest node name) tuples
+        :return: numpy array of rows
+        """
+        pair_codes = [
+            self._node_index[source] * len(self.node_names) + self._node_index[dest]
+            for source, dest in pairs
+            if source in self._node_index and dest in self._node_index
+        ]
+        return np.flatnonzero(np.isin(self._pair_codes(), pair_codes))
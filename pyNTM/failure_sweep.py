@@ -0,0 +1,209 @@
+"""N-1 failure sweeps of a Model, run across a pool of worker processes"""
+
+import contextlib
+import io
+import math
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+# Per process sweep state, set by _init_worker: the worker's copy of the
+# Model, its Interfaces in result order, the original failed state of the
+# Model's objects, and whether to keep each scenario's utilization
+_worker = {}
+
+
+def run_failure_sweep(
+    model,
+    circuits=True,
+    nodes=True,
+    srlgs=True,
+    max_workers=None,
+    per_scenario_utilization=True,
+):
+    """
+    Fails each Circuit, Node and SRLG in model one at a time, runs
+    update_simulation() for each failure and collects the results.  See
+    Model.failure_sweep for the returned data.
+
+    The failures are split into chunks that run in max_workers processes,
+    each with its own copy of model.  max_workers=1 runs the sweep in this
+    process, on a copy of model.
+
+    :param model: Model object
+    :param circuits: fail each Circuit
+    :param nodes: fail each Node
+    :param srlgs: fail each SRLG
+    :param max_workers: number of worker processes; defaults to the number of CPUs
+    :param per_scenario_utilization: include each scenario's Interface utilization
+    :return: dict of sweep results
+    """
+    model.validate_model()  # Make sure the Circuits are current
+
+    failures = _get_failures(model, circuits, nodes, srlgs)
+    interface_keys = sorted(interface._key for interface in model.interface_objects)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    # Several chunks per worker so that workers finishing early pick up more work
+    chunk_size = max(1, math.ceil(len(failures) / (max_workers * 4)))
+    chunks = [
+        failures[index : index + chunk_size]
+        for index in range(0, len(failures), chunk_size)
+    ]
+
+    initargs = (pickle.dumps(model), interface_keys, per_scenario_utilization)
+    if max_workers == 1 or len(chunks) <= 1:
+        _init_worker(*initargs)
+        try:
+            chunk_results = [_run_failures(chunk) for chunk in chunks]
+        finally:
+            _worker.clear()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=initargs
+        ) as executor:
+            chunk_results = list(executor.map(_run_failures, chunks))
+
+    scenarios = []
+    worst_case = [(None, None)] * len(interface_keys)
+    for chunk_scenarios, chunk_worst_case in chunk_results:
+        scenarios.extend(chunk_scenarios)
+        worst_case = [
+            _worse(worst, chunk_worst)
+            for worst, chunk_worst in zip(worst_case, chunk_worst_case)
+        ]
+
+    return {
+        "interfaces": interface_keys,
+        "scenarios": scenarios,
+        "worst_case_utilization": {
+            interface_key: {"utilization": utilization, "failure": failure}
+            for interface_key, (utilization, failure) in zip(interface_keys, worst_case)
+        },
+    }
+
+
+def _get_failures(model, circuits, nodes, srlgs):
+    """
+    Returns the failure scenarios for a sweep of model, skipping objects
+    that are already failed:
+
+    - ('circuit', Circuit._key())
+    - ('node', Node name)
+    - ('srlg', SRLG name)
+    """
+    failures = []
+    if circuits:
+        failures.extend(
+            ("circuit", circuit._key())
+            for circuit in sorted(model.circuit_objects, key=lambda ckt: ckt._key())
+            if not circuit.failed(model)
+        )
+    if nodes:
+        failures.extend(
+            ("node", node.name)
+            for node in sorted(model.node_objects, key=lambda node: node.name)
+            if not node.failed
+        )
+    if srlgs:
+        failures.extend(
+            ("srlg", srlg.name)
+            for srlg in sorted(model.srlg_objects, key=lambda srlg: srlg.name)
+            if not srlg.failed
+        )
+    return failures
+
+
+def _init_worker(model_data, interface_keys, per_scenario_utilization):
+    model = pickle.loads(model_data)
+    _worker["model"] = model
+    _worker["interfaces"] = [
+        model.interface_objects.lookup("key", interface_key)[0]
+        for interface_key in interface_keys
+    ]
+    _worker["failed_state"] = [
+        (model_object, model_object.failed)
+        for model_objects in (
+            model.interface_objects,
+            model.node_objects,
+            model.srlg_objects,
+        )
+        for model_object in model_objects
+    ]
+    _worker["per_scenario_utilization"] = per_scenario_utilization
+
+
+def _run_failures(failures):
+    """
+    Runs each failure in failures against the worker's Model
+
+    :param failures: list of failure scenarios from _get_failures
+    :return: list of scenario results, and the worst case (utilization, failure)
+             for each Interface across failures
+    """
+    model = _worker["model"]
+    interfaces = _worker["interfaces"]
+
+    scenarios = []
+    worst_case = [(None, None)] * len(interfaces)
+    for failure in failures:
+        _fail(model, failure)
+        with contextlib.redirect_stdout(io.StringIO()):
+            model._run_simulation()
+
+        utilization = [
+            None if interface.failed else interface.utilization
+            for interface in interfaces
+        ]
+        worst_case = [
+            _worse(worst, (interface_utilization, failure))
+            for worst, interface_utilization in zip(worst_case, utilization)
+        ]
+
+        scenario = {
+            "failure": failure,
+            "max_utilization": max(
+                (value for value in utilization if value is not None), default=None
+            ),
+            "unrouted_demands": sorted(
+                demand._key for demand in model.get_unrouted_demand_objects()
+            ),
+            "unrouted_lsps": sorted(
+                lsp._key for lsp in model.rsvp_lsp_objects if lsp.path == "Unrouted"
+            ),
+        }
+        if _worker["per_scenario_utilization"]:
+            scenario["utilization"] = utilization
+        scenarios.append(scenario)
+
+        # Put the failed state of every object back for the next failure
+        for model_object, failed in _worker["failed_state"]:
+            model_object._failed = failed
+        model.versions.bump("topology")
+
+    return scenarios, worst_case
+
+
+def _fail(model, failure):
+    failure_type, name = failure
+    if failure_type == "circuit":
+        interface_name, node_name = name[0]
+        model.fail_interface(interface_name, node_name)
+    elif failure_type == "node":
+        model.fail_node(name)
+    else:
+        model.fail_srlg(name)
+
+
+def _worse(worst, candidate):
+    """
+    Returns the (utilization, failure) pair with the higher utilization;
+    a utilization of None (Interface down) never wins
+    """
+    if candidate[0] is None:
+        return worst
+    if worst[0] is None or candidate[0] > worst[0]:
+        return candidate
+    return worst
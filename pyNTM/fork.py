@@ -0,0 +1,266 @@
+"""Forks of a Model for what-if scenarios; see Model.fork"""
+
+import copy
+
+import networkx as nx
+
+from .path_cache import PathCache
+from .spf import DagRoute
+from .spf import SPFDag
+from .versions import ModelVersions
+
+
+def fork_model(model):
+    """
+    Returns an independent copy of model, with its simulation results.
+
+    Each Node, SRLG, Interface, Circuit, RSVP LSP and Demand is copied with
+    a shallow copy of its attributes: names, numbers and other immutable
+    values are shared with model, and the references to other Model
+    objects, the SRLG memberships and the LSP and Demand paths are pointed
+    at the fork's objects.  The shortest path DAGs are shared with model
+    except for their ECMP Interface lists, which are small, so IGP routed
+    Demands are forked as references to the fork's DAGs and their explicit
+    paths are only rebuilt if they are requested.  The routing graph, the
+    version counters (see Model.versions) and the baseline for incremental
+    updates are carried over, so update_simulation(incremental=True) on
+    the fork starts from model's last simulation.  The Interface state
+    columns (see Model.interface_state) are copied, so the fork's
+    Interfaces keep the same rows.
+
+    :param model: Model object
+    :return: Model object
+    """
+    forker = _Forker(model)
+    return forker.fork()
+
+
+class _Forker(object):
+    """
+    Copies the objects of a Model into a fork, keeping a map from the id of
+    each original object to its copy
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.copies = {}
+        self.spf_dags = {}
+        self.ecmp_links = {}
+        self.dag_routes = {}
+
+    def remap(self, value):
+        """
+        Returns value with every original object in it replaced by its copy;
+        lists, tuples, sets and dicts are rebuilt, other values are returned
+        as they are
+        """
+        if id(value) in self.copies:
+            return self.copies[id(value)]
+        if isinstance(value, list):
+            return [self.remap(item) for item in value]
+        if isinstance(value, dict):
+            return {self.remap(key): self.remap(item) for key, item in value.items()}
+        if isinstance(value, tuple):
+            return tuple(self.remap(item) for item in value)
+        if isinstance(value, set):
+            return {self.remap(item) for item in value}
+        return value
+
+    def copy_object(self, model_object):
+        """
+        Returns a shallow copy of model_object, sharing its attribute values
+        """
+        object_copy = model_object.__class__.__new__(model_object.__class__)
+        object_copy.__dict__.update(model_object.__dict__)
+        self.copies[id(model_object)] = object_copy
+        return object_copy
+
+    def copy_spf_dag(self, spf_dag):
+        """
+        Returns spf_dag with its ECMP Interface lists remapped; the
+        predecessor lists and distances are shared since SPFDags are not
+        changed once computed (see SPFDag.repair)
+        """
+        try:
+            return self.spf_dags[id(spf_dag)]
+        except KeyError:
+            pass
+        ecmp_links = spf_dag._ecmp_links
+        if id(ecmp_links) not in self.ecmp_links:
+            self.ecmp_links[id(ecmp_links)] = {
+                node_pair: self.remap(interfaces)
+                for node_pair, interfaces in ecmp_links.items()
+            }
+        spf_dag_copy = SPFDag._from_parts(
+            spf_dag.source_node_name,
+            spf_dag.pred,
+            spf_dag.dist,
+            self.ecmp_links[id(ecmp_links)],
+        )
+        self.spf_dags[id(spf_dag)] = spf_dag_copy
+        return spf_dag_copy
+
+    def copy_dag_route(self, dag_route):
+        """
+        Returns a DagRoute on the copy of dag_route's SPFDag, one for each
+        DagRoute shared by Demands in the original Model
+        """
+        try:
+            return self.dag_routes[id(dag_route)]
+        except KeyError:
+            dag_route_copy = DagRoute(
+                self.copy_spf_dag(dag_route.spf_dag), dag_route.dest_node_name
+            )
+            self.dag_routes[id(dag_route)] = dag_route_copy
+            return dag_route_copy
+
+    def copy_demand(self, demand):
+        """
+        Returns a copy of demand, with its path on the fork's objects
+        """
+        demand_copy = self.copy_object(demand)
+        demand_copy.source_node_object = self.remap(demand.source_node_object)
+        demand_copy.dest_node_object = self.remap(demand.dest_node_object)
+        if demand._dag_route is not None:
+            # The explicit paths and path detail are built from the
+            # DagRoute if they are requested
+            demand_copy._set_dag_route(self.copy_dag_route(demand._dag_route))
+            demand_copy._path_detail = None
+        else:
+            demand_copy._path = self.remap(demand._path)
+            demand_copy._path_detail = self.remap(demand._path_detail)
+        return demand_copy
+
+    def copy_routing_graph(self, fork):
+        """
+        Copies model's routing graph into fork, with the edges keyed by the
+        fork's Interfaces, in the same order
+        """
+        G = nx.MultiDiGraph()
+        G.add_nodes_from(self.model._routing_graph)
+        edges = {}
+        for (
+            node_name,
+            remote_node_name,
+            interface,
+            edge,
+        ) in self.model._routing_graph.edges(keys=True, data=True):
+            interface_copy = self.remap(interface)
+            G.add_edge(
+                node_name,
+                remote_node_name,
+                key=interface_copy,
+                cost=edge["cost"],
+                interface=interface_copy,
+                circuit_id=edge["circuit_id"],
+            )
+            edges[interface_copy] = (
+                node_name,
+                remote_node_name,
+                G[node_name][remote_node_name][interface_copy],
+            )
+        fork._routing_graph = G
+        fork._routing_graph_edges = edges
+
+    def copy_versions(self):
+        """
+        Returns a copy of model's ModelVersions, with the changes tracked by
+        object remapped; changed objects no longer in model are dropped
+        """
+        versions = ModelVersions()
+        versions._versions = dict(self.model._versions._versions)
+        versions._changes = {
+            kind: {
+                self.copies[id(model_object)]: old_value
+                for model_object, old_value in changes.items()
+                if id(model_object) in self.copies
+            }
+            for kind, changes in self.model._versions._changes.items()
+        }
+        return versions
+
+    def fork(self):
+        model = self.model
+        model._adopt_interfaces()
+        fork = model.__class__.__new__(model.__class__)
+        fork.__dict__.update(model.__dict__)
+
+        nodes = [self.copy_object(node) for node in model.node_objects]
+        srlgs = [self.copy_object(srlg) for srlg in model.srlg_objects]
+        interfaces = [
+            self.copy_object(interface) for interface in model.interface_objects
+        ]
+        circuits = [self.copy_object(circuit) for circuit in model.circuit_objects]
+        lsps = [self.copy_object(lsp) for lsp in model.rsvp_lsp_objects]
+
+        for node in nodes:
+            node._srlgs = self.remap(node._srlgs)
+        for srlg in srlgs:
+            srlg.model = fork
+        interface_state = model._interface_state.copy()
+        interface_state.interfaces = self.remap(interface_state.interfaces)
+        fork._interface_state = interface_state
+        for interface in interfaces:
+            interface._state = interface_state
+            interface.node_object = self.remap(interface.node_object)
+            interface.remote_node_object = self.remap(interface.remote_node_object)
+            interface._srlgs = self.remap(interface._srlgs)
+        for circuit in circuits:
+            circuit.interface_a = self.remap(circuit.interface_a)
+            circuit.interface_b = self.remap(circuit.interface_b)
+        for lsp in lsps:
+            lsp.source_node_object = self.remap(lsp.source_node_object)
+            lsp.dest_node_object = self.remap(lsp.dest_node_object)
+            lsp.path = self.remap(lsp.path)
+        demands = [self.copy_demand(demand) for demand in model.demand_objects]
+        fork._demand_table_demands = {
+            group: self.copy_demand(demand)
+            for group, demand in model._demand_table_demands.items()
+        }
+
+        fork._versions = self.copy_versions()
+        for attribute, members in (
+            ("_node_objects", nodes),
+            ("_srlg_objects", srlgs),
+            ("_interface_objects", interfaces),
+            ("_circuit_objects", circuits),
+            ("_rsvp_lsp_objects", lsps),
+            ("_demand_objects", demands),
+        ):
+            object_set = getattr(model, attribute)
+            object_set_copy = type(object_set)(members)
+            # The set versions are kept for the incremental update baseline
+            object_set_copy._version = object_set._version
+            object_set_copy._add_owner(fork._versions)
+            self.copies[id(object_set)] = object_set_copy
+            setattr(fork, attribute, object_set_copy)
+        fork._interface_objects._set_state(interface_state)
+
+        for attribute in ("_parallel_lsp_groups", "_parallel_demand_groups"):
+            setattr(fork, attribute, self.remap(getattr(model, attribute)))
+
+        if model._demand_table is not None:
+            demand_table = copy.copy(model._demand_table)
+            for attribute in ("source", "dest", "traffic", "name_index"):
+                setattr(
+                    demand_table, attribute, getattr(demand_table, attribute).copy()
+                )
+            fork._demand_table = demand_table
+
+        self.copy_routing_graph(fork)
+        fork._spf_dags = {
+            source_node_name: self.copy_spf_dag(spf_dag)
+            for source_node_name, spf_dag in model._spf_dags.items()
+        }
+        fork._path_cache = PathCache(model._path_cache.maxsize)
+        for key, version, value in model._path_cache.items():
+            if key[0] == "spf_dag":
+                fork._path_cache.put(key, version, self.copy_spf_dag(value))
+
+        fork._simulation_baseline = self.remap(model._simulation_baseline)
+        fork._routing_graph_changes = self.remap(model._routing_graph_changes)
+        fork._batch_edit_depth = 0
+        fork._igp_routed_demands = None
+        fork._cspf = None
+        fork._routing_index = None
+        return fork
@@ -0,0 +1,295 @@
+"""Sets of Model objects that keep lookup indexes of their members"""
+
+
+class IndexedSet(set):
+    """
+    A set that keeps dict indexes of its members so the Model can find
+    objects by key without scanning the whole set.
+
+    Each index maps a key, computed from a member by the index's key function,
+    to a list of the members with that key.  The indexes are updated as members
+    are added or removed with add, remove, discard and pop.  The other in-place
+    set operations (update, clear, ``|=``, etc.) drop the indexes, which are
+    rebuilt on the next lookup.
+
+    Index keys are computed when a member is added.  If a member attribute
+    used in a key changes (an Interface name, for example), the member must
+    be removed before the change and added back after it, which the set's hash
+    based membership already requires.
+
+    Subclasses define their indexes in _index_keys, a dict of key functions
+    keyed by index name.
+
+    _version is incremented each time the members of the set change, so
+    results computed from the set can be checked for staleness.
+
+    A set held by a Model also bumps the Model's _version_kind version
+    counter (see pyNTM.versions.ModelVersions) when its members change, and
+    hands the Model's ModelVersions to each member as it is added so the
+    member's property setters can bump them.  Members removed by the
+    in-place set operations other than remove, discard and pop keep the
+    Model's ModelVersions; their changes only cause needless recomputation.
+
+    :param iterable: (optional) initial members
+    """
+
+    _index_keys = {}
+
+    # ModelVersions counter bumped when the members change; None for none
+    _version_kind = None
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self._indexes = None
+        self._version = 0
+        self._owners = ()
+
+    def __reduce__(self):
+        # The indexes are rebuilt instead of pickled
+        return (
+            self.__class__,
+            (list(self),),
+            {"_version": self._version, "_owners": self._owners},
+        )
+
+    def _add_owner(self, versions):
+        """
+        Bumps versions (ModelVersions) along with the set's version from now
+        on and hands it to the members
+
+        :param versions: ModelVersions of the Model holding the set
+        :return: None
+        """
+        if self._version_kind is None or versions in self._owners:
+            return
+        self._owners += (versions,)
+        for member in self:
+            member._add_model_versions(versions)
+
+    def _changed(self, added=(), removed=()):
+        self._version += 1
+        for versions in self._owners:
+            versions.bump(self._version_kind)
+            for member in added:
+                member._add_model_versions(versions)
+            for member in removed:
+                member._remove_model_versions(versions)
+
+    def _build_indexes(self):
+        self._indexes = {index_name: {} for index_name in self._index_keys}
+        for member in self:
+            self._index_member(member)
+        return self._indexes
+
+    def _index_member(self, member):
+        for index_name, key_function in self._index_keys.items():
+            self._indexes[index_name].setdefault(key_function(member), []).append(
+                member
+            )
+
+    def _unindex_member(self, member):
+        if self._indexes is None:
+            return
+        for index_name, key_function in self._index_keys.items():
+            members = self._indexes[index_name].get(key_function(member), [])
+            for position, indexed_member in enumerate(members):
+                if indexed_member is member:
+                    del members[position]
+                    if not members:
+                        del self._indexes[index_name][key_function(member)]
+                    break
+            else:
+                # The member's key changed after it was indexed
+                self._indexes = None
+                return
+
+    def lookup(self, index_name, key):
+        """
+        Returns the members with key in the index_name index
+
+        :param index_name: name of the index
+        :param key: key to look up
+        :return: list of members; empty list if there are none
+        """
+        indexes = self._indexes if self._indexes is not None else self._build_indexes()
+        return list(indexes[index_name].get(key, []))
+
+    def add(self, member):
+        if member not in self:
+            super().add(member)
+            self._changed(added=(member,))
+            if self._indexes is not None:
+                self._index_member(member)
+
+    def remove(self, member):
+        super().remove(member)
+        self._changed(removed=(member,))
+        self._unindex_member(member)
+
+    def discard(self, member):
+        if member in self:
+            self.remove(member)
+
+    def pop(self):
+        member = super().pop()
+        self._changed(removed=(member,))
+        self._unindex_member(member)
+        return member
+
+    def clear(self):
+        super().clear()
+        self._indexes = None
+        self._changed()
+
+    def update(self, *others):
+        super().update(*others)
+        self._indexes = None
+        self._changed(added=self)
+
+    def difference_update(self, *others):
+        super().difference_update(*others)
+        self._indexes = None
+        self._changed()
+
+    def intersection_update(self, *others):
+        super().intersection_update(*others)
+        self._indexes = None
+        self._changed()
+
+    def symmetric_difference_update(self, other):
+        super().symmetric_difference_update(other)
+        self._indexes = None
+        self._changed(added=self)
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._indexes = None
+        self._changed(added=self)
+        return self
+
+    def __iand__(self, other):
+        super().__iand__(other)
+        self._indexes = None
+        self._changed()
+        return self
+
+    def __isub__(self, other):
+        super().__isub__(other)
+        self._indexes = None
+        self._changed()
+        return self
+
+    def __ixor__(self, other):
+        super().__ixor__(other)
+        self._indexes = None
+        self._changed(added=self)
+        return self
+
+
+class NodeSet(IndexedSet):
+    """Set of Nodes, indexed by name"""
+
+    _index_keys = {"name": lambda node: node.name}
+    _version_kind = "topology"
+
+
+class InterfaceSet(IndexedSet):
+    """
+    Set of Interfaces, indexed by:
+
+    - 'key': (Interface name, Node name)
+    - 'node': Node name
+    - 'node_pair': (Node name, remote Node name)
+    - 'circuit_id': (Node name, circuit_id)
+    """
+
+    _index_keys = {
+        "key": lambda interface: interface._key,
+        "node": lambda interface: interface.node_object.name,
+        "node_pair": lambda interface: (
+            interface.node_object.name,
+            interface.remote_node_object.name,
+        ),
+        "circuit_id": lambda interface: (
+            interface.node_object.name,
+            interface.circuit_id,
+        ),
+    }
+    _version_kind = "topology"
+
+    # InterfaceState of the Model holding the set; see _set_state
+    _state = None
+
+    def __reduce__(self):
+        constructor, args, state = super().__reduce__()
+        state["_state"] = self._state
+        return constructor, args, state
+
+    def _set_state(self, interface_state):
+        """
+        Keeps the state of the members in interface_state (see
+        pyNTM.interface_state) from now on: the members are moved into it as
+        they are added and out of it as they are removed
+
+        :param interface_state: InterfaceState of the Model holding the set
+        :return: None
+        """
+        self._state = interface_state
+        interface_state.retain(self)
+        interface_state.adopt_all(self)
+
+    def _changed(self, added=(), removed=()):
+        super()._changed(added, removed)
+        interface_state = self._state
+        if interface_state is None:
+            return
+        if removed:
+            for member in removed:
+                interface_state.release(member)
+        elif added is self or not added:
+            # Members may have been removed by an in-place set operation
+            interface_state.retain(self)
+        for member in added:
+            interface_state.adopt(member)
+
+
+class DemandSet(IndexedSet):
+    """
+    Set of Demands, indexed by:
+
+    - 'key': (source Node name, dest Node name, Demand name)
+    - 'source': source Node name
+    - 'dest': dest Node name
+    """
+
+    _index_keys = {
+        "key": lambda demand: demand._key,
+        "source": lambda demand: demand.source_node_object.name,
+        "dest": lambda demand: demand.dest_node_object.name,
+    }
+    _version_kind = "demands"
+
+
+class RSVPLSPSet(IndexedSet):
+    """Set of RSVP_LSPs, indexed by 'key': (source Node name, dest Node name, LSP name)"""
+
+    _index_keys = {"key": lambda lsp: lsp._key}
+    _version_kind = "lsps"
+
+
+class SRLGSet(IndexedSet):
+    """Set of SRLGs, indexed by name"""
+
+    _index_keys = {"name": lambda srlg: srlg.name}
+
+
+class CircuitSet(IndexedSet):
+    """
+    Set of Circuits, indexed by the (Interface name, Node name) key of
+    each of the Circuit's Interfaces: 'interface_a' and 'interface_b'
+    """
+
+    _index_keys = {
+        "interface_a": lambda circuit: circuit.interface_a._key,
+        "interface_b": lambda circuit: circuit.interface_b._key,
+    }
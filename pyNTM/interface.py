@@ -1,13 +1,26 @@
 """An object representing a Node interface"""
 
+import math
+
 from .exceptions import ModelException
+from .interface_state import InterfaceState
 
 # from .rsvp import RSVP_LSP
 from .srlg import SRLG
+from .versions import _Versioned
+
 
+class Interface(_Versioned):
+    """
+    An object representing a Node's Interface.
 
-class Interface(object):
-    """An object representing a Node's Interface"""
+    The Interface's capacity, cost, RSVP settings, failed state, traffic and
+    reserved bandwidth are kept in its row of an InterfaceState (see
+    pyNTM.interface_state): the InterfaceState of the Model holding the
+    Interface, or one of its own until a Model takes it.  An Interface made
+    with interface_state is created in that InterfaceState, so the Model
+    owning it takes the Interface without moving its row.
+    """
 
     def __init__(
         self,
@@ -19,21 +32,25 @@ class Interface(object):
         circuit_id=None,
         rsvp_enabled=True,
         percent_reservable_bandwidth=100,
+        interface_state=None,
     ):
+        self._check_cost(cost)
+        self._check_capacity(capacity)
+        if interface_state is None:
+            InterfaceState.own(
+                self, cost, capacity, rsvp_enabled, percent_reservable_bandwidth
+            )
+        else:
+            interface_state.add(
+                self, cost, capacity, rsvp_enabled, percent_reservable_bandwidth
+            )
         self.name = name
-        self.cost = cost
-        self.capacity = capacity
         self.node_object = node_object
         self.remote_node_object = remote_node_object
         self.circuit_id = (
             circuit_id  # Has no role in Model object, only in Parallel_Model_Object
         )
-        self.traffic = 0.0
-        self._failed = False
-        self._reserved_bandwidth = 0.0
         self._srlgs = set()
-        self.rsvp_enabled = rsvp_enabled
-        self.percent_reservable_bandwidth = percent_reservable_bandwidth
 
     @property
     def _key(self):
@@ -100,20 +117,73 @@ remote_node_object = %r, circuit_id = %r)"
         not rsvp_enabled, then reservable_bandwidth is set to -1
         """
 
-        if self.rsvp_enabled is True:
-            res_bw = (
-                self.capacity * (self.percent_reservable_bandwidth / 100)
-            ) - self.reserved_bandwidth
-            return round(res_bw, 1)
-        else:
-            return -1.0
+        return self._state.reservable_bandwidth[self._row]
+
+    @property
+    def _max_reservable_bandwidth(self):
+        """
+        Bandwidth RSVP LSPs can reserve on the Interface when none is
+        reserved; -1 if the Interface is not rsvp_enabled
+        """
+        return self._state.max_reservable_bandwidth[self._row]
+
+    def _set_capacity_value(self, setter, value):
+        """
+        Sets one of the values behind _max_reservable_bandwidth with setter,
+        an InterfaceState method, and bumps the 'capacity' version of the
+        Models holding self, which keep the old _max_reservable_bandwidth
+        """
+        old_max_reservable_bandwidth = (
+            self._max_reservable_bandwidth
+            if getattr(self, "_model_versions", ())
+            else None
+        )
+        setter(self._row, value)
+        self._bump_versions("capacity", old_max_reservable_bandwidth)
+
+    @property
+    def rsvp_enabled(self):
+        """Can RSVP LSPs reserve bandwidth on the Interface?  Boolean"""
+        return bool(self._state.rsvp_enabled[self._row])
+
+    @rsvp_enabled.setter
+    def rsvp_enabled(self, rsvp_enabled):
+        self._set_capacity_value(self._state.set_rsvp_enabled, rsvp_enabled)
+
+    @property
+    def percent_reservable_bandwidth(self):
+        """Percent of the Interface capacity that RSVP LSPs can reserve"""
+        return self._state.get_percent_reservable_bandwidth(self._row)
+
+    @percent_reservable_bandwidth.setter
+    def percent_reservable_bandwidth(self, percent_reservable_bandwidth):
+        self._set_capacity_value(
+            self._state.set_percent_reservable_bandwidth, percent_reservable_bandwidth
+        )
+
+    @property
+    def traffic(self):
+        """Traffic on the Interface from the last simulation; 'Down' if failed"""
+        traffic = self._state.traffic[self._row]
+        if traffic != traffic:
+            return "Down"
+        return traffic
+
+    @traffic.setter
+    def traffic(self, traffic):
+        self._state.traffic[self._row] = math.nan if traffic == "Down" else traffic
+
+    @property
+    def _reserved_bandwidth(self):
+        """Amount of interface capacity reserved by RSVP LSPs, not rounded"""
+        return self._state.reserved_bandwidth[self._row]
 
     @property
     def reserved_bandwidth(self):
         """
         Amount of interface capacity reserved by RSVP LSPs
         """
-        return round(self._reserved_bandwidth, 1)
+        return self._state.get_reserved_bandwidth(self._row)
 
     @reserved_bandwidth.setter
     def reserved_bandwidth(self, value):
@@ -124,7 +194,8 @@ remote_node_object = %r, circuit_id = %r)"
         :return: None
         """
         if isinstance(value, float) or isinstance(value, int):
-            self._reserved_bandwidth = value
+            self._state.set_reserved_bandwidth(self._row, value)
+            self._bump_versions("reservations")
         else:
             raise ModelException(
                 "Interface reserved_bandwidth must be a float or integer"
@@ -138,7 +209,17 @@ remote_node_object = %r, circuit_id = %r)"
 
         :return: Boolean - is Interface failed?
         """
-        return self._failed
+        return bool(self._state.failed[self._row])
+
+    @property
+    def _failed(self):
+        return bool(self._state.failed[self._row])
+
+    @_failed.setter
+    def _failed(self, status):
+        # Sets the failed state without the checks and version bumps of the
+        # failed setter
+        self._state.failed[self._row] = status
 
     @failed.setter
     def failed(self, status):
@@ -153,6 +234,7 @@ remote_node_object = %r, circuit_id = %r)"
         """
         if not (isinstance(status, bool)):
             raise ModelException("must be boolean value")
+        self._bump_versions("topology")
 
         # Check for membership in any failed SRLGs
         if status is False:
@@ -184,25 +266,34 @@ remote_node_object = %r, circuit_id = %r)"
 
     @property
     def cost(self):
-        return self._cost
+        return self._state.cost[self._row]
 
-    @cost.setter
-    def cost(self, cost):
+    @staticmethod
+    def _check_cost(cost):
         if cost < 1:
             raise ModelException("Interface cost cannot be less than 1")
         if not isinstance(cost, int):
             raise ModelException("Interface cost must be integer")
-        self._cost = cost
+
+    @cost.setter
+    def cost(self, cost):
+        self._check_cost(cost)
+        self._state.cost[self._row] = cost
+        self._bump_versions("metrics")
 
     @property
     def capacity(self):
-        return self._capacity
+        return self._state.get_capacity(self._row)
 
-    @capacity.setter
-    def capacity(self, capacity):
+    @staticmethod
+    def _check_capacity(capacity):
         if not (capacity > 0):
             raise ModelException("Interface capacity must be greater than 0")
-        self._capacity = capacity
+
+    @capacity.setter
+    def capacity(self, capacity):
+        self._check_capacity(capacity)
+        self._set_capacity_value(self._state.set_capacity, capacity)
 
     def fail_interface(self, model):
         """
@@ -247,18 +338,12 @@ remote_node_object = %r, circuit_id = %r)"
         :return: Interface object on remote side of Circuit containing self
         """
 
-        for interface in (interface for interface in model.interface_objects):
-            if (
-                interface.node_object.name == self.remote_node_object.name
-                and interface.circuit_id == self.circuit_id
-            ):
-                remote_interface = interface
-                break
+        remote_interface = model.interface_objects.lookup(
+            "circuit_id", (self.remote_node_object.name, self.circuit_id)
+        )[0]
 
-        # Sanity check
-        if remote_interface.remote_node_object.interfaces(
-            model
-        ) == self.node_object.interfaces(model):
+        # Sanity check; the remote Interface must point back to self's Node
+        if remote_interface.remote_node_object.name == self.node_object.name:
             return remote_interface
         else:  # pragma: no cover
             print("Interface validation debug info follows:")
@@ -289,37 +374,17 @@ remote_node_object = %r, circuit_id = %r)"
         :param model: model object containing self
         :return: list of Demand objects egressing self
         """
-        dmd_set = set()
-        routed_demands = (
-            demand for demand in model.demand_objects if demand.path != "Unrouted"
-        )
-        for demand in routed_demands:
-            for dmd_path in demand.path:
-                # If dmd_path is an RSVP LSP and self is in dmd_path.path['interfaces'] ,
-                # look at the LSP path and get demands on the LSP and add them to dmd_set
-                # from .rsvp import RSVP_LSP
-                # if isinstance(dmd_path, RSVP_LSP):
-                #     if self in dmd_path.path['interfaces']:
-                #         dmd_set.add(demand)
-                #
-                # # If path is not an LSP, then it's a list of Interface or LSP
-                # # objects; look for self in dmd_path
-                #
-                # elif self in dmd_path:
-                #     # num_paths += 1
-                #     dmd_set.add(demand)
-                from .rsvp import RSVP_LSP
-
-                for object in dmd_path:
-                    if isinstance(object, RSVP_LSP):
-                        if self in object.path["interfaces"]:
-                            dmd_set.add(demand)
-                    elif self in dmd_path:
-                        dmd_set.add(demand)
-
-        dmd_list = list(dmd_set)
-
-        return dmd_list
+        return list(model._get_routing_index()["interface_demands"].get(self, ()))
+
+    def demand_traffic(self, model):
+        """
+        Returns the traffic each demand puts on the interface
+
+        :param model: model object containing self
+        :return: dict with the Demand objects egressing self as keys and the
+                 traffic from each Demand on self as values
+        """
+        return dict(model._get_routing_index()["interface_demands"].get(self, {}))
 
     def lsps(self, model):
         """
@@ -328,25 +393,16 @@ remote_node_object = %r, circuit_id = %r)"
         :param model: Model object
         :return: list of RSVP LSPs that egress the interface
         """
-
-        lsp_set = set()
-
-        for lsp in (
-            lsp for lsp in model.rsvp_lsp_objects if "Unrouted" not in lsp.path
-        ):
-            if self in lsp.path["interfaces"]:
-                lsp_set.add(lsp)
-
-        lsp_list = list(lsp_set)
-        return lsp_list
+        return list(model._get_routing_index()["interface_lsps"].get(self, ()))
 
     @property
     def utilization(self):
         """Returns utilization percent = (self.traffic/self.capacity)*100"""
-        if self.traffic == "Down":
+        traffic = self._state.traffic[self._row]
+        if traffic != traffic:
             return "Int is down"
         else:
-            util = (self.traffic / self.capacity) * 100
+            util = (traffic / self._state.capacity[self._row]) * 100
             return float("%.2f" % util)
 
     @property
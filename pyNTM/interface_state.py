@@ -0,0 +1,561 @@
+"""Columnar state of the Interfaces held by a Model; see Model.interface_state"""
+
+from array import array
+import math
+
+from .exceptions import ModelException
+
+# int_flags bits for the values that were set as ints, so the Interface
+# properties give them back with the type they were set with
+_INT_CAPACITY = 1
+_INT_PERCENT_RESERVABLE_BANDWIDTH = 2
+_INT_RESERVED_BANDWIDTH = 4
+
+
+def _numpy():
+    """Returns the numpy module, or None if numpy is not installed"""
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        return None
+    return numpy
+
+
+class InterfaceState(object):
+    """
+    The state of a set of Interfaces, one column per attribute, with one row
+    per Interface.  A Model keeps the state of its Interfaces in a single
+    InterfaceState, and each Interface's properties read and write its row,
+    so the Interface objects are thin views over the columns.  The Model
+    creates the Interfaces it makes (when a model file is loaded, or for
+    add_circuit) directly in its InterfaceState.  Any other Interface has an
+    InterfaceState of its own, and is moved into the Model's when the Model
+    takes it (see adopt).
+
+    The columns are contiguous array.array columns, indexed by row:
+
+    - capacity, cost, percent_reservable_bandwidth, rsvp_enabled, failed
+    - traffic: NaN for 'Down'
+    - reserved_bandwidth: bandwidth reserved by RSVP LSPs, not rounded
+    - max_reservable_bandwidth: bandwidth RSVP LSPs can reserve when none
+      is reserved; -1 if not rsvp_enabled
+    - reservable_bandwidth: as Interface.reservable_bandwidth, kept up to
+      date as the columns it depends on change
+    - graph_cost: cost of the Interface's edge in the Model's routing graph;
+      0 if it has none and -1 if it is not known (see routing_graph_changes)
+    - int_flags: the columns set with an int value
+
+    Whole-Model operations (utilization, the Interfaces usable for a
+    reservation, resetting the simulation results) are vectorized over
+    zero-copy numpy views of the columns if numpy is installed, and loops
+    over the columns otherwise.  Their results are indexed by row;
+    interfaces holds the Interface in each row, with None in the rows that
+    are free.
+    """
+
+    _columns = (
+        ("capacity", "d"),
+        ("cost", "q"),
+        ("percent_reservable_bandwidth", "d"),
+        ("rsvp_enabled", "b"),
+        ("failed", "b"),
+        ("traffic", "d"),
+        ("reserved_bandwidth", "d"),
+        ("max_reservable_bandwidth", "d"),
+        ("reservable_bandwidth", "d"),
+        ("graph_cost", "q"),
+        ("int_flags", "B"),
+    )
+
+    # Values of a new or free row
+    _empty_row = (0.0, 1, 100.0, 1, 1, 0.0, 0.0, 0.0, 0.0, 0, 0)
+
+    def __init__(self):
+        self.interfaces = []
+        self._free_rows = []
+        for name, typecode in self._columns:
+            setattr(self, name, array(typecode))
+
+    def __repr__(self):
+        return "InterfaceState(interfaces = %s, free rows = %s)" % (
+            len(self.interfaces) - len(self._free_rows),
+            len(self._free_rows),
+        )
+
+    def __len__(self):
+        return len(self.interfaces)
+
+    @classmethod
+    def _row_values(cls, cost, capacity, rsvp_enabled, percent_reservable_bandwidth):
+        """
+        Returns the column values, in _columns order, of the row of a new
+        Interface that is not failed, with no traffic and nothing reserved
+        """
+        # Computed even if not rsvp_enabled, so a bad value raises before
+        # any column is changed
+        max_reservable_bandwidth = capacity * (percent_reservable_bandwidth / 100)
+        rsvp_enabled = rsvp_enabled is True
+        if rsvp_enabled:
+            reservable_bandwidth = round(max_reservable_bandwidth, 1)
+        else:
+            max_reservable_bandwidth = reservable_bandwidth = -1.0
+        int_flags = 0
+        if isinstance(capacity, int):
+            int_flags |= _INT_CAPACITY
+        if isinstance(percent_reservable_bandwidth, int):
+            int_flags |= _INT_PERCENT_RESERVABLE_BANDWIDTH
+        return (
+            capacity,
+            cost,
+            percent_reservable_bandwidth,
+            rsvp_enabled,
+            False,
+            0.0,
+            0.0,
+            max_reservable_bandwidth,
+            reservable_bandwidth,
+            0,
+            int_flags,
+        )
+
+    def _new_row(self, interface, values=None):
+        """
+        Returns a row for interface, reusing a free row if there is one,
+        with values (in _columns order) in the columns; the values of
+        _empty_row by default
+        """
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self.interfaces[row] = interface
+            if values is not None:
+                for (name, _), value in zip(self._columns, values):
+                    getattr(self, name)[row] = value
+            return row
+        row = len(self.interfaces)
+        self.interfaces.append(interface)
+        for (name, typecode), value in zip(self._columns, values or self._empty_row):
+            column = getattr(self, name)
+            try:
+                column.append(value)
+            except BufferError:
+                # A numpy view of the column is still held; the view keeps
+                # the old values and the column moves to a new array
+                column = array(typecode, column)
+                column.append(value)
+                setattr(self, name, column)
+        return row
+
+    def _free_row(self, row):
+        """Frees row for reuse"""
+        self.interfaces[row] = None
+        for (name, _), value in zip(self._columns, self._empty_row):
+            getattr(self, name)[row] = value
+        self._free_rows.append(row)
+
+    @classmethod
+    def own(cls, interface, cost, capacity, rsvp_enabled, percent_reservable_bandwidth):
+        """
+        Gives interface, which must not have a row yet, an InterfaceState of
+        its own, holding only interface, with the values of a new Interface
+
+        :param interface: Interface object
+        :param cost: Interface cost
+        :param capacity: Interface capacity
+        :param rsvp_enabled: can RSVP LSPs reserve bandwidth on interface?
+        :param percent_reservable_bandwidth: percent of capacity RSVP LSPs
+                                             can reserve
+        :return: None
+        """
+        values = cls._row_values(
+            cost, capacity, rsvp_enabled, percent_reservable_bandwidth
+        )
+        state = cls.__new__(cls)
+        state.interfaces = [interface]
+        state._free_rows = []
+        # Copying a one-row array is cheaper than building one from a value
+        for (name, _), one_row, value in zip(cls._columns, _ONE_ROW, values):
+            column = one_row[:]
+            column[0] = value
+            setattr(state, name, column)
+        interface._state = state
+        interface._row = 0
+
+    def add(
+        self, interface, cost, capacity, rsvp_enabled, percent_reservable_bandwidth
+    ):
+        """
+        Gives interface, which must not have a row yet, a row in self with
+        the values of a new Interface
+
+        :param interface: Interface object
+        :param cost: Interface cost
+        :param capacity: Interface capacity
+        :param rsvp_enabled: can RSVP LSPs reserve bandwidth on interface?
+        :param percent_reservable_bandwidth: percent of capacity RSVP LSPs
+                                             can reserve
+        :return: None
+        """
+        values = self._row_values(
+            cost, capacity, rsvp_enabled, percent_reservable_bandwidth
+        )
+        interface._state = self
+        interface._row = self._new_row(interface, values)
+
+    def discard(self, interface):
+        """
+        Frees the row of interface, which is in self, for an Interface that
+        is dropped before it is added to the Model
+
+        :param interface: Interface object
+        :return: None
+        """
+        if interface._state is self:
+            self._free_row(interface._row)
+
+    def adopt(self, interface):
+        """
+        Moves interface's row, with its values, from the InterfaceState it
+        is in to self
+
+        :param interface: Interface object
+        :return: True if interface was moved; False if it was in self
+        """
+        state = interface._state
+        if state is self:
+            return False
+        old_row = interface._row
+        row = self._new_row(interface)
+        for name, _ in self._columns:
+            getattr(self, name)[row] = getattr(state, name)[old_row]
+        # The edge in the routing graph of self's Model is not known
+        self.graph_cost[row] = -1
+        state._free_row(old_row)
+        interface._state = self
+        interface._row = row
+        return True
+
+    def adopt_all(self, interfaces):
+        """
+        Moves the Interfaces in interfaces that are not in self to self
+
+        :param interfaces: iterable of Interface objects
+        :return: number of Interfaces moved
+        """
+        return sum(
+            self.adopt(interface)
+            for interface in interfaces
+            if interface._state is not self
+        )
+
+    def release(self, interface):
+        """
+        Moves interface, if it is in self, to an InterfaceState of its own
+
+        :param interface: Interface object
+        :return: None
+        """
+        if interface._state is self:
+            InterfaceState().adopt(interface)
+
+    def retain(self, interfaces):
+        """
+        Releases the Interfaces in self that are not in interfaces
+
+        :param interfaces: set of Interface objects
+        :return: None
+        """
+        for interface in self.interfaces:
+            if interface is not None and interface not in interfaces:
+                self.release(interface)
+
+    def copy(self):
+        """
+        Returns a copy of self with copies of the columns; the interfaces
+        list is copied as it is, so its Interfaces are not moved to the copy
+
+        :return: InterfaceState
+        """
+        state_copy = InterfaceState()
+        state_copy.interfaces = list(self.interfaces)
+        state_copy._free_rows = list(self._free_rows)
+        for name, typecode in self._columns:
+            setattr(state_copy, name, array(typecode, getattr(self, name)))
+        return state_copy
+
+    def rows(self, interfaces):
+        """
+        Returns the rows of interfaces, which must be in self
+
+        :param interfaces: iterable of Interface objects
+        :return: list of rows
+        """
+        return [interface._row for interface in interfaces]
+
+    def view(self, name):
+        """
+        Returns a numpy view of the name column, sharing its memory.  The
+        column can not grow while the view is held, so a row added then
+        moves the column to a new array and the view keeps the old values.
+
+        Requires numpy.
+
+        :param name: column name
+        :return: numpy array
+        """
+        np = _numpy()
+        column = getattr(self, name)
+        if len(column) == 0:
+            return np.zeros(0, dtype=column.typecode)
+        return np.frombuffer(column, dtype=column.typecode)
+
+    def _update_reservable_bandwidth(self, row):
+        """
+        Updates the bandwidth RSVP LSPs can reserve on row after the
+        capacity, rsvp_enabled, percent_reservable_bandwidth or reserved
+        bandwidth changes, as Interface.reservable_bandwidth is defined
+        """
+        if self.rsvp_enabled[row]:
+            max_reservable_bandwidth = self.capacity[row] * (
+                self.percent_reservable_bandwidth[row] / 100
+            )
+            self.max_reservable_bandwidth[row] = max_reservable_bandwidth
+            self.reservable_bandwidth[row] = round(
+                max_reservable_bandwidth - round(self.reserved_bandwidth[row], 1), 1
+            )
+        else:
+            self.max_reservable_bandwidth[row] = -1.0
+            self.reservable_bandwidth[row] = -1.0
+
+    def _set_int_flag(self, row, flag, value):
+        if isinstance(value, int):
+            self.int_flags[row] |= flag
+        else:
+            self.int_flags[row] &= ~flag & 0xFF
+
+    def set_capacity(self, row, capacity):
+        """Sets the capacity of row"""
+        self.capacity[row] = capacity
+        self._set_int_flag(row, _INT_CAPACITY, capacity)
+        self._update_reservable_bandwidth(row)
+
+    def set_percent_reservable_bandwidth(self, row, percent_reservable_bandwidth):
+        """Sets the percent of row's capacity RSVP LSPs can reserve"""
+        self.percent_reservable_bandwidth[row] = percent_reservable_bandwidth
+        self._set_int_flag(
+            row, _INT_PERCENT_RESERVABLE_BANDWIDTH, percent_reservable_bandwidth
+        )
+        self._update_reservable_bandwidth(row)
+
+    def set_rsvp_enabled(self, row, rsvp_enabled):
+        """Sets whether RSVP LSPs can reserve bandwidth on row"""
+        self.rsvp_enabled[row] = rsvp_enabled is True
+        self._update_reservable_bandwidth(row)
+
+    def set_reserved_bandwidth(self, row, reserved_bandwidth):
+        """Sets the bandwidth reserved on row by RSVP LSPs"""
+        self.reserved_bandwidth[row] = reserved_bandwidth
+        self._set_int_flag(row, _INT_RESERVED_BANDWIDTH, reserved_bandwidth)
+        self._update_reservable_bandwidth(row)
+
+    def get_capacity(self, row):
+        """Returns the capacity of row, with the type it was set with"""
+        capacity = self.capacity[row]
+        if self.int_flags[row] & _INT_CAPACITY:
+            return int(capacity)
+        return capacity
+
+    def get_percent_reservable_bandwidth(self, row):
+        """
+        Returns the percent of row's capacity RSVP LSPs can reserve, with the
+        type it was set with
+        """
+        percent_reservable_bandwidth = self.percent_reservable_bandwidth[row]
+        if self.int_flags[row] & _INT_PERCENT_RESERVABLE_BANDWIDTH:
+            return int(percent_reservable_bandwidth)
+        return percent_reservable_bandwidth
+
+    def get_reserved_bandwidth(self, row):
+        """
+        Returns the bandwidth reserved on row by RSVP LSPs, rounded to 0.1,
+        with the type it was set with
+        """
+        reserved_bandwidth = round(self.reserved_bandwidth[row], 1)
+        if self.int_flags[row] & _INT_RESERVED_BANDWIDTH:
+            return int(reserved_bandwidth)
+        return reserved_bandwidth
+
+    def reset_reservations(self):
+        """
+        Releases the bandwidth reserved on every row, setting it to int 0
+
+        :return: None
+        """
+        size = len(self.interfaces)
+        self.reserved_bandwidth[:] = array("d", bytes(8 * size))
+        np = _numpy()
+        if np is None:
+            self.int_flags[:] = array(
+                "B",
+                (int_flags | _INT_RESERVED_BANDWIDTH for int_flags in self.int_flags),
+            )
+            self.reservable_bandwidth[:] = array(
+                "d",
+                (
+                    round(max_reservable_bandwidth, 1)
+                    for max_reservable_bandwidth in self.max_reservable_bandwidth
+                ),
+            )
+            return
+        int_flags = self.view("int_flags")
+        int_flags |= _INT_RESERVED_BANDWIDTH
+        # round() is applied per value since numpy.round() can round the
+        # other way on ties
+        max_reservable_bandwidth = self.view("max_reservable_bandwidth")
+        reservable_bandwidth = self.view("reservable_bandwidth")
+        whole = max_reservable_bandwidth == np.floor(max_reservable_bandwidth)
+        reservable_bandwidth[whole] = max_reservable_bandwidth[whole]
+        for row in np.flatnonzero(~whole).tolist():
+            reservable_bandwidth[row] = round(max_reservable_bandwidth[row], 1)
+
+    def reset_traffic(self):
+        """
+        Sets the traffic of every row to 'Down' (NaN) if it is failed, and
+        to 0 otherwise
+
+        :return: None
+        """
+        np = _numpy()
+        if np is None:
+            self.traffic[:] = array(
+                "d", (math.nan if failed else 0.0 for failed in self.failed)
+            )
+            return
+        traffic = self.view("traffic")
+        traffic[:] = 0.0
+        traffic[self.view("failed").astype(bool)] = np.nan
+
+    def set_failed_traffic(self):
+        """
+        Sets the traffic of the failed rows to 'Down' (NaN), and of the rows
+        that are no longer failed but still 'Down' to 0
+
+        :return: None
+        """
+        np = _numpy()
+        if np is None:
+            traffic = self.traffic
+            for row, failed in enumerate(self.failed):
+                if failed:
+                    traffic[row] = math.nan
+                elif traffic[row] != traffic[row]:
+                    traffic[row] = 0.0
+            return
+        traffic = self.view("traffic")
+        failed = self.view("failed").astype(bool)
+        traffic[~failed & np.isnan(traffic)] = 0.0
+        traffic[failed] = np.nan
+
+    def usable(self, needed_bw=0):
+        """
+        Returns which rows can carry traffic or, with needed_bw > 0, an RSVP
+        reservation of needed_bw: the rows that are not failed and have at
+        least needed_bw of reservable bandwidth.  With needed_bw=0 these are
+        the Interfaces in the Model's routing graph.
+
+        :param needed_bw: bandwidth to reserve
+        :return: boolean numpy array, or list of bools without numpy
+        """
+        np = _numpy()
+        if np is None:
+            return [
+                not failed and reservable_bandwidth >= needed_bw
+                for failed, reservable_bandwidth in zip(
+                    self.failed, self.reservable_bandwidth
+                )
+            ]
+        return ~self.view("failed").astype(bool) & (
+            self.view("reservable_bandwidth") >= needed_bw
+        )
+
+    def utilization(self, traffic=None, rows=None):
+        """
+        Returns the utilization percent of each row, not rounded; NaN for
+        failed rows.
+
+        :param traffic: (optional) traffic to use instead of the traffic
+                        column, with a row for each of rows and a column for
+                        each traffic matrix, such as the result of
+                        RoutingMatrix.interface_traffic (requires numpy)
+        :param rows: (optional) rows to return, in order; all the rows by
+                     default
+        :return: numpy array with the shape of traffic, or list without numpy
+        """
+        np = _numpy()
+        if np is None:
+            if rows is None:
+                rows = range(len(self.interfaces))
+            return [
+                (
+                    math.nan
+                    if self.failed[row]
+                    else self.traffic[row] / self.capacity[row] * 100
+                )
+                for row in rows
+            ]
+        if rows is None:
+            rows = slice(None)
+        if traffic is None:
+            traffic = self.view("traffic")[rows]
+        traffic = np.asarray(traffic, dtype=float)
+        capacity = self.view("capacity")[rows]
+        if traffic.shape[0] != len(capacity):
+            raise ModelException(
+                "traffic has {} rows for {} interfaces".format(
+                    traffic.shape[0], len(capacity)
+                )
+            )
+        utilization = traffic / capacity.reshape((-1,) + (1,) * (traffic.ndim - 1))
+        utilization = utilization * 100
+        utilization[self.view("failed")[rows].astype(bool)] = np.nan
+        return utilization
+
+    def routing_graph_changes(self):
+        """
+        Returns the rows whose edge in the Model's routing graph is out of
+        date: the usable rows (see usable) with no edge or an edge of
+        another cost, and the rows that are not usable but have an edge,
+        according to graph_cost
+
+        :return: list of rows
+        """
+        np = _numpy()
+        if np is None:
+            return [
+                row
+                for row, (usable, cost, graph_cost) in enumerate(
+                    zip(self.usable(), self.cost, self.graph_cost)
+                )
+                if (graph_cost != cost if usable else graph_cost != 0)
+            ]
+        usable = self.usable()
+        graph_cost = self.view("graph_cost")
+        return np.flatnonzero(
+            np.where(usable, graph_cost != self.view("cost"), graph_cost != 0)
+        ).tolist()
+
+    def routing_graph_edge_count(self):
+        """
+        Returns the number of rows with an edge in the Model's routing graph
+        according to graph_cost
+
+        :return: int
+        """
+        return len(self.graph_cost) - self.graph_cost.count(0)
+
+
+# A one-row column of each type, copied for the InterfaceState of an
+# Interface not held by a Model; see InterfaceState.own
+_ONE_ROW = tuple(
+    array(typecode, (value,))
+    for (_, typecode), value in zip(InterfaceState._columns, InterfaceState._empty_row)
+)
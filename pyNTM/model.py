@@ -11,22 +11,47 @@ The former FlexModel and PerformanceModel classes are now aliases for this class
 Both legacy class names are available as aliases for backward compatibility.
 """
 
+from contextlib import contextmanager
 from datetime import datetime
 from pprint import pprint
 
+import hashlib
+import io
 import itertools
 import networkx as nx
-import random
+import os
 
 from .circuit import Circuit
+from .cspf import CSPF
 from .interface import Interface
+from .interface_state import InterfaceState
 from .exceptions import ModelException
+from .failure_sweep import run_failure_sweep
+from .fork import fork_model
 from .rsvp import RSVP_LSP
-from .utilities import find_end_index
 from .node import Node
+from collections import Counter
 from collections import defaultdict
 from .srlg import SRLG
-from .demand import Demand
+from .demand import Demand, _find_unique_next_hops
+from .spf import DagRoute
+from .spf import SPFDag
+from .indexed_set import CircuitSet
+from .indexed_set import DemandSet
+from .indexed_set import InterfaceSet
+from .indexed_set import NodeSet
+from .indexed_set import RSVPLSPSet
+from .indexed_set import SRLGSet
+from .path_cache import PathCache
+from .simulation_result import SimulationResult
+from .snapshot import HashingReader
+from .snapshot import default_snapshot_file
+from .snapshot import file_hash
+from .snapshot import input_fingerprint
+from .snapshot import read_snapshot
+from .snapshot import read_snapshot_source_hash
+from .snapshot import write_snapshot
+from .versions import ModelVersions
 
 
 # TODO - call to analyze model for Unrouted LSPs and LSPs not on shortest path
@@ -68,13 +93,184 @@ class Model(object):
         demand_objects=set(),
         rsvp_lsp_objects=set(),
     ):
+        # Version counters for the Model state; see versions
+        self._versions = ModelVersions()
+        # Columnar state of the Interfaces; see interface_state
+        self._interface_state = InterfaceState()
         self.interface_objects = interface_objects
         self.node_objects = node_objects
         self.demand_objects = demand_objects
         self.circuit_objects = set()
         self.rsvp_lsp_objects = rsvp_lsp_objects
         self.srlg_objects = set()
-        self._parallel_lsp_groups = {}
+        # (ModelVersions key, groups) for _get_parallel_lsp_groups() and
+        # _get_parallel_demand_groups()
+        self._parallel_lsp_groups = None
+        self._parallel_demand_groups = None
+        # Columnar table of Demands routed along with demand_objects, and
+        # one Demand per source and dest pair in it, keyed by
+        # 'source_node_name-dest_node_name'; see set_demand_table
+        self._demand_table = None
+        self._demand_table_demands = {}
+        # How IGP routed demand traffic is split over ECMP paths; 'paths' or 'dag'
+        # (see _update_interface_utilization)
+        self.load_propagation = "paths"
+        # Persistent routing graph, updated in place; see _sync_routing_graph
+        self._routing_graph = nx.MultiDiGraph()
+        # (node_name, remote_node_name, edge data) for each Interface in
+        # self._routing_graph, keyed by Interface
+        self._routing_graph_edges = {}
+        # Incremented each time the routing graph's edges change, and the
+        # Model versions as of the last sync
+        self._routing_graph_version = 0
+        self._routing_graph_sync_versions = None
+        # Interfaces whose edges have changed since the last simulation,
+        # with whether they had an edge then; see _pop_routing_graph_changes
+        self._routing_graph_changes = {}
+        # Shortest path results on the routing graph; see _get_spf_dag
+        self._path_cache = PathCache()
+        # Nesting depth of batch_edit() blocks, and whether an edit inside
+        # them has deferred validate_model()
+        self._batch_edit_depth = 0
+        self._validation_pending = False
+        # Model state at the end of the last full update_simulation(), and
+        # the IGP routed Demands grouped by source and destination; see
+        # _update_simulation_incremental
+        self._simulation_baseline = None
+        self._igp_routed_demands = None
+        # SPFDag from each demand source Node; see _route_demands
+        self._spf_dags = {}
+        # CSPF engine used while the LSPs are routed; see _route_lsps
+        self._cspf = None
+        # Interface/LSP to Demand reverse indexes for the current routing,
+        # and the Model versions they were built at; see _get_routing_index
+        self._routing_index = None
+        self._routing_index_versions = None
+        # Model versions the RSVP LSP effective_metric caches were filled
+        # at; see _check_lsp_effective_metrics
+        self._lsp_effective_metric_versions = None
+        # (file name, content hash, input fingerprint as loaded) of the model
+        # file the Model was loaded from; see save_snapshot
+        self._source = None
+
+    @property
+    def versions(self):
+        """
+        Version counters for the Model's topology, metrics, capacity, Demands
+        and LSPs (see pyNTM.versions.ModelVersions).  Every change to the
+        Model's objects through their properties, and every object added to
+        or removed from the Model, bumps the matching counter, so results
+        computed from the Model can be kept with the versions they depend on
+        and reused while those versions are unchanged.
+        """
+        return self._versions
+
+    def path_cache_info(self):
+        """
+        Returns the statistics of the Model's shortest path cache.  The cache
+        keeps the shortest path DAG from each source Node and the results of
+        get_shortest_path() and get_shortest_path_for_routed_lsp(), shared by
+        demand routing, the LSP metrics and the interactive queries, until the
+        routing graph (or, for bandwidth constrained paths, the reservable
+        bandwidth) changes.  Once it is full, the least recently used results
+        are dropped.
+
+        :return: dict with 'hits', 'misses', 'size' and 'maxsize'
+        """
+        return self._path_cache.info()
+
+    # The Model's object sets keep lookup indexes (see pyNTM.indexed_set);
+    # sets assigned to these attributes are copied into an indexed set
+    @property
+    def interface_objects(self):
+        return self._interface_objects
+
+    @interface_objects.setter
+    def interface_objects(self, interface_objects):
+        old_interface_objects = getattr(self, "_interface_objects", None)
+        self._interface_objects = _indexed_set(InterfaceSet, interface_objects)
+        if (
+            old_interface_objects is not None
+            and old_interface_objects is not self._interface_objects
+        ):
+            old_interface_objects._state = None
+        self._interface_objects._set_state(self._interface_state)
+        self._interface_objects._add_owner(self._versions)
+        self._versions.bump("topology")
+
+    @property
+    def interface_state(self):
+        """
+        The columnar state of the Model's Interfaces (see
+        pyNTM.interface_state.InterfaceState): capacity, cost, RSVP settings,
+        failed state, traffic and reserved bandwidth, one column each, with
+        a row per Interface (Interface._row).  The Interface properties read
+        and write their row, and utilization, the Interfaces usable for a
+        bandwidth reservation and the routing graph sync are vectorized
+        over the columns.
+
+        :return: InterfaceState
+        """
+        self._adopt_interfaces()
+        return self._interface_state
+
+    def _adopt_interfaces(self):
+        """
+        Moves the state of the Model's Interfaces that are held in another
+        InterfaceState, such as Interfaces also added to another Model since,
+        back into the Model's InterfaceState
+        """
+        if self._interface_objects._state is not self._interface_state:
+            self._interface_objects._set_state(self._interface_state)
+            self._versions.bump("topology")
+        elif self._interface_state.adopt_all(self._interface_objects):
+            self._versions.bump("topology")
+
+    @property
+    def node_objects(self):
+        return self._node_objects
+
+    @node_objects.setter
+    def node_objects(self, node_objects):
+        self._node_objects = _indexed_set(NodeSet, node_objects)
+        self._node_objects._add_owner(self._versions)
+        self._versions.bump("topology")
+
+    @property
+    def demand_objects(self):
+        return self._demand_objects
+
+    @demand_objects.setter
+    def demand_objects(self, demand_objects):
+        self._demand_objects = _indexed_set(DemandSet, demand_objects)
+        self._demand_objects._add_owner(self._versions)
+        self._versions.bump("demands")
+
+    @property
+    def rsvp_lsp_objects(self):
+        return self._rsvp_lsp_objects
+
+    @rsvp_lsp_objects.setter
+    def rsvp_lsp_objects(self, rsvp_lsp_objects):
+        self._rsvp_lsp_objects = _indexed_set(RSVPLSPSet, rsvp_lsp_objects)
+        self._rsvp_lsp_objects._add_owner(self._versions)
+        self._versions.bump("lsps")
+
+    @property
+    def srlg_objects(self):
+        return self._srlg_objects
+
+    @srlg_objects.setter
+    def srlg_objects(self, srlg_objects):
+        self._srlg_objects = _indexed_set(SRLGSet, srlg_objects)
+
+    @property
+    def circuit_objects(self):
+        return self._circuit_objects
+
+    @circuit_objects.setter
+    def circuit_objects(self, circuit_objects):
+        self._circuit_objects = _indexed_set(CircuitSet, circuit_objects)
 
     def simulation_diagnostics(self):
         """
@@ -128,6 +324,9 @@ class Model(object):
 
         # Find unrouted LSPs
         for dmd in iter(self.demand_objects):
+            # Demands routed on a DagRoute have no LSPs in their paths
+            if dmd._dag_route is not None or not dmd._is_routed():
+                continue
             for path in dmd.path:
                 for object in path:
                     if isinstance(object, RSVP_LSP):
@@ -249,20 +448,38 @@ class Model(object):
         :return: self, with updated LSP paths
         """
 
-        for interface in self.interface_objects:
-            interface.reserved_bandwidth = 0
+        self._interface_state.reset_reservations()
+        self._versions.bump("reservations")
+
+        # Failed Interfaces are removed from the routing graph here; the
+        # CSPF engine reads the bandwidth reserved by each LSP from the
+        # Interface state as the LSPs are routed
+        self._cspf = CSPF(self._sync_routing_graph(), self._interface_state)
 
         # Find parallel LSP groups
-        parallel_lsp_groups = self.parallel_lsp_groups()
+        parallel_lsp_groups = self._get_parallel_lsp_groups()
 
         # Find all the parallel demand groups
-        parallel_demand_groups = self.parallel_demand_groups()
+        parallel_demand_groups = self._get_parallel_demand_groups()
 
         # Route the LSPs by parallel group
-        self._route_parallel_lsp_groups(parallel_demand_groups, parallel_lsp_groups)
+        try:
+            self._route_parallel_lsp_groups(parallel_demand_groups, parallel_lsp_groups)
+        finally:
+            self._cspf = None
 
         return self
 
+    def _get_cspf(self):
+        """
+        Returns the CSPF engine for the LSPs being routed, or a new one on
+        the synced routing graph outside of update_simulation()
+        """
+        if self._cspf is not None:
+            return self._cspf
+        self._adopt_interfaces()
+        return CSPF(self._sync_routing_graph(), self._interface_state)
+
     def _route_parallel_lsp_groups(self, parallel_demand_groups, parallel_lsp_groups):
         """
         Routes LSPs with same source, dest (parallel LSPs) based on the demands that would
@@ -286,39 +503,59 @@ class Model(object):
                     num_lsps_in_group, group, counter, len(parallel_lsp_groups)
                 )
             )
-            # Traffic each LSP in a parallel LSP group will carry; initialize
-            traffic_in_demand_group = 0
-            traff_on_each_group_lsp = 0
-
-            try:
-                # Get all demands that would ride the parallel LSP group
-                dmds_on_lsp_group = parallel_demand_groups[group]
-
-                traffic_in_demand_group = sum(
-                    [dmd.traffic for dmd in dmds_on_lsp_group]
-                )
-                if traffic_in_demand_group > 0:
-                    traff_on_each_group_lsp = traffic_in_demand_group / len(lsps)
-            except KeyError:
-                # LSPs with no demands will cause a KeyError in parallel_demand_groups[group]
-                # since parallel_demand_group will have no entry for 'group'
-                pass
+            self._route_parallel_lsp_group(lsps, lsps, group, parallel_demand_groups)
 
-            # Determine LSP's specific path and reserved bandwidth; also consume
-            # reserved bandwidth on transited Interfaces
-            self._determine_lsp_state_info(lsps, traff_on_each_group_lsp)
+            counter += 1
 
-            routed_lsps_in_group = [lsp for lsp in lsps if lsp.path != "Unrouted"]
+    def _route_parallel_lsp_group(
+        self, lsps_to_route, lsps, group, parallel_demand_groups
+    ):
+        """
+        Routes lsps_to_route, some or all of the LSPs in a parallel LSP group,
+        for an even share of the traffic of the demands that would ride the
+        group, then re-optimizes the reserved bandwidth of the routed LSPs in
+        the group if not all of them could be routed.
 
-            # ##### Optimize the LSP group reserved bandwidth #####
-            # If not all the LSPs in the group can route at the lowest (initial)
-            # setup bandwidth, determine which LSPs can signal and for how much traffic
-            if len(routed_lsps_in_group) != len(lsps) and len(routed_lsps_in_group) > 0:
-                self._optimize_parallel_lsp_group_res_bw(
-                    self, routed_lsps_in_group, traffic_in_demand_group
-                )
+        :param lsps_to_route: LSPs in lsps to route; the others keep their paths
+        :param lsps: all the LSPs in the parallel LSP group
+        :param group: parallel LSP group key, 'source_node_name-dest_node_name'
+        :param parallel_demand_groups: see parallel_demand_groups()
+        :return: None
+        """
+        # Traffic each LSP in a parallel LSP group will carry; initialize
+        traffic_in_demand_group = 0
+        traff_on_each_group_lsp = 0
 
-            counter += 1
+        try:
+            # Get all demands that would ride the parallel LSP group
+            dmds_on_lsp_group = parallel_demand_groups[group]
+
+            traffic_in_demand_group = sum([dmd.traffic for dmd in dmds_on_lsp_group])
+        except KeyError:
+            # LSPs with no demands will cause a KeyError in parallel_demand_groups[group]
+            # since parallel_demand_group will have no entry for 'group'
+            pass
+
+        # Add the traffic from the demand table that would ride the group
+        if group in self._demand_table_demands:
+            traffic_in_demand_group += self._demand_table_demands[group].traffic
+
+        if traffic_in_demand_group > 0:
+            traff_on_each_group_lsp = traffic_in_demand_group / len(lsps)
+
+        # Determine LSP's specific path and reserved bandwidth; also consume
+        # reserved bandwidth on transited Interfaces
+        self._determine_lsp_state_info(lsps_to_route, traff_on_each_group_lsp)
+
+        routed_lsps_in_group = [lsp for lsp in lsps if lsp.path != "Unrouted"]
+
+        # ##### Optimize the LSP group reserved bandwidth #####
+        # If not all the LSPs in the group can route at the lowest (initial)
+        # setup bandwidth, determine which LSPs can signal and for how much traffic
+        if len(routed_lsps_in_group) != len(lsps) and len(routed_lsps_in_group) > 0:
+            self._optimize_parallel_lsp_group_res_bw(
+                self, routed_lsps_in_group, traffic_in_demand_group
+            )
 
     def _add_lsp_path_data(self, lsp, path):
         """
@@ -406,16 +643,29 @@ class Model(object):
 
         """
 
-        if self._parallel_lsp_groups != {}:
-            return self._parallel_lsp_groups
+        return {
+            key: list(lsps) for key, lsps in self._get_parallel_lsp_groups().items()
+        }
+
+    def _get_parallel_lsp_groups(self):
+        """
+        Returns the groups of parallel_lsp_groups(), kept until the LSPs
+        change.  The dict and its lists are shared by every call, so they
+        must not be changed.
+        """
+        version = self._versions["lsps"]
+        if self._parallel_lsp_groups is not None:
+            groups_version, groups = self._parallel_lsp_groups
+            if groups_version == version:
+                return groups
 
         groups = defaultdict(list)
         for lsp in self.rsvp_lsp_objects:
             key = "{}-{}".format(lsp.source_node_object.name, lsp.dest_node_object.name)
             groups[key].append(lsp)
 
-        self._parallel_lsp_groups = dict(groups)
-        return self._parallel_lsp_groups
+        self._parallel_lsp_groups = (version, dict(groups))
+        return self._parallel_lsp_groups[1]
 
     def parallel_demand_groups(self):
         """
@@ -432,12 +682,30 @@ class Model(object):
             'F-E': [Demand(source = F, dest = E, traffic = 400, name = 'dmd_f_e_1')]}
         """
 
+        return {
+            key: list(demands)
+            for key, demands in self._get_parallel_demand_groups().items()
+        }
+
+    def _get_parallel_demand_groups(self):
+        """
+        Returns the groups of parallel_demand_groups(), kept until the
+        Demands change.  The dict and its lists are shared by every call, so
+        they must not be changed.
+        """
+        version = self._versions["demands"]
+        if self._parallel_demand_groups is not None:
+            groups_version, groups = self._parallel_demand_groups
+            if groups_version == version:
+                return groups
+
         groups = defaultdict(list)
         for dmd in self.demand_objects:
             key = "{}-{}".format(dmd.source_node_object.name, dmd.dest_node_object.name)
             groups[key].append(dmd)
 
-        return dict(groups)
+        self._parallel_demand_groups = (version, dict(groups))
+        return self._parallel_demand_groups[1]
 
     def _unique_interface_per_node(self):
         """
@@ -487,112 +755,203 @@ class Model(object):
         :param name: Demand name
         :return: A validated Model object with the new demand
         """
+        self.demand_objects.add(
+            self._make_demand(source_node_name, dest_node_name, traffic, name)
+        )
+
+        self._validate_edit()
+
+    def add_demands(self, demands):
+        """
+        Adds multiple Demands to the model and validates the model once.
+
+        Each Demand is given as a tuple of add_demand() arguments::
+
+            (source_node_name, dest_node_name, traffic, name)
+
+        or as a dict of them, keyed by argument name.  traffic and name are
+        optional.  If any row is bad (unknown Node, duplicate Demand, etc),
+        no Demands are added and the ModelException lists all of the bad rows.
+
+        :param demands: iterable of tuples or dicts
+        :return: A validated Model object with the new demands
+        """
+        self._add_rows(demands, self._make_demand, self.demand_objects)
+
+        self._validate_edit()
+
+    def _make_demand(self, source_node_name, dest_node_name, traffic=0, name="none"):
+        """
+        Returns a new Demand for add_demand(); raises ModelException if the
+        Demand is already in self
+        """
         source_node_object = self.get_node_object(source_node_name)
         dest_node_object = self.get_node_object(dest_node_name)
         added_demand = Demand(source_node_object, dest_node_object, traffic, name)
-        if added_demand._key in {demand._key for demand in self.demand_objects}:
+        if self.demand_objects.lookup("key", added_demand._key):
             message = "{} already exists in demand_objects".format(added_demand)
             raise ModelException(message)
-        self.demand_objects.add(added_demand)
+        return added_demand
+
+    def _add_rows(self, rows, make_object, object_set):
+        """
+        Adds the objects made from each row in rows to object_set.  If any
+        row is bad, the objects from the good rows are removed again and a
+        ModelException listing all of the bad rows is raised.
+
+        :param rows: iterable of rows; each row is a dict of keyword arguments
+            for make_object, a tuple or list of positional arguments, or a
+            single positional argument
+        :param make_object: callable that returns a new object, or a tuple of
+            new objects, for a row; raises ModelException, TypeError or ValueError
+            for a bad row
+        :param object_set: set in self to add the new objects to
+        """
+        added_objects = []
+        bad_rows = []
+
+        for row_index, row in enumerate(rows):
+            if isinstance(row, dict):
+                args, kwargs = (), row
+            elif isinstance(row, (tuple, list)):
+                args, kwargs = row, {}
+            else:
+                args, kwargs = (row,), {}
 
-        self.validate_model()
+            try:
+                new_objects = make_object(*args, **kwargs)
+            except (ModelException, TypeError, ValueError) as e:
+                bad_rows.append({"row": row_index, "data": row, "error": e.args[0]})
+                continue
+
+            if not isinstance(new_objects, tuple):
+                new_objects = (new_objects,)
+            for new_object in new_objects:
+                # Added now so later rows are checked against it
+                object_set.add(new_object)
+                added_objects.append(new_object)
+
+        if bad_rows:
+            for added_object in added_objects:
+                object_set.remove(added_object)
+            message = "{} rows could not be added, see returned data".format(
+                len(bad_rows)
+            )
+            raise ModelException((message, bad_rows))
+
+    @classmethod
+    def _get_node_from_data(cls, node_name, node_set, row_info):
+        """
+        Returns the Node named node_name in node_set, for a demand or LSP
+        row in a data file
+
+        :param node_name: name of Node
+        :param node_set: set of Nodes from model
+        :param row_info: list of fields from the row that references the Node
+        :return: Node object
+        """
+        try:
+            return node_set.lookup("name", node_name)[0]
+        except IndexError:
+            err_msg = "No Node with name {} in Model; {}".format(node_name, row_info)
+            raise ModelException(err_msg)
 
     @classmethod
-    def _add_lsp_from_data(cls, lsp_info_begin_index, lines, lsp_set, node_set):
+    def _get_or_add_node(cls, node_name, node_set):
         """
-        Adds LSP data from info in a data file to Class
+        Returns the Node named node_name in node_set, adding a new Node to
+        node_set if there is not one
 
-        :param demands_info_end_index: line index where demand info ends
-        :param lines: input lines from data file
+        :param node_name: name of Node
+        :param node_set: set of Nodes from model
+        :return: Node object
+        """
+        try:
+            return node_set.lookup("name", node_name)[0]
+        except IndexError:
+            node = Node(node_name)
+            node_set.add(node)
+            return node
+
+    @classmethod
+    def _add_lsp_from_data(cls, lsp_line, line_index, lsp_set, node_set):
+        """
+        Adds RSVP LSP from line of data
+
+        :param lsp_line: line of data for LSP
+        :param line_index: index of lsp_line in data file
         :param lsp_set: set of RSVP_LSP objects
         :param node_set: set of Node objects
 
         """
+        lsp_info = lsp_line.split("\t")
+        source_node = cls._get_node_from_data(lsp_info[0], node_set, lsp_info)
+        dest_node = cls._get_node_from_data(lsp_info[1], node_set, lsp_info)
+        name = lsp_info[2]
+        try:
+            configured_setup_bw = float(lsp_info[3])
+        except (IndexError, ModelException, ValueError):
+            configured_setup_bw = None
+        try:
+            manual_metric = int(lsp_info[4])
+        except (IndexError, ModelException, ValueError):
+            manual_metric = None
+
+        new_lsp = RSVP_LSP(
+            source_node,
+            dest_node,
+            name,
+            configured_setup_bandwidth=configured_setup_bw,
+            configured_manual_metric=manual_metric,
+        )
 
-        lsp_lines = lines[lsp_info_begin_index:]
-        for lsp_line in lsp_lines:
-            lsp_info = lsp_line.split("\t")
-            source = lsp_info[0]
-            try:
-                source_node = [node for node in node_set if node.name == source][0]
-            except IndexError:
-                err_msg = "No Node with name {} in Model; {}".format(source, lsp_info)
-                raise ModelException(err_msg)
-            dest = lsp_info[1]
-            try:
-                dest_node = [node for node in node_set if node.name == dest][0]
-            except IndexError:
-                err_msg = "No Node with name {} in Model; {}".format(dest, lsp_info)
-                raise ModelException(err_msg)
-            name = lsp_info[2]
-            try:
-                configured_setup_bw = float(lsp_info[3])
-            except (IndexError, ModelException, ValueError):
-                configured_setup_bw = None
-            try:
-                manual_metric = int(lsp_info[4])
-            except (IndexError, ModelException, ValueError):
-                manual_metric = None
-
-            new_lsp = RSVP_LSP(
-                source_node,
-                dest_node,
-                name,
-                configured_setup_bandwidth=configured_setup_bw,
-                configured_manual_metric=manual_metric,
-            )
-
-            if new_lsp._key not in {lsp._key for lsp in lsp_set}:
-                lsp_set.add(new_lsp)
-            else:
-                print(
-                    "{} already exists in model; disregarding line {}".format(
-                        new_lsp, lines.index(lsp_line)
-                    )
+        if not lsp_set.lookup("key", new_lsp._key):
+            lsp_set.add(new_lsp)
+        else:
+            print(
+                "{} already exists in model; disregarding line {}".format(
+                    new_lsp, line_index
                 )
+            )
 
     @classmethod
-    def _add_demand_from_data(cls, demand_line, demand_set, lines, node_set):
+    def _add_demand_from_data(cls, demand_line, line_index, demand_set, node_set):
         """
         Adds Demand from line of data
 
         :param demand_line: line of data for demand
+        :param line_index: index of demand_line in data file
         :param demand_set: set of Demands in model
-        :param lines: lines of data from input file
         :param node_set: set of Nodes from model
 
         """
         demand_info = demand_line.split("\t")
-        source = demand_info[0]
-        try:
-            source_node = [node for node in node_set if node.name == source][0]
-        except IndexError:
-            err_msg = "No Node with name {} in Model; {}".format(source, demand_info)
-            raise ModelException(err_msg)
-        dest = demand_info[1]
-        try:
-            dest_node = [node for node in node_set if node.name == dest][0]
-        except IndexError:
-            err_msg = "No Node with name {} in Model; {}".format(dest, demand_info)
-            raise ModelException(err_msg)
+        source_node = cls._get_node_from_data(demand_info[0], node_set, demand_info)
+        dest_node = cls._get_node_from_data(demand_info[1], node_set, demand_info)
 
         traffic = int(demand_info[2])
         name = demand_info[3]
         demand_name = "none" if name == "" else name
         new_demand = Demand(source_node, dest_node, traffic, demand_name)
-        if new_demand._key not in {dmd._key for dmd in demand_set}:
+        if not demand_set.lookup("key", new_demand._key):
             demand_set.add(new_demand)
         else:
             print(
                 "{} already exists in model; disregarding line {}".format(
-                    new_demand, lines.index(demand_line)
+                    new_demand, line_index
                 )
             )
 
     @classmethod
-    def _add_node_from_data(
-        cls, demand_set, interface_set, lsp_set, node_line, node_set
-    ):
+    def _add_node_from_data(cls, node_line, node_set):
+        """
+        Adds Node from line of data, or updates the attributes of the Node
+        if it is already in node_set (a Node inferred from an Interface)
+
+        :param node_line: line of data for Node
+        :param node_set: set of Nodes from model
+
+        """
         node_info = node_line.split("\t")
         node_name = node_info[0]
         # Set latitude
@@ -605,27 +964,16 @@ class Model(object):
             node_lon = int(node_info[1])
         except (ValueError, IndexError):
             node_lon = 0
-
-        new_node = Node(node_name)
         # Set igp_shortcuts_enabled; only used in FlexModel, ignored in PerformanceModel
         try:
-            igp_shortcuts_enabled_value = new_node.igp_shortcuts_enabled = node_info[3]
+            igp_shortcuts_enabled_value = node_info[3]
         except IndexError:
             igp_shortcuts_enabled_value = False
-        if node_name not in {node.name for node in node_set}:  # Pick up orphan nodes
-            node_set.add(new_node)
-            new_node.lat = node_lat
-            new_node.lon = node_lon
-            new_node.igp_shortcuts_enabled = igp_shortcuts_enabled_value
-        else:
-            existing_node = cls(
-                interface_set, node_set, demand_set, lsp_set
-            ).get_node_object(node_name=node_name)
-            existing_node.lat = node_lat
-            existing_node.lon = node_lon
-            existing_node.igp_shortcuts_enabled = igp_shortcuts_enabled_value
 
-        return node_set
+        node = cls._get_or_add_node(node_name, node_set)  # Pick up orphan nodes
+        node.lat = node_lat
+        node.lon = node_lon
+        node.igp_shortcuts_enabled = igp_shortcuts_enabled_value
 
     def _does_interface_exist(self, interface_name, node_object_name):
         """
@@ -636,11 +984,8 @@ class Model(object):
         :param node_object_name: Node name
         """
         int_key = (interface_name, node_object_name)
-        interface_key_iterator = (
-            interface._key for interface in self.interface_objects
-        )
 
-        if int_key not in (interface_key_iterator):
+        if not self.interface_objects.lookup("key", int_key):
             raise ModelException("specified interface does not exist")
 
     def get_circuit_object_from_interface(self, interface_name, node_name):
@@ -655,13 +1000,10 @@ class Model(object):
         # Does interface exist?
         self._does_interface_exist(interface_name, node_name)
 
-        interface = self.get_interface_object(interface_name, node_name)
-
-        ckts = [
-            ckt
-            for ckt in self.circuit_objects
-            if interface in (ckt.interface_a, ckt.interface_b)
-        ]
+        int_key = (interface_name, node_name)
+        ckts = self.circuit_objects.lookup(
+            "interface_a", int_key
+        ) + self.circuit_objects.lookup("interface_b", int_key)
 
         return ckts[0]
 
@@ -687,7 +1029,7 @@ class Model(object):
         Returns list of demand objects that cannot be routed in self
         """
         return [
-            demand for demand in iter(self.demand_objects) if demand.path == "Unrouted"
+            demand for demand in iter(self.demand_objects) if not demand._is_routed()
         ]
 
     def change_interface_name(
@@ -702,16 +1044,35 @@ class Model(object):
         :return: Interface with new name
         """
         interface_to_edit = self.get_interface_object(current_interface_name, node_name)
+
+        # The Interface's hash and index keys include its name, so take it out
+        # of the sets (and the routing graph, which is keyed on the Interface)
+        # before renaming it; the routing graph edge is added back on the next sync
+        int_key = interface_to_edit._key
+        circuits = self.circuit_objects.lookup(
+            "interface_a", int_key
+        ) + self.circuit_objects.lookup("interface_b", int_key)
+        for circuit in circuits:
+            self.circuit_objects.remove(circuit)
+        self.interface_objects.remove(interface_to_edit)
+        self._remove_routing_graph_edge(interface_to_edit)
+
         interface_to_edit.name = new_interface_name
 
+        self.interface_objects.add(interface_to_edit)
+        for circuit in circuits:
+            self.circuit_objects.add(circuit)
+
         return interface_to_edit
 
-    def fail_interface(self, interface_name, node_name):
+    def fail_interface(self, interface_name, node_name, update=False):
         """
         Fails the Interface in self object for the interface_name/node_name pair
 
         :param interface_name: name of Interface object
         :param node_name: Name of Node holding Interface
+        :param update: run update_simulation(incremental=True) after the
+            failure so the simulation stays current
 
         """
 
@@ -728,7 +1089,94 @@ class Model(object):
         remote_interface_object.failed = True
         interface_object.failed = True
 
-    def unfail_interface(self, interface_name, node_name, raise_exception=False):
+        if update:
+            self._run_simulation(incremental=True)
+
+    def set_interface_cost(self, interface_name, node_name, cost, update=False):
+        """
+        Sets the cost of the Interface for the interface_name/node_name pair.
+        Only this direction of the Circuit changes; the remote Interface
+        keeps its cost.
+
+        :param interface_name: name of Interface object
+        :param node_name: Name of Node holding Interface
+        :param cost: new Interface cost; integer >= 1
+        :param update: run update_simulation(incremental=True) after the
+            change so the simulation stays current
+        :return: Interface object
+        """
+        interface_object = self.get_interface_object(interface_name, node_name)
+        interface_object.cost = cost
+
+        if update:
+            self._run_simulation(incremental=True)
+
+        return interface_object
+
+    def set_interface_capacity(self, interface_name, node_name, capacity, update=False):
+        """
+        Sets the capacity of the Interface for the interface_name/node_name
+        pair and of its remote Interface, since both Interfaces on a Circuit
+        have the same capacity.
+
+        A capacity change does not move any traffic; with update=True only
+        the LSPs whose reservations no longer fit the new capacity are
+        re-signaled (see update_simulation).
+
+        :param interface_name: name of Interface object
+        :param node_name: Name of Node holding Interface
+        :param capacity: new capacity; must be greater than 0
+        :param update: run update_simulation(incremental=True) after the
+            change so the simulation stays current
+        :return: Interface object
+        """
+        interface_object = self.get_interface_object(interface_name, node_name)
+        remote_interface = interface_object.get_remote_interface(self)
+        interface_object.capacity = capacity
+        remote_interface.capacity = capacity
+
+        if update:
+            self._run_simulation(incremental=True)
+
+        return interface_object
+
+    def set_demand_traffic(
+        self, source_node_name, dest_node_name, demand_name, traffic, update=False
+    ):
+        """
+        Sets the traffic of the Demand for the source/dest/name combination.
+
+        A traffic change does not change the Demand's route, so with
+        update=True the Interface traffic is adjusted by the Demand's share
+        of the traffic change on each Interface on its route instead of
+        rerouting.  If the Demand rides a parallel LSP group with
+        auto-bandwidth LSPs (no configured_setup_bandwidth), only that
+        group is re-signaled (see update_simulation).
+
+        :param source_node_name: name of Demand's source Node
+        :param dest_node_name: name of Demand's destination Node
+        :param demand_name: name of Demand
+        :param traffic: new traffic; positive int or float
+        :param update: run update_simulation(incremental=True) after the
+            change so the simulation stays current
+        :return: Demand object
+        """
+        if not (isinstance(traffic, (int, float))) or traffic < 0:
+            raise ValueError("Must be a positive int or float")
+
+        demand_object = self.get_demand_object(
+            source_node_name, dest_node_name, demand_name
+        )
+        demand_object.traffic = traffic
+
+        if update:
+            self._run_simulation(incremental=True)
+
+        return demand_object
+
+    def unfail_interface(
+        self, interface_name, node_name, raise_exception=False, update=False
+    ):
         """
         Unfails the Interface object for the interface_name, node_name pair.
 
@@ -739,6 +1187,8 @@ class Model(object):
                                 An example of this would be if you tried to unfail
                                 the interface when the parent node or remote node
                                 was in a failed state
+        :param update: run update_simulation(incremental=True) after the
+            Interface is unfailed so the simulation stays current
         :return: Interface object from Model with 'failed' attribute set to False
         """
 
@@ -750,7 +1200,7 @@ class Model(object):
         interface_object = self.get_interface_object(interface_name, node_name)
 
         # Does interface exist?
-        if interface_object not in set(self.interface_objects):
+        if interface_object not in self.interface_objects:
             ModelException("specified interface does not exist")
 
         # Find the remote interface
@@ -766,7 +1216,9 @@ class Model(object):
             remote_interface.reserved_bandwidth = 0
             interface_object.failed = False
             interface_object.reserved_bandwidth = 0
-            self.validate_model()
+            self._validate_edit()
+            if update:
+                self._run_simulation(incremental=True)
         else:
             if raise_exception:
                 message = (
@@ -786,19 +1238,12 @@ class Model(object):
 
         self._does_interface_exist(interface_name, node_name)
 
-        node_object = self.get_node_object(node_name)
-
-        int_object = [
-            interface
-            for interface in node_object.interfaces(self)
-            if interface.name == interface_name
-        ]
-        return int_object[0]
+        return self.interface_objects.lookup("key", (interface_name, node_name))[0]
 
     # NODE CALLS ######
     def get_node_interfaces(self, node_name):
         """Returns list of interfaces on specified node name"""
-        return Node(node_name).interfaces(self)
+        return self.interface_objects.lookup("node", node_name)
 
     def fail_node(self, node_name):
         """Fails specified Node with name node_name"""
@@ -818,20 +1263,21 @@ class Model(object):
         # Change the failed property on the specified node;
         self.get_node_object(node_name).failed = False
 
-        # Find node's interfaces and unfail them
+        # Find node's interfaces and unfail them; validate the model once
         ints_to_unfail_iterator = iter(self.get_node_interfaces(node_name))
 
-        for interface in ints_to_unfail_iterator:
-            # Unfail the interfaces if the remote node is not failed
-            if not interface.remote_node_object.failed:
-                # Unfail the specific interface
-                self.unfail_interface(interface.name, node_name, False)
-
-                # Unfail the remote interface
-                remote_int = interface.get_remote_interface(self)
-                self.unfail_interface(
-                    remote_int.name, remote_int.node_object.name, False
-                )
+        with self.batch_edit():
+            for interface in ints_to_unfail_iterator:
+                # Unfail the interfaces if the remote node is not failed
+                if not interface.remote_node_object.failed:
+                    # Unfail the specific interface
+                    self.unfail_interface(interface.name, node_name, False)
+
+                    # Unfail the remote interface
+                    remote_int = interface.get_remote_interface(self)
+                    self.unfail_interface(
+                        remote_int.name, remote_int.node_object.name, False
+                    )
 
     def get_failed_node_objects(self):
         """
@@ -936,11 +1382,7 @@ class Model(object):
         :return: list of Demands originating at node
         """
 
-        return [
-            demand
-            for demand in iter(self.demand_objects)
-            if demand.source_node_object.name == source_node_name
-        ]
+        return self.demand_objects.lookup("source", source_node_name)
 
     def get_demand_objects_dest_node(self, dest_node_name):
         """
@@ -950,11 +1392,7 @@ class Model(object):
         :param dest_node_name: name of destination node for Demands
         :return: list of Demands terminating on destination node
         """
-        return [
-            demand
-            for demand in iter(self.demand_objects)
-            if demand.dest_node_object.name == dest_node_name
-        ]
+        return self.demand_objects.lookup("dest", dest_node_name)
 
     # ### SRLG Calls ### #
     def get_srlg_object(self, srlg_name, raise_exception=True):
@@ -966,9 +1404,7 @@ class Model(object):
         :return: None
         """
 
-        srlg_already_in_model = [
-            srlg for srlg in self.srlg_objects if srlg.name == srlg_name
-        ]
+        srlg_already_in_model = self.srlg_objects.lookup("name", srlg_name)
 
         if len(srlg_already_in_model) == 1:
             return srlg_already_in_model[
@@ -1029,29 +1465,31 @@ class Model(object):
             node for node in self.node_objects if node in srlg_to_unfail.node_objects
         )
 
-        # Node will stay failed if it's part of another SRLG that is still failed;
-        # in that case, the unfail_node will create an exception; ignore that exception
-        for node in nodes_to_unfail_iterator:
-            try:
-                self.unfail_node(node.name)
-            except ModelException:
-                pass
+        # Validate the model once, after all of the SRLG's members are unfailed
+        with self.batch_edit():
+            # Node will stay failed if it's part of another SRLG that is still failed;
+            # in that case, the unfail_node will create an exception; ignore that exception
+            for node in nodes_to_unfail_iterator:
+                try:
+                    self.unfail_node(node.name)
+                except ModelException:
+                    pass
 
-        # Find SRLG's Interfaces to unfail
-        interfaces_to_unfail_iterator = (
-            interface
-            for interface in self.interface_objects
-            if interface in srlg_to_unfail.interface_objects
-        )
+            # Find SRLG's Interfaces to unfail
+            interfaces_to_unfail_iterator = (
+                interface
+                for interface in self.interface_objects
+                if interface in srlg_to_unfail.interface_objects
+            )
 
-        # Interface will stay failed if it's part of another SRLG that is still failed or
-        # if the local/remote Node is failed;  in that case, the unfail_interface
-        # will create an exception; ignore that exception
-        for interface in interfaces_to_unfail_iterator:
-            try:
-                self.unfail_interface(interface.name, interface.node_object.name)
-            except ModelException:
-                pass
+            # Interface will stay failed if it's part of another SRLG that is still failed or
+            # if the local/remote Node is failed;  in that case, the unfail_interface
+            # will create an exception; ignore that exception
+            for interface in interfaces_to_unfail_iterator:
+                try:
+                    self.unfail_interface(interface.name, interface.node_object.name)
+                except ModelException:
+                    pass
 
     def add_srlg(self, srlg_name):
         """
@@ -1091,16 +1529,45 @@ class Model(object):
 
         :param node_object: Node object to add to self
         """
+        self.node_objects.add(self._make_node(node_object))
+
+        self._validate_edit()
+
+    def add_nodes(self, nodes):
+        """
+        Adds multiple Nodes to the model and validates the model once.
+
+        Each Node is given as a Node object, as a tuple of Node arguments::
+
+            (name, lat, lon)
+
+        or as a dict of them, keyed by argument name.  lat and lon are optional.
+        If any row is bad (duplicate Node name, etc), no Nodes are added and the
+        ModelException lists all of the bad rows.
+
+        :param nodes: iterable of Node objects, tuples or dicts
+        """
+        self._add_rows(nodes, self._make_node, self.node_objects)
+
+        self._validate_edit()
+
+    def _make_node(self, name, lat=0, lon=0):
+        """
+        Returns the Node to add for add_node() or add_nodes(); raises
+        ModelException if a Node with the same name is already in self
+
+        :param name: Node object, or name of new Node
+        :param lat: latitude of new Node
+        :param lon: longitude of new Node
+        """
+        node_object = name if isinstance(name, Node) else Node(name, lat, lon)
 
-        if node_object.name in (node.name for node in self.node_objects):
+        if self.node_objects.lookup("name", node_object.name):
             message = "A node with name {} already exists in the model".format(
                 node_object.name
             )
             raise ModelException(message)
-        else:
-            self.node_objects.add(node_object)
-
-        self.validate_model()
+        return node_object
 
     def get_node_object(self, node_name):
         """
@@ -1109,7 +1576,7 @@ class Model(object):
         :param node_name: name of Node object in self
         :return: Node object with node_name
         """
-        matching_node = [node for node in self.node_objects if node.name == node_name]
+        matching_node = self.node_objects.lookup("name", node_name)
 
         if matching_node:
             return matching_node[0]
@@ -1127,16 +1594,44 @@ class Model(object):
         :param name: name of LSP
         :return: A validated Model with the new RSVP_LSP object
         """
+        self.rsvp_lsp_objects.add(
+            self._make_rsvp_lsp(source_node_name, dest_node_name, name)
+        )
+
+        self._validate_edit()
+
+    def add_rsvp_lsps(self, lsps):
+        """
+        Adds multiple RSVP LSPs to the model and validates the model once.
+
+        Each LSP is given as a tuple of add_rsvp_lsp() arguments::
+
+            (source_node_name, dest_node_name, name)
+
+        or as a dict of them, keyed by argument name.  If any row is bad
+        (unknown Node, duplicate LSP, etc), no LSPs are added and the
+        ModelException lists all of the bad rows.
+
+        :param lsps: iterable of tuples or dicts
+        :return: A validated Model with the new RSVP_LSP objects
+        """
+        self._add_rows(lsps, self._make_rsvp_lsp, self.rsvp_lsp_objects)
+
+        self._validate_edit()
+
+    def _make_rsvp_lsp(self, source_node_name, dest_node_name, name):
+        """
+        Returns a new RSVP_LSP for add_rsvp_lsp(); raises ModelException if
+        the LSP is already in self
+        """
         source_node_object = self.get_node_object(source_node_name)
         dest_node_object = self.get_node_object(dest_node_name)
         added_lsp = RSVP_LSP(source_node_object, dest_node_object, name)
 
-        if added_lsp._key in {lsp._key for lsp in self.rsvp_lsp_objects}:
+        if self.rsvp_lsp_objects.lookup("key", added_lsp._key):
             message = "{} already exists in rsvp_lsp_objects".format(added_lsp)
             raise ModelException(message)
-        self.rsvp_lsp_objects.add(added_lsp)
-
-        self.validate_model()
+        return added_lsp
 
     def get_demand_object(self, source_node_name, dest_node_name, demand_name="none"):
         """
@@ -1148,45 +1643,166 @@ class Model(object):
         :param demand_name: name of Demand object
         :return: desired Demand object that matches parameters above
         """
-        model_demand_iterator = iter(self.demand_objects)
-
-        demand_to_return = None
-
-        for demand in model_demand_iterator:
-            if (
-                demand.source_node_object.name == source_node_name
-                and demand.dest_node_object.name == dest_node_name
-                and demand.name == demand_name
-            ):
-                demand_to_return = demand
-                return demand_to_return
+        matching_demands = self.demand_objects.lookup(
+            "key", (source_node_name, dest_node_name, demand_name)
+        )
 
-        if demand_to_return is None:
+        if matching_demands:
+            return matching_demands[0]
+        else:
             raise ModelException("no matching demand")
 
-    def get_rsvp_lsp(self, source_node_name, dest_node_name, lsp_name="none"):
+    @property
+    def demand_table(self):
         """
-        Returns the RSVP LSP from the model with the specified source node
-        name, dest node name, and LSP name.
+        The Model's DemandTable (see set_demand_table), or None
+        """
+        return self._demand_table
 
-        :param source_node_name: name of source node for LSP
-        :param dest_node_name: name of destination node for LSP
-        :param lsp_name: name of LSP
-        :return: RSVP_LSP object
+    def set_demand_table(self, demand_table):
         """
+        Sets a table of Demands (see pyNTM.demand_table.DemandTable) to be
+        routed by update_simulation() along with demand_objects, for traffic
+        matrices too large to hold as Demand objects.  The Demands in the
+        table with the same source and dest Nodes are routed together, as
+        one Demand with their aggregate traffic: they ride the same LSPs,
+        count towards the same auto-bandwidth LSP reservations and share the
+        same IGP route as Demand objects would.  Their traffic is on the
+        Interfaces, but they are not in demand_objects, Interface.demands or
+        routing_matrix(); get_table_demand() returns a Demand object for
+        one of them.  update_simulation(incremental=True) runs a full update
+        while a table is set.
 
-        needed_key = (source_node_name, dest_node_name, lsp_name)
+        :param demand_table: DemandTable, or None to remove the table
+        :return: None
+        """
+        if demand_table is not None:
+            unknown_node_names = set(demand_table.node_names) - {
+                node.name for node in self.node_objects
+            }
+            if unknown_node_names:
+                raise ModelException(
+                    "demand table has Nodes that are not in the Model: {}".format(
+                        sorted(unknown_node_names)
+                    )
+                )
+            duplicate_keys = demand_table.duplicate_keys()
+            if duplicate_keys:
+                raise ModelException(
+                    "demand table has duplicate Demands: {}".format(duplicate_keys)
+                )
 
-        if needed_key not in (lsp._key for lsp in self.rsvp_lsp_objects):
+        self._demand_table = demand_table
+        self._demand_table_demands = {}
+        self._versions.bump("demands")
+
+    def _make_demand_table_demands(self):
+        """
+        Returns one Demand for each source and dest Node pair in the demand
+        table, with the pair's aggregate traffic, keyed by
+        'source_node_name-dest_node_name'; see set_demand_table
+        """
+        if self._demand_table is None:
+            return {}
+
+        demand_table_demands = {}
+        for (
+            source_node_name,
+            dest_node_name,
+            traffic,
+        ) in self._demand_table.pair_traffic():
+            demand_table_demands["{}-{}".format(source_node_name, dest_node_name)] = (
+                Demand(
+                    self.get_node_object(source_node_name),
+                    self.get_node_object(dest_node_name),
+                    traffic,
+                    "demand_table",
+                )
+            )
+        return demand_table_demands
+
+    def get_table_demand(self, source_node_name, dest_node_name, demand_name="none"):
+        """
+        Returns a Demand object for a Demand in the demand table, with the
+        path its source and dest Node pair took in the last simulation.  A
+        new Demand is made for each call; it is not added to the Model.
+
+        :param source_node_name: name of Node where desired Demand originates (source)
+        :param dest_node_name: name of Node where desired Demand terminates (destination)
+        :param demand_name: name of Demand
+        :return: Demand object; raises ModelException if there is no
+                 demand table or no matching Demand in it
+        """
+        if self._demand_table is None:
+            raise ModelException("no matching demand")
+        row = self._demand_table.find(source_node_name, dest_node_name, demand_name)
+
+        demand = Demand(
+            self.get_node_object(source_node_name),
+            self.get_node_object(dest_node_name),
+            float(self._demand_table.traffic[row]),
+            demand_name,
+        )
+
+        pair_demand = self._demand_table_demands.get(
+            "{}-{}".format(source_node_name, dest_node_name)
+        )
+        if pair_demand is None or not pair_demand._is_routed():
+            return demand
+
+        # The path detail is built from the path when it is requested,
+        # except for Demands that ride LSPs end to end
+        if pair_demand._dag_route is not None:
+            demand._set_dag_route(pair_demand._dag_route)
+        else:
+            demand.path = pair_demand.path
+        demand._path_detail = None
+        if pair_demand._path_detail is not None and not any(
+            "splits" in path_info for path_info in pair_demand._path_detail.values()
+        ):
+            demand._path_detail = self._lsp_path_detail(
+                demand, [path[0] for path in demand.path]
+            )
+        return demand
+
+    def get_unrouted_demand_table_rows(self):
+        """
+        Returns the rows of the Demands in the demand table that were not
+        routed in the last simulation
+
+        :return: numpy array of rows; None if there is no demand table
+        """
+        if self._demand_table is None:
+            return None
+        return self._demand_table.pair_rows(
+            (demand.source_node_object.name, demand.dest_node_object.name)
+            for demand in self._demand_table_demands.values()
+            if not demand._is_routed()
+        )
+
+    def get_rsvp_lsp(self, source_node_name, dest_node_name, lsp_name="none"):
+        """
+        Returns the RSVP LSP from the model with the specified source node
+        name, dest node name, and LSP name.
+
+        :param source_node_name: name of source node for LSP
+        :param dest_node_name: name of destination node for LSP
+        :param lsp_name: name of LSP
+        :return: RSVP_LSP object
+        """
+
+        needed_key = (source_node_name, dest_node_name, lsp_name)
+
+        matching_lsps = self.rsvp_lsp_objects.lookup("key", needed_key)
+
+        if not matching_lsps:
             msg = (
                 "LSP with source node %s, dest node %s, and name %s "
                 "does not exist in model" % (source_node_name, dest_node_name, lsp_name)
             )
             raise ModelException(msg)
         else:
-            for lsp in iter(self.rsvp_lsp_objects):
-                if lsp._key == needed_key:
-                    return lsp
+            return matching_lsps[0]
 
     def _make_network_interfaces(self, interface_info_list):
         """
@@ -1213,10 +1829,9 @@ class Model(object):
             network_interface_objects.add(intf)
 
             # Check to see if the Interface's Node already exists, if not, add it
-            node_names = [node.name for node in self.node_objects]
-            if interface["node"] not in node_names:
+            if not self.node_objects.lookup("name", interface["node"]):
                 network_node_objects.add(Node(interface["node"]))
-            if interface["remote_node"] not in node_names:
+            if not self.node_objects.lookup("name", interface["remote_node"]):
                 network_node_objects.add(Node(interface["remote_node"]))
 
         return (network_interface_objects, network_node_objects)
@@ -1283,7 +1898,7 @@ class Model(object):
         )
         self.node_objects = self.node_objects.union(new_node_objects)
         self.interface_objects = self.interface_objects.union(new_interface_objects)
-        self.validate_model()
+        self._validate_edit()
 
     def validate_model(self):
         """
@@ -1381,49 +1996,120 @@ class Model(object):
         else:
             return self
 
-    def update_simulation(self):
+    def _validate_edit(self):
+        """
+        Runs validate_model() after an edit to self, or defers it to the
+        end of the enclosing batch_edit() block
+        """
+        if self._batch_edit_depth:
+            self._validation_pending = True
+        else:
+            self.validate_model()
+
+    @contextmanager
+    def batch_edit(self):
+        """
+        Context manager for a block of edits to the Model.  The validate_model()
+        call that each edit (add_demand(), add_circuit(), unfail_interface(),
+        unfail_node(), etc) normally makes is deferred, and validate_model()
+        runs once when the outermost batch_edit() block exits.  If the block
+        raises an exception, the deferred validation is skipped.
+
+        update_simulation() inside the block runs any deferred validation
+        before routing.
+
+        Example::
+
+            >>> with model.batch_edit():
+            ...     for node_name in maintenance_node_names:
+            ...         model.fail_node(node_name)
+            ...     model.add_demand('A', 'D', 50, 'new_dmd_a_d')
+            >>> model.update_simulation()
+
+        :return: self
+        """
+        self._batch_edit_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_edit_depth -= 1
+            if not self._batch_edit_depth:
+                self._validation_pending = False
+            raise
+        self._batch_edit_depth -= 1
+        if not self._batch_edit_depth and self._validation_pending:
+            self._validation_pending = False
+            self.validate_model()
+
+    def update_simulation(self, incremental=False):
         """
         Updates the simulation state; this needs to be run any time there is
         a change to the state of the Model, such as failing an interface, adding
         a Demand, adding/removing and LSP, etc.
 
-        This call does not carry forward any state from the previous simulation
-        results.
+        By default, this call does not carry forward any state from the previous
+        simulation results.
+
+        With incremental=True, if the only changes since the last simulation
+        are Interfaces failing, unfailing or changing cost (fail_interface(),
+        unfail_interface(), set_interface_cost(), fail_node(), etc), the
+        shortest path DAGs are repaired instead of recomputed, only the Demands
+        whose shortest paths changed are rerouted, and Interface traffic is
+        adjusted by the difference.  Demand traffic and Interface capacity
+        changes (set_demand_traffic(), set_interface_capacity(), or the Demand
+        and Interface properties; see versions) are load only: Interface
+        traffic is adjusted by each Demand's share of its traffic change
+        without rerouting, and only the parallel LSP groups whose reservations
+        depend on the change are re-signaled.  Any other change, such as
+        objects added to or removed from the Model or changes to the LSPs,
+        falls back to a full update, as do changes in a Model with RSVP LSPs
+        other than failures and load only changes.
+
+        The results are left on the Model's objects (Interface.traffic,
+        Demand.path, etc) and are also returned as a SimulationResult, an
+        immutable, picklable snapshot that can be kept and compared with the
+        results of other runs (see pyNTM.simulation_result.SimulationResult).
+        The result is built from references taken at the end of the update
+        when it is first used, so taking it adds little to an update.
+
+        :param incremental: reroute only the Demands affected by Interface
+            changes since the last simulation, if possible
+        :return: SimulationResult
+        """
+        self._run_simulation(incremental)
+        return SimulationResult.from_model(self)
+
+    def _run_simulation(self, incremental=False):
+        """
+        Runs update_simulation() without taking a SimulationResult, for the
+        callers that only read the results from the Model's objects
+
+        :param incremental: see update_simulation()
+        :return: None
         """
+        if self.load_propagation not in ("paths", "dag"):
+            msg = "load_propagation must be 'paths' or 'dag'; got {!r}".format(
+                self.load_propagation
+            )
+            raise ModelException(msg)
+
+        # Validate any edits deferred by an enclosing batch_edit() block
+        if self._validation_pending:
+            self._validation_pending = False
+            self.validate_model()
 
-        self._parallel_lsp_groups = {}  # Reset the attribute
+        self._adopt_interfaces()
 
-        # This set of interfaces can be used to route traffic
-        non_failed_interfaces = set()
-        # This set of nodes can be used to route traffic
-        available_nodes = set()
+        if incremental and self._update_simulation_incremental():
+            self._routing_graph_changes = {}
+            return
 
-        # Find all the non-failed interfaces in the model and
-        # add them to non_failed_interfaces.
-        # If the interface is not failed, then by definition, the nodes are
-        # not failed
-        for interface_object in (
-            interface_object
-            for interface_object in self.interface_objects
-            if interface_object.failed is not True
-        ):
-            non_failed_interfaces.add(interface_object)
-            available_nodes.add(interface_object.node_object)
-            available_nodes.add(interface_object.remote_node_object)
-
-        # Create a model consisting only of the non-failed interfaces and
-        # corresponding non-failed (available) nodes
-        non_failed_interfaces_model = Model(
-            non_failed_interfaces,
-            available_nodes,
-            self.demand_objects,
-            self.rsvp_lsp_objects,
-        )
+        self._routing_index = None
 
         # Reset the reserved_bandwidth, traffic on each interface
-        for interface in iter(self.interface_objects):
-            interface.reserved_bandwidth = 0
-            interface.traffic = 0
+        self._interface_state.reset_reservations()
+        self._interface_state.reset_traffic()
+        self._versions.bump("reservations")
 
         for lsp in iter(self.rsvp_lsp_objects):
             lsp.path = "Unrouted"
@@ -1432,6 +2118,8 @@ class Model(object):
         for demand in iter(self.demand_objects):
             demand.path = "Unrouted"
 
+        self._demand_table_demands = self._make_demand_table_demands()
+
         time_before_lsp_load = datetime.now()
         print("Routing the LSPs . . . ")
         # Route the RSVP LSPs
@@ -1444,12 +2132,784 @@ class Model(object):
         )
         # Route the demands
         demand_load_start_time = datetime.now()
-        self = self._route_demands(non_failed_interfaces_model)
+        self = self._route_demands(self)
         demand_load_time = datetime.now() - demand_load_start_time
         print("Demands routed in {}; validating model . . . ".format(demand_load_time))
 
         self.validate_model()
 
+        self._simulation_baseline = {
+            "load_propagation": self.load_propagation,
+            "interface_objects": (
+                self.interface_objects,
+                self.interface_objects._version,
+            ),
+            "demand_objects": (self.demand_objects, self.demand_objects._version),
+            "rsvp_lsp_objects": (
+                self.rsvp_lsp_objects,
+                self.rsvp_lsp_objects._version,
+            ),
+            "lsps_version": self._versions["lsps"],
+        }
+        self._igp_routed_demands = None
+        self._versions.clear_changes()
+        self._routing_graph_changes = {}
+
+    def _update_simulation_incremental(self):
+        """
+        Brings the simulation up to date after Interfaces have gone down,
+        come back up or had their cost or capacity changed, or Demands have
+        had their traffic changed, since the last simulation.
+
+        The shortest path DAG from each demand source Node is repaired in
+        place of a new SPF (see SPFDag.repair), only the Demands whose
+        shortest paths changed are rerouted, and the traffic on the
+        Interfaces is adjusted by the difference between each rerouted
+        Demand's old and new routes.  Traffic changes keep the Demand routes;
+        only the LSPs in parallel LSP groups with auto-bandwidth LSPs that
+        carry an edited Demand, and the LSPs whose reservations no longer fit
+        an Interface with a lowered capacity, are re-signaled.
+
+        :return: True if the simulation was updated; False, without changing
+                 the simulation results, if a full update_simulation() is needed
+        """
+        if not self._simulation_baseline_is_current():
+            return False
+
+        # Demand traffic and Interface capacity at the last simulation for
+        # the Demands and Interfaces changed since
+        demand_edits = self._versions.pop_changes("demands")
+        capacity_edits = self._versions.pop_changes("capacity")
+
+        # Unrouted LSPs may signal with more reservable bandwidth
+        if any(
+            interface._max_reservable_bandwidth > max_reservable_bandwidth
+            for interface, max_reservable_bandwidth in capacity_edits.items()
+        ) and any(lsp.path == "Unrouted" for lsp in self.rsvp_lsp_objects):
+            return False
+
+        if self._igp_routed_demands is None:
+            self._igp_routed_demands = self._make_igp_routed_demands()
+        igp_routed_demands = self._igp_routed_demands
+
+        # Demands to reroute, with the traffic they add to each Interface
+        # on their current routes
+        rerouted_demands = {}
+
+        # Demand traffic edits are load only: the Demands keep their routes
+        changed_traffic = self._apply_demand_traffic_edits(demand_edits)
+
+        # LSPs to re-signal
+        broken_lsps = self._lsps_broken_by_edits(demand_edits, capacity_edits)
+        # They are released before the routing graph is synced so the
+        # Interfaces whose capacity was lowered stay in the graph
+        if broken_lsps:
+            self._release_lsps(broken_lsps, rerouted_demands, igp_routed_demands)
+
+        G = self._sync_routing_graph()
+        changes = self._pop_routing_graph_changes()
+        changed_interfaces = changes["added"] + changes["removed"] + changes["cost"]
+
+        removed = set(changes["removed"])
+        if self.rsvp_lsp_objects and changed_interfaces:
+            # New or cheaper paths can move the LSPs
+            if changes["added"] or changes["cost"]:
+                return False
+            # A change in IGP cost can change which LSPs in a group carry the
+            # group's Demands if the LSPs mix manual and IGP metrics
+            for lsps in self._get_parallel_lsp_groups().values():
+                if len({lsp.manual_metric == "not set" for lsp in lsps}) > 1:
+                    return False
+            # LSPs that lost an Interface; the other LSPs keep their paths
+            # and reservations
+            failed_lsps = {
+                lsp
+                for lsp in self.rsvp_lsp_objects
+                if lsp.path != "Unrouted"
+                and not removed.isdisjoint(lsp.path["interfaces"])
+            }
+            self._release_lsps(failed_lsps, rerouted_demands, igp_routed_demands)
+            broken_lsps.update(failed_lsps)
+
+        if broken_lsps:
+            self._resignal_lsps(broken_lsps, G)
+
+        if not changed_interfaces and not rerouted_demands:
+            self._clear_traffic_rounding_error(changed_traffic)
+            self._set_failed_interface_traffic()
+            self._routing_index = None
+            return True
+
+        # Repair the DAG from each source and collect the Demands to
+        # destinations whose shortest paths changed
+        ecmp_links = self._repair_spf_dags(
+            G, changed_interfaces, igp_routed_demands, rerouted_demands
+        )
+        spf_dags = self._spf_dags
+
+        print(
+            "Rerouting {} demands affected by {} changed interfaces . . . ".format(
+                len(rerouted_demands), len(changed_interfaces)
+            )
+        )
+
+        for interface in changes["added"]:
+            interface.traffic = 0.0
+
+        # LSP metrics that follow the IGP may have changed
+        for lsp in self.rsvp_lsp_objects:
+            lsp.clear_effective_metric_cache()
+        self._set_lsp_effective_metrics(spf_dags, ecmp_links)
+
+        changed_traffic.update(
+            self._reroute_demands(
+                rerouted_demands, G, spf_dags, ecmp_links, igp_routed_demands
+            )
+        )
+
+        self._clear_traffic_rounding_error(changed_traffic)
+        self._set_failed_interface_traffic()
+        self._routing_index = None
+
+        return True
+
+    def _simulation_baseline_is_current(self):
+        """
+        Returns True if the Model has only changed since the last simulation
+        in ways that _update_simulation_incremental can bring the simulation
+        up to date with
+        """
+        baseline = self._simulation_baseline
+        if baseline is None or baseline["load_propagation"] != self.load_propagation:
+            return False
+        for attribute in ("interface_objects", "demand_objects", "rsvp_lsp_objects"):
+            object_set, version = baseline[attribute]
+            if (
+                getattr(self, attribute) is not object_set
+                or object_set._version != version
+            ):
+                return False
+
+        # LSP settings changed
+        if self._versions["lsps"] != baseline["lsps_version"]:
+            return False
+
+        # The demand table's arrays can change without bumping the versions
+        if self._demand_table is not None:
+            return False
+
+        # Demand routes only stay DagRoutes when no IGP shortcuts can apply
+        if any(node.igp_shortcuts_enabled for node in self.node_objects):
+            return False
+
+        return True
+
+    def _lsps_broken_by_edits(self, demand_edits, capacity_edits):
+        """
+        Returns the set of RSVP_LSPs to re-signal after Demand traffic and
+        Interface capacity edits: the LSPs in parallel LSP groups with
+        auto-bandwidth LSPs that carry an edited Demand, and the LSPs whose
+        reservations no longer fit an Interface with a lowered capacity.
+
+        :param demand_edits: dict of the traffic of each edited Demand at the
+                             last simulation, keyed by Demand
+        :param capacity_edits: dict of the maximum reservable bandwidth of
+                               each edited Interface at the last simulation,
+                               keyed by Interface
+        """
+        broken_lsps = set()
+        if not self.rsvp_lsp_objects:
+            return broken_lsps
+        parallel_lsp_groups = self._get_parallel_lsp_groups()
+        # Auto-bandwidth LSPs reserve an even share of the traffic of the
+        # Demands that ride their group, so the group is re-signaled
+        for demand in demand_edits:
+            lsps = parallel_lsp_groups.get(
+                "{}-{}".format(
+                    demand.source_node_object.name, demand.dest_node_object.name
+                ),
+                [],
+            )
+            if any(lsp.configured_setup_bandwidth is None for lsp in lsps):
+                broken_lsps.update(lsps)
+        for lsp in self.rsvp_lsp_objects:
+            if lsp.path != "Unrouted" and any(
+                interface in capacity_edits and interface.reservable_bandwidth < 0
+                for interface in lsp.path["interfaces"]
+            ):
+                broken_lsps.add(lsp)
+        return broken_lsps
+
+    def _resignal_lsps(self, broken_lsps, G):
+        """
+        Re-places the released LSPs in the order of their parallel LSP
+        groups, then re-optimizes the groups they are in.
+
+        :param broken_lsps: set of the released RSVP_LSPs to re-signal
+        :param G: the routing graph, synced to the Model
+        """
+        parallel_lsp_groups = self._get_parallel_lsp_groups()
+        parallel_demand_groups = self._get_parallel_demand_groups()
+        touched_groups = {
+            "{}-{}".format(lsp.source_node_object.name, lsp.dest_node_object.name)
+            for lsp in broken_lsps
+        }
+        print(
+            "Re-signaling {} LSPs in {} parallel LSP groups . . . ".format(
+                len(broken_lsps), len(touched_groups)
+            )
+        )
+
+        self._cspf = CSPF(G, self._interface_state)
+        try:
+            for group, lsps in parallel_lsp_groups.items():
+                if group in touched_groups:
+                    self._route_parallel_lsp_group(
+                        [lsp for lsp in lsps if lsp in broken_lsps],
+                        lsps,
+                        group,
+                        parallel_demand_groups,
+                    )
+        finally:
+            self._cspf = None
+
+    def _repair_spf_dags(
+        self, G, changed_interfaces, igp_routed_demands, rerouted_demands
+    ):
+        """
+        Repairs the shortest path DAG from each source Node after the edges
+        of changed_interfaces changed (see SPFDag.repair), and adds the IGP
+        routed Demands to destinations whose shortest paths changed to
+        rerouted_demands, in place.
+
+        :param G: the routing graph, synced to the Model
+        :param changed_interfaces: list of the Interfaces whose edges in G
+                                   were added, removed or had their cost
+                                   changed
+        :param igp_routed_demands: IGP routed Demands, keyed by source and
+                                   destination Node name; the Demands added
+                                   to rerouted_demands are taken out
+        :param rerouted_demands: dict of the Demands to reroute, with the
+                                 traffic they put on each Interface
+        :return: dict of ECMP Interface lists shared by the repaired DAGs
+        """
+        changed_node_pairs = {
+            (interface.node_object.name, interface.remote_node_object.name)
+            for interface in changed_interfaces
+        }
+        spf_dags = self._spf_dags
+        ecmp_links = {}
+        for src, spf_dag in list(spf_dags.items()):
+            repaired_spf_dag, dest_node_names = spf_dag.repair(
+                G, changed_node_pairs, ecmp_links
+            )
+            if repaired_spf_dag is spf_dag:
+                continue
+            spf_dags[src] = repaired_spf_dag
+            self._path_cache.put(
+                ("spf_dag", src), self._routing_graph_version, repaired_spf_dag
+            )
+            demands_by_dest = igp_routed_demands.get(src, {})
+            for dest_node_name in dest_node_names:
+                for demand in demands_by_dest.pop(dest_node_name, ()):
+                    if demand not in rerouted_demands:
+                        rerouted_demands[demand] = self._demand_interface_traffic(
+                            demand
+                        )
+        return ecmp_links
+
+    def _reroute_demands(
+        self, rerouted_demands, G, spf_dags, ecmp_links, igp_routed_demands
+    ):
+        """
+        Takes each rerouted Demand's traffic off the Interfaces on its old
+        route, routes it again and puts its traffic on the Interfaces on its
+        new route.
+
+        :param rerouted_demands: dict of the Demands to reroute, with the
+                                 traffic they put on each Interface on their
+                                 old routes
+        :param G: the routing graph, synced to the Model
+        :param spf_dags: dict of the shortest path DAGs keyed by source Node
+                         name
+        :param ecmp_links: dict of ECMP Interface lists shared by spf_dags
+        :param igp_routed_demands: IGP routed Demands, keyed by source and
+                                   destination Node name; the rerouted
+                                   Demands that are IGP routed are added back
+        :return: set of Interfaces whose traffic changed
+        """
+        changed_traffic = set()
+        igp_routes = {}
+        for demand, old_interface_traffic in rerouted_demands.items():
+            for interface, traffic in old_interface_traffic.items():
+                interface.traffic -= traffic
+                changed_traffic.add(interface)
+
+            self._route_demand(demand, G, spf_dags, ecmp_links, igp_routes, set())
+            if demand._dag_route is not None or not demand._is_routed():
+                igp_routed_demands.setdefault(
+                    demand.source_node_object.name, {}
+                ).setdefault(demand.dest_node_object.name, []).append(demand)
+            if not demand._is_routed():
+                continue
+
+            if demand._dag_route is None:
+                demand._path_detail = self._lsp_path_detail(
+                    demand, [path[0] for path in demand.path]
+                )
+            elif self.load_propagation == "paths":
+                demand._path_detail = demand._make_path_detail()
+            else:
+                demand._path_detail = None  # built if/when requested
+            for interface, traffic in self._demand_interface_traffic(demand).items():
+                interface.traffic += traffic
+                changed_traffic.add(interface)
+        return changed_traffic
+
+    @staticmethod
+    def _clear_traffic_rounding_error(interfaces):
+        """
+        Clears the rounding error left on the traffic of interfaces by
+        taking traffic off and back on
+        """
+        for interface in interfaces:
+            if abs(interface.traffic) < 1e-9:
+                interface.traffic = 0.0
+
+    def _set_failed_interface_traffic(self):
+        """
+        Sets the traffic on the failed Interfaces to 'Down', and on the
+        Interfaces that came back up to 0, as a full update_simulation()
+        does; this includes Interfaces that are not in the routing graph
+        (see _sync_routing_graph), whose failure or restoration does not
+        change the graph
+        """
+        self._interface_state.set_failed_traffic()
+
+    def _apply_demand_traffic_edits(self, demand_edits):
+        """
+        Moves the traffic each edited Demand puts on the Interfaces along its
+        current route from its traffic at the last simulation to its current
+        traffic.  An IGP routed Demand adds its share of the traffic change
+        to each Interface on its route.
+
+        :param demand_edits: dict of the traffic of each edited Demand at the
+                             last simulation, keyed by Demand
+        :return: set of Interfaces whose traffic changed
+        """
+        changed_traffic = set()
+        dag_route_shares = {}
+        for demand, old_traffic in demand_edits.items():
+            if not demand._is_routed() or demand.traffic == old_traffic:
+                continue
+
+            if demand._dag_route is not None:
+                traffic_change = demand.traffic - old_traffic
+                for interface, share in self._demand_interface_shares(
+                    demand, dag_route_shares
+                ).items():
+                    interface.traffic += share * traffic_change
+                    changed_traffic.add(interface)
+                if self.load_propagation == "paths":
+                    demand._path_detail = demand._make_path_detail()
+                else:
+                    demand._path_detail = None  # built if/when requested
+                continue
+
+            # End to end on LSPs
+            for interface, traffic in self._demand_interface_traffic(demand).items():
+                interface.traffic -= traffic
+                changed_traffic.add(interface)
+            demand._path_detail = self._lsp_path_detail(
+                demand, [path[0] for path in demand.path]
+            )
+            for interface, traffic in self._demand_interface_traffic(demand).items():
+                interface.traffic += traffic
+                changed_traffic.add(interface)
+
+        return changed_traffic
+
+    def _release_lsps(self, lsps, rerouted_demands, igp_routed_demands):
+        """
+        Releases the bandwidth reserved by the routed LSPs in lsps and marks
+        them Unrouted so they can be re-signaled.  The Demands that could
+        ride their parallel LSP groups are first added to rerouted_demands,
+        with the traffic they add to each Interface on their current routes,
+        and taken out of igp_routed_demands.
+
+        :param lsps: set of RSVP_LSP objects
+        :param rerouted_demands: dict of Demands to reroute; see
+                                 _update_simulation_incremental
+        :param igp_routed_demands: see _make_igp_routed_demands
+        :return: None
+        """
+        parallel_demand_groups = self._get_parallel_demand_groups()
+        groups = {
+            "{}-{}".format(lsp.source_node_object.name, lsp.dest_node_object.name)
+            for lsp in lsps
+        }
+        for group in groups:
+            for demand in parallel_demand_groups.get(group, ()):
+                if demand in rerouted_demands:
+                    continue
+                rerouted_demands[demand] = self._demand_interface_traffic(demand)
+                dest_demands = igp_routed_demands.get(
+                    demand.source_node_object.name, {}
+                ).get(demand.dest_node_object.name, [])
+                if demand in dest_demands:
+                    dest_demands.remove(demand)
+
+        for lsp in lsps:
+            if lsp.path == "Unrouted":
+                continue
+            for interface in lsp.path["interfaces"]:
+                if not interface.failed:
+                    interface.reserved_bandwidth -= lsp.reserved_bandwidth
+            lsp.path = "Unrouted"
+
+    def _make_igp_routed_demands(self):
+        """
+        Returns the Demands that are not on LSPs (IGP routed on a DagRoute,
+        or Unrouted), grouped by source and destination Node names::
+
+            {source_node_name: {dest_node_name: [Demand, ...]}, ...}
+        """
+        igp_routed_demands = {}
+        for demand in self.demand_objects:
+            if demand._dag_route is not None or not demand._is_routed():
+                igp_routed_demands.setdefault(
+                    demand.source_node_object.name, {}
+                ).setdefault(demand.dest_node_object.name, []).append(demand)
+        return igp_routed_demands
+
+    def _demand_interface_traffic(self, demand):
+        """
+        Returns the traffic that routed demand adds to each Interface, as
+        _update_interface_utilization applies it
+
+        :param demand: Demand routed on a DagRoute or end to end on LSPs
+        :return: dict with Interfaces as keys and traffic on each Interface as values
+        """
+        if not demand._is_routed():
+            return {}
+        if self.load_propagation == "dag" and demand._dag_route is not None:
+            return demand._dag_route.interface_traffic(demand.traffic)
+
+        interface_traffic = defaultdict(float)
+        for path_info in demand.path_detail.values():
+            for item in path_info["items"]:
+                if isinstance(item, RSVP_LSP):
+                    for interface in item.path["interfaces"]:
+                        interface_traffic[interface] += path_info["path_traffic"]
+                else:
+                    interface_traffic[item] += path_info["path_traffic"]
+        return interface_traffic
+
+    def _get_routing_index(self):
+        """
+        Returns the reverse indexes for the current routing, building them
+        the first time they are requested after a routing pass or after
+        Interfaces, Nodes, Demands or RSVP LSPs are added, removed or
+        changed:
+
+        - 'interface_demands': {Interface: {Demand: traffic from the Demand}}
+        - 'interface_lsps': {Interface: [routed RSVP LSPs egressing the Interface]}
+        - 'lsp_demands': {RSVP_LSP: {Demand: traffic from the Demand}}
+
+        The traffic values are the Demand's share of the traffic on the
+        Interface or LSP.  Building the indexes is one pass over the routed
+        Demands and LSPs, so the queries that use them (Interface.demands,
+        Interface.lsps, RSVP_LSP.demands_on_lsp) only cost the size of their
+        result.
+
+        :return: dict of reverse indexes
+        """
+        index_versions = self._versions.key("topology", "demands", "lsps")
+        if (
+            self._routing_index is None
+            or index_versions != self._routing_index_versions
+        ):
+            self._routing_index = self._make_routing_index()
+            self._routing_index_versions = index_versions
+        return self._routing_index
+
+    def _make_routing_index(self):
+        """
+        Builds the reverse indexes described in _get_routing_index
+        """
+        interface_demands = defaultdict(dict)
+        interface_lsps = defaultdict(list)
+        lsp_demands = defaultdict(dict)
+
+        for lsp in self.rsvp_lsp_objects:
+            if "Unrouted" not in lsp.path:
+                for interface in lsp.path["interfaces"]:
+                    interface_lsps[interface].append(lsp)
+
+        # Traffic per unit of demand traffic on each Interface of a DagRoute,
+        # which is shared by the Demands with the same source and dest
+        dag_route_shares = {}
+        for demand in self.demand_objects:
+            if not demand._is_routed():
+                continue
+
+            if self.load_propagation == "dag" and demand._dag_route is not None:
+                dag_route = demand._dag_route
+                if dag_route not in dag_route_shares:
+                    dag_route_shares[dag_route] = dag_route.interface_traffic(1.0)
+                for interface, share in dag_route_shares[dag_route].items():
+                    interface_demands[interface][demand] = share * demand.traffic
+                continue
+
+            for path_info in demand.path_detail.values():
+                path_traffic = path_info["path_traffic"]
+                for item in path_info["items"]:
+                    if isinstance(item, RSVP_LSP):
+                        lsp_demands[item][demand] = (
+                            lsp_demands[item].get(demand, 0.0) + path_traffic
+                        )
+                        interfaces = item.path["interfaces"]
+                    else:
+                        interfaces = [item]
+                    for interface in interfaces:
+                        interface_demands[interface][demand] = (
+                            interface_demands[interface].get(demand, 0.0) + path_traffic
+                        )
+
+        return {
+            "interface_demands": dict(interface_demands),
+            "interface_lsps": dict(interface_lsps),
+            "lsp_demands": dict(lsp_demands),
+        }
+
+    def routing_matrix(self):
+        """
+        Returns the sparse routing matrix R for the last simulation: one row
+        per Demand, one column per Interface, and R[i, j] the fraction of
+        the traffic of Demand i that egresses Interface j.  With the routing
+        held fixed, R.T @ traffic gives the Interface traffic for any vector
+        of Demand traffic values, so many traffic matrices can be evaluated
+        without rerouting.  See pyNTM.routing_matrix.RoutingMatrix, which
+        can also be saved to and loaded from a .npz file.
+
+        Requires numpy and scipy.
+
+        :return: RoutingMatrix
+        """
+        from .routing_matrix import RoutingMatrix
+
+        return RoutingMatrix.from_model(self)
+
+    def simulation_result(self):
+        """
+        Returns the results of the last update_simulation() as a
+        SimulationResult, as update_simulation() returned them: an
+        immutable, picklable snapshot of the Interface traffic and reserved
+        bandwidth, RSVP LSP paths and Demand routes, held apart from the
+        Model's objects, so results from different runs or forks (see fork)
+        can be kept, compared and merged after the Model has moved on.  See
+        pyNTM.simulation_result.SimulationResult.
+
+        :return: SimulationResult
+        """
+        return SimulationResult.from_model(self)
+
+    def evaluate_traffic_series(self, traffic, demand_keys=None):
+        """
+        Evaluates a series of traffic matrices for the same topology, such
+        as one matrix every five minutes, against the routing from the last
+        update_simulation(), without rerouting for each time step: the
+        Interface traffic for all the steps is one sparse product with the
+        routing matrix (see routing_matrix).
+
+        Demands riding RSVP LSPs are the exception when the Model has
+        auto-bandwidth LSPs (LSPs with no configured_setup_bandwidth),
+        since their LSP paths follow the traffic; those Demands are
+        rerouted with a full simulation of a copy of self for each distinct
+        set of their traffic values.  self is not changed.
+
+        Returns a dict::
+
+            {'interfaces': [Interface keys (name, node name), in row order],
+             'traffic': numpy array of Interface traffic (interfaces x steps),
+             'utilization': numpy array of Interface utilization percent
+                            (interfaces x steps); nan for failed Interfaces,
+             'peak_utilization': numpy array of each Interface's highest
+                                 utilization across the steps,
+             'p95_utilization': numpy array of each Interface's 95th
+                                percentile utilization across the steps,
+             'rerouted_demands': [keys of the Demands rerouted for each step]}
+
+        Requires numpy and scipy.
+
+        :param traffic: 2-D array-like of Demand traffic, one row per Demand
+                        and one column per time step
+        :param demand_keys: (optional) Demand keys (source, dest, name) for
+                            the rows of traffic; defaults to the Demands sorted
+                            by key.  Demands that are not listed carry no traffic
+        :return: dict of traffic series results
+        """
+        from .traffic_series import run_traffic_series
+
+        return run_traffic_series(self, traffic, demand_keys)
+
+    def _demand_interface_shares(self, demand, dag_route_shares=None):
+        """
+        Returns the fraction of demand's traffic that egresses each
+        Interface, from the ECMP splits on the Demand's paths; traffic
+        carried on an LSP is on each of the LSP's Interfaces
+
+        :param demand: Demand object
+        :param dag_route_shares: (optional) dict to cache the shares for
+                                 each DagRoute in, keyed by DagRoute
+        :return: dict with Interfaces as keys and fractions as values; empty
+                 if demand is not routed
+        """
+        if not demand._is_routed():
+            return {}
+
+        # Hop by hop ECMP splits along the shortest path DAG give the same
+        # fractions as the splits on the explicit paths
+        if demand._dag_route is not None:
+            if dag_route_shares is None:
+                return demand._dag_route.interface_traffic(1.0)
+            dag_route = demand._dag_route
+            if dag_route not in dag_route_shares:
+                dag_route_shares[dag_route] = dag_route.interface_traffic(1.0)
+            return dag_route_shares[dag_route]
+
+        path_detail = demand.path_detail
+        shares = defaultdict(float)
+        for path_info in path_detail.values():
+            if "splits" in path_info:
+                path_share = 1.0 / max(path_info["splits"].values())
+            else:
+                # End to end on parallel LSPs, split evenly
+                path_share = 1.0 / len(path_detail)
+            for item in path_info["items"]:
+                if isinstance(item, RSVP_LSP):
+                    for interface in item.path["interfaces"]:
+                        shares[interface] += path_share
+                else:
+                    shares[item] += path_share
+        return dict(shares)
+
+    def fork(self):
+        """
+        Returns an independent copy of self for a what-if scenario, with the
+        results of the last simulation.  Changes to the fork (failures, cost,
+        capacity and traffic changes, added or removed objects, etc) do not
+        change self, so many scenarios can be held in memory and compared.
+
+        Forking is much cheaper than loading the model file or pickling the
+        Model: the objects are copied with their attribute values shared,
+        and the shortest path DAGs from the last simulation are shared with
+        self, so the Demands' explicit paths are only rebuilt in the fork if
+        they are requested.  update_simulation(incremental=True) on the fork
+        starts from the last simulation of self.  See pyNTM.fork.fork_model.
+
+        :return: Model object
+        """
+        return fork_model(self)
+
+    def save_snapshot(self, snapshot_file=None):
+        """
+        Saves the Model, with the results of the last simulation, to a
+        binary snapshot that load_snapshot() reopens without reading the
+        model file or running update_simulation().
+
+        The explicit paths of Demands routed along a shortest path DAG are
+        left out and rebuilt if they are requested after loading, and
+        numpy arrays such as the columns of a demand table are memory
+        mapped from the snapshot when it is loaded.  See pyNTM.snapshot.
+
+        A snapshot of a Model loaded with load_model_file(use_snapshot=True),
+        saved to the default snapshot file of the model file (the model file
+        name with '.snapshot' appended) before any change to the Model other
+        than update_simulation(), is reused by
+        load_model_file(use_snapshot=True) for as long as the contents of
+        the model file are unchanged.
+
+        :param snapshot_file: (optional) file name; defaults to the
+                              default snapshot file of the model file
+        :return: None
+        """
+        if snapshot_file is None:
+            if self._source is None:
+                raise ModelException(
+                    "Model was not loaded from a model file; a snapshot_file "
+                    "must be given"
+                )
+            snapshot_file = default_snapshot_file(self._source[0])
+        write_snapshot(self, snapshot_file)
+
+    @classmethod
+    def load_snapshot(cls, snapshot_file):
+        """
+        Loads a Model saved by save_snapshot(), with its simulation results.
+        Snapshots are pickles: only load snapshots from trusted sources.
+
+        :param snapshot_file: file name
+        :return: Model object
+        """
+        model = read_snapshot(snapshot_file)
+        if not isinstance(model, cls):
+            raise ModelException(
+                "{} holds a {}, not a {}".format(
+                    snapshot_file, type(model).__name__, cls.__name__
+                )
+            )
+        return model
+
+    def failure_sweep(
+        self,
+        circuits=True,
+        nodes=True,
+        srlgs=True,
+        max_workers=None,
+        per_scenario_utilization=True,
+    ):
+        """
+        Runs an N-1 failure sweep: fails each Circuit, then each Node, then each
+        SRLG in self one at a time, runs update_simulation() and records the
+        results.  Objects that are already failed are not swept.
+
+        The scenarios are spread across a pool of max_workers processes, each
+        with its own copy of self, so self is not changed.
+
+        Returns a dict::
+
+            {'interfaces': [Interface keys (name, node name), in result order],
+             'scenarios': [{'failure': ('circuit', Circuit key) |
+                                       ('node', node name) |
+                                       ('srlg', SRLG name),
+                            'max_utilization': highest Interface utilization,
+                            'utilization': [utilization of each Interface; None if down],
+                            'unrouted_demands': [Demand keys (source, dest, name)],
+                            'unrouted_lsps': [RSVP_LSP keys (source, dest, name)]},
+                           ...],
+             'worst_case_utilization': {Interface key: {'utilization': highest utilization,
+                                                        'failure': scenario with that utilization},
+                                        ...}}
+
+        :param circuits: fail each Circuit
+        :param nodes: fail each Node
+        :param srlgs: fail each SRLG
+        :param max_workers: number of worker processes; defaults to the number of
+            CPUs.  1 runs the sweep in this process
+        :param per_scenario_utilization: include the 'utilization' list in each
+            scenario; the worst case utilization is returned either way
+        :return: dict of sweep results
+        """
+        return run_failure_sweep(
+            self,
+            circuits=circuits,
+            nodes=nodes,
+            srlgs=srlgs,
+            max_workers=max_workers,
+            per_scenario_utilization=per_scenario_utilization,
+        )
+
     # TODO - for some reason this is getting called 2x when the model is being updated
     #  initially.  Troubleshoot that.
     def _route_demands(self, model):
@@ -1460,59 +2920,211 @@ class Model(object):
         :return: model with routed demands
         """
 
-        G = self._make_weighted_network_graph_mdg(include_failed_circuits=False)
+        G = self._sync_routing_graph()
 
-        for demand in model.demand_objects:
-            demand.path = []
+        # One SPFDag per demand source node, computed the first time a demand
+        # from that source needs to be IGP routed; the SPFDags share their
+        # ECMP Interface lists
+        spf_dags = {}
+        ecmp_links = {}
+        # IGP route (DagRoute, path list or 'Unrouted') for each
+        # (source, dest) node name pair
+        igp_routes = {}
+        shortcut_node_names = {
+            node.name for node in self.node_objects if node.igp_shortcuts_enabled
+        }
 
-            # Find all LSPs that can carry the demand from source to dest:
-            key = "{}-{}".format(
-                demand.source_node_object.name, demand.dest_node_object.name
+        # The LSP metrics are needed to pick the LSPs for the demands
+        self._set_lsp_effective_metrics(spf_dags, ecmp_links)
+
+        for demand in itertools.chain(
+            model.demand_objects, self._demand_table_demands.values()
+        ):
+            self._route_demand(
+                demand, G, spf_dags, ecmp_links, igp_routes, shortcut_node_names
             )
+        self._spf_dags = spf_dags
+
+        self._update_interface_utilization()
+
+        return self
+
+    def _route_demand(
+        self, demand, G, spf_dags, ecmp_links, igp_routes, shortcut_node_names
+    ):
+        """
+        Sets demand's path: the routed LSPs with the lowest metric from the
+        demand's source to dest, or its IGP route if there are none
+
+        :param demand: Demand object
+        :param G: networkx multidigraph the IGP routes are computed on
+        :param spf_dags: dict of SPFDag objects, keyed by source node name
+        :param ecmp_links: ECMP Interface lists shared by the SPFDags in spf_dags
+        :param igp_routes: dict of IGP routes, keyed by (source, dest) node names
+        :param shortcut_node_names: set of names of Nodes with IGP shortcuts enabled
+        """
+        demand.path = []
+
+        # Find all LSPs that can carry the demand from source to dest:
+        key = "{}-{}".format(
+            demand.source_node_object.name, demand.dest_node_object.name
+        )
+        try:
+            lsp_list = [
+                lsp
+                for lsp in self._get_parallel_lsp_groups()[key]
+                if "Unrouted" not in lsp.path
+            ]
+        except KeyError:
+            lsp_list = []
+
+        # Check for manually assigned metrics
+        if len(lsp_list) > 0:
+            min_lsp_metric = min([lsp.effective_metric(self) for lsp in lsp_list])
+            for lsp in lsp_list:
+                if lsp.effective_metric(self) == min_lsp_metric:
+                    demand.path.append([lsp])
+
+        if demand.path == []:  # There are no end to end LSPs for the demand
+            src = demand.source_node_object.name
+            dest = demand.dest_node_object.name
+
+            # Demands with common source and dest nodes share the same route
             try:
-                lsp_list = [
-                    lsp
-                    for lsp in self.parallel_lsp_groups()[key]
-                    if "Unrouted" not in lsp.path
-                ]
+                route = igp_routes[(src, dest)]
             except KeyError:
-                lsp_list = []
+                route = self._igp_route_from_spf_dag(
+                    G, spf_dags, ecmp_links, shortcut_node_names, src, dest
+                )
+                igp_routes[(src, dest)] = route
+
+            if isinstance(route, DagRoute):
+                demand._set_dag_route(route)
+            elif route == "Unrouted":
+                demand.path = "Unrouted"
+            else:
+                demand.path = list(route)
 
-            # Check for manually assigned metrics
-            if len(lsp_list) > 0:
-                min_lsp_metric = min([lsp.effective_metric(self) for lsp in lsp_list])
-                for lsp in lsp_list:
-                    if lsp.effective_metric(self) == min_lsp_metric:
-                        demand.path.append([lsp])
+    def _set_lsp_effective_metrics(self, spf_dags=None, ecmp_links=None):
+        """
+        Fills the effective_metric cache of each routed RSVP LSP that takes
+        its metric from the IGP (no manual_metric), using one SPFDag per
+        distinct LSP source Node on the routing graph as of its last sync,
+        instead of a shortest path search for each LSP.
 
-            if demand.path == []:  # There are no end to end LSPs for the demand
-                src = demand.source_node_object.name
-                dest = demand.dest_node_object.name
+        :param spf_dags: (optional) dict of SPFDag objects, keyed by source
+                         node name; SPFDags are taken from it and the new
+                         ones are added to it
+        :param ecmp_links: (optional) ECMP Interface lists shared by the
+                           SPFDags in spf_dags
+        :return: None
+        """
+        self._check_lsp_effective_metrics()
+        G = self._routing_graph
+        if spf_dags is None:
+            spf_dags = {}
 
-                # Shortest path in networkx multidigraph
-                try:
-                    nx_sp = list(nx.all_shortest_paths(G, src, dest, weight="cost"))
-                except nx.exception.NetworkXNoPath:
-                    # There is no path, demand.path = 'Unrouted'
-                    demand.path = "Unrouted"
+        for lsp in self.rsvp_lsp_objects:
+            if (
+                lsp._cached_effective_metric is not None
+                or lsp.manual_metric != "not set"
+                or "Unrouted" in lsp.path
+            ):
+                continue
+            src = lsp.source_node_object.name
+            try:
+                spf_dag = spf_dags[src]
+            except KeyError:
+                if src not in G:
                     continue
+                spf_dag = self._get_spf_dag(src, ecmp_links)
+                spf_dags[src] = spf_dag
+            # No cost (None) if the destination cannot be reached
+            lsp._cached_effective_metric = spf_dag.dist.get(lsp.dest_node_object.name)
 
-                # all_paths is list of shortest paths from source to destination; these paths
-                # may include paths that have multiple links between nodes
-                all_paths = self._get_all_paths_mdg(G, nx_sp)
+    def _check_lsp_effective_metrics(self):
+        """
+        Clears the effective_metric cache of each RSVP LSP if Interfaces,
+        Interface costs or LSPs have changed since the caches were filled,
+        so the metrics follow changes made without an update_simulation()
 
-                # Make sure that each path in all_paths only has a single link
-                # between each node.  This is path normalization
-                path_list = self._normalize_multidigraph_paths(all_paths)
+        :return: None
+        """
+        metric_versions = self._versions.key("topology", "metrics", "lsps")
+        if metric_versions != self._lsp_effective_metric_versions:
+            for lsp in self.rsvp_lsp_objects:
+                lsp.clear_effective_metric_cache()
+            self._lsp_effective_metric_versions = metric_versions
 
-                # Check for IGP shortcuts
-                path_list = self.find_igp_shortcuts(path_list, nx_sp)
+    def _get_spf_dag(self, source_node_name, ecmp_links=None):
+        """
+        Returns the SPFDag from source_node_name on the routing graph as of
+        its last sync.  SPFDags are kept in the path cache until the routing
+        graph changes, so they are shared by demand routing, the LSP metrics
+        and get_shortest_path across update_simulation() runs.
 
-                demand.path = path_list
+        :param source_node_name: name of source Node
+        :param ecmp_links: (optional) ECMP Interface lists shared by the
+                           SPFDags computed on the routing graph; see SPFDag
+        :return: SPFDag
+        """
+        return self._path_cache.get(
+            ("spf_dag", source_node_name),
+            self._routing_graph_version,
+            lambda: SPFDag(self._routing_graph, source_node_name, ecmp_links),
+        )
 
-        self._update_interface_utilization()
+    def _igp_route_from_spf_dag(
+        self, G, spf_dags, ecmp_links, shortcut_node_names, src, dest
+    ):
+        """
+        Finds the IGP route from src to dest from the SPFDag rooted at src.
+        The SPFDag is taken from the path cache, or created, and added to
+        spf_dags if it is not there already.
 
-        return self
+        :param G: networkx multidigraph the SPFDag is computed on
+        :param spf_dags: dict of SPFDag objects, keyed by source node name
+        :param ecmp_links: ECMP Interface lists shared by the SPFDags in spf_dags
+        :param shortcut_node_names: set of names of Nodes with IGP shortcuts enabled
+        :param src: source node name
+        :param dest: destination node name
+        :return: DagRoute if the shortest paths from src to dest have no IGP
+                 shortcuts, list of paths with the IGP shortcuts inserted if they
+                 do, or 'Unrouted' if dest cannot be reached from src
+        """
+        try:
+            spf_dag = spf_dags[src]
+        except KeyError:
+            spf_dag = self._get_spf_dag(src, ecmp_links)
+            spf_dags[src] = spf_dag
+
+        if not spf_dag.is_reachable(dest):
+            # There is no path, demand.path = 'Unrouted'
+            return "Unrouted"
+
+        route = DagRoute(spf_dag, dest)
+
+        # The paths can only change if a Node on them has IGP shortcuts enabled
+        if not shortcut_node_names or shortcut_node_names.isdisjoint(
+            route.node_names()
+        ):
+            return route
+
+        # Shortest node paths in the SPFDag
+        nx_sp = list(spf_dag.node_paths(dest))
+
+        # List of shortest paths from source to destination, with only a
+        # single link between each node
+        path_list = route.paths()
+
+        # Check for IGP shortcuts
+        shortcut_path_list = self.find_igp_shortcuts(path_list, nx_sp)
+
+        # If there are no shortcuts, the paths are exactly those in the SPFDag
+        if shortcut_path_list is path_list:
+            return route
+
+        return shortcut_path_list
 
     def find_igp_shortcuts(self, paths, node_paths):
         """
@@ -1580,6 +3192,8 @@ class Model(object):
         of the any applicable Interfaces
         """
 
+        parallel_lsp_groups = self._get_parallel_lsp_groups()
+
         # Substitute IGP enabled LSPs for Interfaces in paths
         for node_path in node_paths:
             # Find Nodes along the path that have igp_shortcuts_enabled and have
@@ -1612,7 +3226,7 @@ class Model(object):
 
                         key = "{}-{}".format(source_node.name, destination)
                         try:
-                            candidate_lsps_for_demand = self.parallel_lsp_groups()[key]
+                            candidate_lsps_for_demand = parallel_lsp_groups[key]
                             min_metric = min(
                                 lsp.effective_metric(self)
                                 for lsp in candidate_lsps_for_demand
@@ -1688,18 +3302,42 @@ class Model(object):
 
     def _update_interface_utilization(self):
         """Updates each interface's utilization; returns Model object with
-        updated interface utilization."""
+        updated interface utilization.
+
+        How IGP routed demand traffic is split across ECMP paths depends on
+        self.load_propagation:
+
+        - 'paths' (default): each demand's traffic is split over each of its
+          explicit paths (see Demand.path_detail) and each path's traffic is
+          added to the path Interfaces
+        - 'dag': the traffic for all the demands with a common source and
+          destination is pushed hop by hop along the shortest path DAG for the
+          pair, splitting evenly over the ECMP Interfaces at each Node.  This
+          gives the same hop by hop ECMP split as 'paths' but the work scales
+          with the number of edges in the DAG, not the number of paths.  Demand
+          path_detail is only built if it is requested.  Demands with IGP
+          shortcuts in their paths are always split over their explicit paths.
+        """
+
+        self._routing_index = None
 
         # In the model, in an interface is failed, set the traffic attribute
         # to 'Down', otherwise, initialize the traffic to zero
-        for interface_object in self.interface_objects:
-            interface_object.traffic = "Down" if interface_object.failed else 0.0
+        self._interface_state.reset_traffic()
         routed_demand_object_generator = (
             demand_object
-            for demand_object in self.demand_objects
-            if "Unrouted" not in demand_object.path
+            for demand_object in itertools.chain(
+                self.demand_objects, self._demand_table_demands.values()
+            )
+            if demand_object._is_routed()
         )
 
+        # In 'dag' load_propagation mode, aggregate traffic for each
+        # DagRoute, which is shared by IGP routed demands with common
+        # source and dest nodes
+        dag_propagation = self.load_propagation == "dag"
+        dag_traffic = {}
+
         # For each demand that is not Unrouted, add its traffic value to each
         # interface object in the path
         for demand_object in routed_demand_object_generator:
@@ -1715,7 +3353,7 @@ class Model(object):
 
             # Find the routed LSPs that can carry the demand
             try:
-                candidate_lsps_for_demand = self.parallel_lsp_groups()[key]
+                candidate_lsps_for_demand = self._get_parallel_lsp_groups()[key]
                 min_metric = min(
                     lsp.effective_metric(self)
                     for lsp in candidate_lsps_for_demand
@@ -1737,7 +3375,16 @@ class Model(object):
                     demand_object, lsps_for_demand
                 )
 
-            # If demand_object is not taking LSPs end to end, IGP route it, using hop by hop ECMP
+            # If demand_object is not taking LSPs end to end, IGP route it, using hop by hop ECMP.
+            # If the demand is IGP routed without any LSP shortcuts, it can be
+            # propagated along the shortest path DAG in 'dag' mode
+            elif dag_propagation and demand_object._dag_route is not None:
+                demand_object._path_detail = None  # built if/when requested
+                dag_route = demand_object._dag_route
+                dag_traffic[dag_route] = (
+                    dag_traffic.get(dag_route, 0.0) + demand_object.traffic
+                )
+
             else:
                 # demand_traffic_per_int will be dict of
                 # ('source_node_name-dest_node_name': <traffic from demand>) k,v pairs
@@ -1747,17 +3394,27 @@ class Model(object):
                 demand_traffic_per_item = self._demand_traffic_per_item(demand_object)
 
                 for item, traffic in demand_traffic_per_item.items():
-                    if isinstance(item, Interface):
-                        for path, path_info in demand_object._path_detail.items():
-                            if item in path_info["items"]:
-                                item.traffic += path_info["path_traffic"]
-                    elif isinstance(item, RSVP_LSP):
+                    if isinstance(item, RSVP_LSP):
                         # Get LSP interfaces
                         interfaces = item.path["interfaces"]
                         for interface in interfaces:
                             # Add traffic to the Interface
                             interface.traffic += traffic
 
+                # Add each path's traffic to the Interfaces on the path
+                for path_info in demand_object._path_detail.values():
+                    for item in path_info["items"]:
+                        if isinstance(item, Interface):
+                            item.traffic += path_info["path_traffic"]
+
+        # Push the aggregate traffic for each source/dest pair hop by hop
+        # along the pair's shortest path DAG
+        for dag_route, traffic in dag_traffic.items():
+            for interface, interface_traffic in dag_route.interface_traffic(
+                traffic
+            ).items():
+                interface.traffic += interface_traffic
+
         return self
 
     def _update_int_traffic_for_end_to_end_lsps(self, demand_object, lsps_for_demand):
@@ -1778,16 +3435,10 @@ class Model(object):
         traffic_per_demand_path = round(
             demand_object.traffic / num_routed_lsps_for_demand, 4
         )
-        path_detail = {}
-        for lsp in lsps_for_demand:
-            # Build the path detail: lsp and path traffic
-            path_detail["path_{}".format(lsps_for_demand.index(lsp))] = {}
-            path_detail["path_{}".format(lsps_for_demand.index(lsp))]["items"] = [lsp]
-            path_detail["path_{}".format(lsps_for_demand.index(lsp))][
-                "path_traffic"
-            ] = traffic_per_demand_path
         # Add detailed path info to demand
-        demand_object._path_detail = path_detail
+        demand_object._path_detail = self._lsp_path_detail(
+            demand_object, lsps_for_demand
+        )
         # Get the interfaces for each LSP in the demand's path
         for lsp in lsps_for_demand:
             try:
@@ -1802,6 +3453,25 @@ class Model(object):
                 # portion of the demand's traffic
                 interface.traffic += traffic_per_demand_path
 
+    def _lsp_path_detail(self, demand_object, lsps_for_demand):
+        """
+        Returns the path detail (see Demand.path_detail) for a Demand that
+        splits its traffic evenly across lsps_for_demand end to end
+
+        :param demand_object: Demand traveling end to end on LSPs
+        :param lsps_for_demand: List of parallel LSPs that transport demand_object
+        :return: Dict of path entries
+        """
+        traffic_per_demand_path = round(demand_object.traffic / len(lsps_for_demand), 4)
+        path_detail = {}
+        for lsp in lsps_for_demand:
+            # Build the path detail: lsp and path traffic
+            path_detail["path_{}".format(lsps_for_demand.index(lsp))] = {
+                "items": [lsp],
+                "path_traffic": traffic_per_demand_path,
+            }
+        return path_detail
+
     def _demand_traffic_per_item(self, demand):
         """
         Given a Demand object, return the (key, value) pairs for how much traffic each
@@ -1828,90 +3498,23 @@ class Model(object):
 
         """
 
-        shortest_path_item_list = []
-        for path in demand.path:
-            shortest_path_item_list += path
-
-        # Unique interfaces across all shortest paths
-        # shortest_path_int_set = set(shortest_path_int_list)
-        shortest_path_item_set = set(shortest_path_item_list)
-
-        unique_next_hops = self._find_unique_next_hops(shortest_path_item_set)
-
         # shortest_path_info will be a dict with the following info for each path:
-        # - an ordered list of interfaces in the path
-        # - a dict of cumulative splits for each interface at that point in the path
+        # - an ordered list of items in the path
+        # - a dict of cumulative splits for each item at that point in the path
         # - the amount of traffic on the path
-        # Example:
-        # shortest_path_info =
-        # {'path_0': {'interfaces': [
-        #     Interface(name='A-to-B_2', cost=4, capacity=50, node_object=Node('A'), remote_node_object=Node('B'),
-        #               circuit_id='2'),
-        #     Interface(name='B-to-E_2', cost=3, capacity=200, node_object=Node('B'), remote_node_object=Node('E'),
-        #               circuit_id='17')],
-        #             'path_traffic': 4.0,
-        #             'splits': {Interface(name='A-to-B_2', cost=4, capacity=50, node_object=Node('A'),
-        #                                  remote_node_object=Node('B'), circuit_id='2'): 2,
-        #                        Interface(name='B-to-E_2', cost=3, capacity=200, node_object=Node('B'),
-        #                                  remote_node_object=Node('E'), circuit_id='17'): 6}},
-        #  'path_1': {'interfaces': [
-        #      Interface(name='A-to-B_2', cost=4, capacity=50, node_object=Node('A'), remote_node_object=Node('B'),
-        #                circuit_id='2'),
-        #      Interface(name='B-to-E', cost=3, capacity=200, node_object=Node('B'), remote_node_object=Node('E'),
-        #                circuit_id='7')],
-        #             'path_traffic': 4.0,
-        #             'splits': {Interface(name='A-to-B_2', cost=4, capacity=50, node_object=Node('A'),
-        #                                  remote_node_object=Node('B'), circuit_id='2'): 2,
-        #                        Interface(name='B-to-E', cost=3, capacity=200, node_object=Node('B'),
-        #                                  remote_node_object=Node('E'), circuit_id='7'): 6}}}
-        shortest_path_info = {}
-        path_counter = 0
-
-        # Iterate thru each path for the demand to get traffic per interface
-        # and the splits for each demand
-        for path in demand.path:
-            # Dict of cumulative splits per interface
-            traffic_splits_per_interface = {}
-
-            path_key = "path_" + str(path_counter)
-
-            shortest_path_info[path_key] = {}
-
-            # Create cumulative path splits for each item in the path
-            total_splits = 1
-
-            # Normalize any paths with LSPs
-            for item in path:
-                # Update the total cumulative splits in the path before
-                # traffic reaches the item in the path
-                if isinstance(item, Interface):
-                    total_splits = total_splits * len(
-                        unique_next_hops[item.node_object.name]
-                    )
-                elif isinstance(item, RSVP_LSP):
-                    total_splits = total_splits * len(
-                        unique_next_hops[item.source_node_object.name]
-                    )
-
-                traffic_splits_per_interface[item] = total_splits
-
-            # Find path traffic
-            max_split = max([split for split in traffic_splits_per_interface.values()])
-            path_traffic = float(demand.traffic) / float(max_split)
-
-            shortest_path_info[path_key]["items"] = path
-            shortest_path_info[path_key]["splits"] = traffic_splits_per_interface
-            shortest_path_info[path_key]["path_traffic"] = path_traffic
-            path_counter += 1
+        # (see Demand.path_detail for an example)
+        shortest_path_info = demand._make_path_detail()
 
         # For each path, determine which interfaces it transits and add
         # that path's traffic to the interface
 
         # Create dict to hold cumulative traffic for each interface for demand
-        traff_per_int = dict.fromkeys(shortest_path_item_set, 0)
-        for path, info in shortest_path_info.items():
+        traff_per_int = {}
+        for info in shortest_path_info.values():
             for interface in info["items"]:
-                traff_per_int[interface] += info["path_traffic"]
+                traff_per_int[interface] = (
+                    traff_per_int.get(interface, 0) + info["path_traffic"]
+                )
 
         # Round all traffic values to 1 decimal place
         traff_per_int = {
@@ -1947,36 +3550,7 @@ class Model(object):
              'G': [Interface(name = 'G-F', cost = 25, capacity = 100, node_object = Node('G'),
                    remote_node_object = Node('F'), circuit_id = '7')]}
         """
-        # Dict to store how many unique next hops each node has in the shortest paths
-        unique_next_hops = {}
-        # Iterate through all the items
-        for item in shortest_path_item_set:
-            if isinstance(item, Interface):
-                unique_next_hops[item.node_object.name] = []
-                # For a given Interface's node_object, determine how many
-                # Interfaces on that Node are facing next hops
-                for hop in shortest_path_item_set:
-                    if (
-                        isinstance(hop, Interface)
-                        and hop.node_object.name == item.node_object.name
-                        or not isinstance(hop, Interface)
-                        and isinstance(hop, RSVP_LSP)
-                        and hop.source_node_object.name == item.node_object.name
-                    ):
-                        unique_next_hops[item.node_object.name].append(hop)
-            elif isinstance(item, RSVP_LSP):
-                unique_next_hops[item.source_node_object.name] = []
-                # For an LSP's source_node_object,
-                for hop in shortest_path_item_set:
-                    if (
-                        isinstance(hop, Interface)
-                        and hop.node_object.name == item.source_node_object.name
-                        or not isinstance(hop, Interface)
-                        and isinstance(hop, RSVP_LSP)
-                        and hop.source_node_object.name == item.source_node_object.name
-                    ):
-                        unique_next_hops[item.source_node_object.name].append(hop)
-        return unique_next_hops
+        return _find_unique_next_hops(shortest_path_item_set)
 
     def _insert_lsps_into_path(self, path_lsps, path):
         """
@@ -2127,6 +3701,158 @@ class Model(object):
 
         return all_paths
 
+    def _sync_routing_graph(self):
+        """
+        Brings the Model's persistent routing graph up to date with the
+        Interfaces and Nodes in self and returns it.
+
+        The routing graph is a networkx multidigraph with an edge for each
+        Interface that can carry traffic (not failed, reservable_bandwidth >= 0);
+        this matches _make_weighted_network_graph_mdg(include_failed_circuits=False).
+        Edges are keyed by Interface and carry 'cost', 'interface' and
+        'circuit_id' data.
+
+        The graph is updated in place: only the edges for Interfaces that have
+        been added, removed, failed, unfailed or had their cost changed since
+        the last sync are touched, and nothing is scanned if the Model versions
+        the graph depends on have not changed since the last sync (see
+        versions).  The Interfaces to touch are found with a vectorized
+        comparison of the Interface state columns with the cost of each
+        Interface's edge (see InterfaceState.routing_graph_changes).
+        _routing_graph_version is incremented for each edge change, so
+        results computed on the graph can be checked for staleness, and the
+        changed Interfaces are kept for the next incremental update (see
+        _pop_routing_graph_changes), whichever caller synced the graph.
+        Bandwidth and RSVP filtered views of the graph are taken with the
+        interface_filter of SPFDag instead of building a new graph.
+
+        :return: networkx multidigraph
+        """
+        G = self._routing_graph
+        edges = self._routing_graph_edges
+
+        # The graph only depends on the Interfaces and their failed state,
+        # cost and reservable bandwidth
+        sync_versions = self._versions.key(
+            "topology", "metrics", "capacity", "reservations"
+        )
+        if sync_versions == self._routing_graph_sync_versions:
+            return G
+        self._routing_graph_sync_versions = sync_versions
+
+        interface_state = self._interface_state
+        interface_state.adopt_all(self.interface_objects)
+        graph_cost = interface_state.graph_cost
+        added_interfaces = []
+        for row in interface_state.routing_graph_changes():
+            interface = interface_state.interfaces[row]
+            edge = edges.get(interface)
+            if interface.failed is False and interface.reservable_bandwidth >= 0:
+                graph_cost[row] = interface.cost
+                if edge is None:
+                    added_interfaces.append(interface)
+                elif edge[2]["cost"] != interface.cost:
+                    edge[2]["cost"] = interface.cost
+                    self._routing_graph_version += 1
+                    self._routing_graph_changes.setdefault(interface, True)
+            else:
+                graph_cost[row] = 0
+                if edge is not None:
+                    self._remove_routing_graph_edge(interface)
+
+        self._add_routing_graph_edges(added_interfaces)
+
+        # Remove the edges for Interfaces no longer in the Model
+        if len(edges) != interface_state.routing_graph_edge_count():
+            for interface in [
+                interface
+                for interface in edges
+                if interface not in self.interface_objects
+            ]:
+                self._remove_routing_graph_edge(interface)
+
+        for node in self.node_objects:
+            if node.name not in G:
+                G.add_node(node.name)
+                self._routing_graph_version += 1
+
+        return G
+
+    def _add_routing_graph_edges(self, interfaces):
+        """
+        Adds the edges for interfaces to the routing graph.  The Interfaces
+        come in the order of their InterfaceState rows; parallel edges are
+        added in interface_objects order instead, as
+        _make_weighted_network_graph_mdg adds them.
+
+        :param interfaces: list of Interfaces with no edge in the graph
+        """
+        G = self._routing_graph
+        node_pairs = {
+            (interface.node_object.name, interface.remote_node_object.name)
+            for interface in interfaces
+        }
+        if len(node_pairs) < len(interfaces):
+            interface_set = set(interfaces)
+            interfaces = [
+                interface
+                for interface in self.interface_objects
+                if interface in interface_set
+            ]
+        for interface in interfaces:
+            node_name = interface.node_object.name
+            remote_node_name = interface.remote_node_object.name
+            G.add_edge(
+                node_name,
+                remote_node_name,
+                key=interface,
+                cost=interface.cost,
+                interface=interface,
+                circuit_id=interface.circuit_id,
+            )
+            self._routing_graph_edges[interface] = (
+                node_name,
+                remote_node_name,
+                G[node_name][remote_node_name][interface],
+            )
+            self._routing_graph_version += 1
+            self._routing_graph_changes.setdefault(interface, False)
+
+    def _remove_routing_graph_edge(self, interface):
+        """
+        Removes interface's edge, if present, from the routing graph
+
+        :param interface: Interface object
+        """
+        try:
+            node_name, remote_node_name, _ = self._routing_graph_edges.pop(interface)
+        except KeyError:
+            return
+        self._routing_graph.remove_edge(node_name, remote_node_name, key=interface)
+        self._routing_graph_version += 1
+        self._routing_graph_changes.setdefault(interface, True)
+
+    def _pop_routing_graph_changes(self):
+        """
+        Returns the Interfaces whose routing graph edges have been added,
+        removed or had their cost changed since the last simulation, and
+        forgets them.  An Interface whose edge was removed and added back
+        is returned as a cost change.
+
+        :return: dict of 'added', 'removed' and 'cost' lists of Interfaces
+        """
+        changes = {"added": [], "removed": [], "cost": []}
+        for interface, had_edge in self._routing_graph_changes.items():
+            has_edge = interface in self._routing_graph_edges
+            if had_edge and has_edge:
+                changes["cost"].append(interface)
+            elif has_edge:
+                changes["added"].append(interface)
+            elif had_edge:
+                changes["removed"].append(interface)
+        self._routing_graph_changes = {}
+        return changes
+
     def _make_weighted_network_graph_mdg(
         self, include_failed_circuits=True, needed_bw=0, rsvp_required=False
     ):
@@ -2274,15 +4000,33 @@ class Model(object):
                  comprised of two Interface objects
         """
 
-        G = self._make_weighted_network_graph_mdg(
-            include_failed_circuits=include_failed_circuits
-        )
+        # The (local_node_name, remote_node_name, data) edges for the Interfaces
+        # that would be in _make_weighted_network_graph_mdg(include_failed_circuits);
+        # only the node pairs are needed, so no graph is built
+        edges = [
+            (
+                interface.node_object.name,
+                interface.remote_node_object.name,
+                {
+                    "cost": interface.cost,
+                    "interface": interface,
+                    "circuit_id": interface.circuit_id,
+                },
+            )
+            for interface in self.interface_objects
+            if (include_failed_circuits is True or interface.failed is False)
+            and interface.reservable_bandwidth >= 0
+        ]
+        node_name_pairs = {
+            (local_node_name, remote_node_name)
+            for (local_node_name, remote_node_name, _) in edges
+        }
 
-        # Determine which interfaces pair up into good circuits in G
+        # Determine which interfaces pair up into good circuits
         graph_interfaces = (
             (local_node_name, remote_node_name, data)
-            for (local_node_name, remote_node_name, data) in G.edges(data=True)
-            if G.has_edge(remote_node_name, local_node_name)
+            for (local_node_name, remote_node_name, data) in edges
+            if (remote_node_name, local_node_name) in node_name_pairs
         )
 
         # Set interface object in_ckt = False
@@ -2291,7 +4035,7 @@ class Model(object):
 
         circuits = set([])
 
-        # Using the paired interfaces (source_node, dest_node) pairs from G,
+        # Using the paired interfaces (source_node, dest_node) pairs,
         # get the corresponding interface objects from the model to create
         # the Circuit object
         for interface in iter(graph_interfaces):
@@ -2335,8 +4079,8 @@ class Model(object):
         # Find any interfaces that don't have counterpart
         exception_ints_not_in_ckt = [
             (local_node_name, remote_node_name, data)
-            for (local_node_name, remote_node_name, data) in G.edges(data=True)
-            if not (G.has_edge(remote_node_name, local_node_name))
+            for (local_node_name, remote_node_name, data) in edges
+            if (remote_node_name, local_node_name) not in node_name_pairs
         ]
 
         if exception_ints_not_in_ckt:
@@ -2367,41 +4111,110 @@ class Model(object):
         interface because circuit_ids bond interfaces on different nodes into
         a Circuit object.
 
-        :param local_node_name: Name of local node Interface resides on
-        :param remote_node_name: Name of Interface's remote Node
-        :param circuit_id: circuit_id of Interface (optional)
+        :param local_node_name: Name of local node Interface resides on
+        :param remote_node_name: Name of Interface's remote Node
+        :param circuit_id: circuit_id of Interface (optional)
+
+        :return: list of Interface objects with common local node and remote node
+        """
+
+        interface_list = self.interface_objects.lookup(
+            "node_pair", (local_node_name, remote_node_name)
+        )
+
+        if circuit_id is not None:
+            interface_list = [
+                interface
+                for interface in interface_list
+                if interface.circuit_id == circuit_id
+            ]
+
+            if len(interface_list) > 1:
+                msg = (
+                    "There is an internal error with circuit_iding; Interface circuit_ids must be unique"
+                    " per Node and the same circuit_id can only appear in a Parallel_Link_Model object "
+                    "twice and on separate Nodes"
+                )
+                return ModelException(msg)
+        return interface_list
+
+    def add_circuit(
+        self,
+        node_a_object,
+        node_b_object,
+        node_a_interface_name,
+        node_b_interface_name,
+        cost_intf_a=1,
+        cost_intf_b=1,
+        capacity=1000,
+        failed=False,
+        circuit_id=None,
+    ):
+        """
+        Creates component Interface objects for a new Circuit in the Model.
+        The Circuit object will then be created during the validate_model() call.
+
+        :param node_a_object: Node object
+        :param node_b_object: Node object
+        :param node_a_interface_name: name of component Interface on node_a
+        :param node_b_interface_name: name of component Interface on node_b
+        :param cost_intf_a: metric/cost of node_a_interface component Interface
+        :param cost_intf_b: metric/cost of node_b_interface component Interface
+        :param capacity: Circuit's capacity
+        :param failed: Should the Circuit be created in a Failed state?
+        :param circuit_id: Optional.  Will be auto-assigned unless specified
+        :return: Model with new Circuit comprised of 2 new Interfaces
+        """
+
+        int_a, int_b = self._make_circuit_interfaces(
+            node_a_object,
+            node_b_object,
+            node_a_interface_name,
+            node_b_interface_name,
+            cost_intf_a,
+            cost_intf_b,
+            capacity,
+            failed,
+            circuit_id,
+        )
+
+        self.interface_objects.add(int_a)
+        self.interface_objects.add(int_b)
+
+        self._validate_edit()
+
+    def add_circuits(self, circuits):
+        """
+        Creates the component Interface objects for multiple new Circuits in
+        the Model and validates the model once.
+
+        Each Circuit is given as a tuple of add_circuit() arguments::
+
+            (node_a_object, node_b_object, node_a_interface_name, node_b_interface_name,
+             cost_intf_a, cost_intf_b, capacity, failed, circuit_id)
 
-        :return: list of Interface objects with common local node and remote node
+        or as a dict of them, keyed by argument name.  The arguments after
+        node_b_interface_name are optional.  If any row is bad (duplicate
+        Interface or circuit_id, etc), no Interfaces are added and the
+        ModelException lists all of the bad rows.
+
+        :param circuits: iterable of tuples or dicts
+        :return: Model with new Circuits
         """
+        circuit_ids = self.all_interface_circuit_ids
 
-        interface_gen = iter(self.interface_objects)
+        def make_circuit_interfaces(*args, **kwargs):
+            interfaces = self._make_circuit_interfaces(
+                *args, circuit_ids=circuit_ids, **kwargs
+            )
+            circuit_ids.add(interfaces[0].circuit_id)
+            return interfaces
 
-        if circuit_id is None:
-            interface_list = [
-                interface
-                for interface in interface_gen
-                if interface.node_object.name == local_node_name
-                and interface.remote_node_object.name == remote_node_name
-            ]
-        else:
-            interface_list = [
-                interface
-                for interface in interface_gen
-                if interface.node_object.name == local_node_name
-                and interface.remote_node_object.name == remote_node_name
-                and interface.circuit_id == circuit_id
-            ]
+        self._add_rows(circuits, make_circuit_interfaces, self.interface_objects)
 
-            if len(interface_list) > 1:
-                msg = (
-                    "There is an internal error with circuit_iding; Interface circuit_ids must be unique"
-                    " per Node and the same circuit_id can only appear in a Parallel_Link_Model object "
-                    "twice and on separate Nodes"
-                )
-                return ModelException(msg)
-        return interface_list
+        self._validate_edit()
 
-    def add_circuit(
+    def _make_circuit_interfaces(
         self,
         node_a_object,
         node_b_object,
@@ -2412,28 +4225,21 @@ class Model(object):
         capacity=1000,
         failed=False,
         circuit_id=None,
+        circuit_ids=None,
     ):
         """
-        Creates component Interface objects for a new Circuit in the Model.
-        The Circuit object will then be created during the validate_model() call.
+        Returns the two component Interfaces of a new Circuit for add_circuit();
+        raises ModelException if either Interface or the circuit_id is already
+        in self.
 
-        :param node_a_object: Node object
-        :param node_b_object: Node object
-        :param node_a_interface_name: name of component Interface on node_a
-        :param node_b_interface_name: name of component Interface on node_b
-        :param cost_intf_a: metric/cost of node_a_interface component Interface
-        :param cost_intf_b: metric/cost of node_b_interface component Interface
-        :param capacity: Circuit's capacity
-        :param failed: Should the Circuit be created in a Failed state?
-        :param circuit_id: Optional.  Will be auto-assigned unless specified
-        :return: Model with new Circuit comprised of 2 new Interfaces
+        :param circuit_ids: set of the circuit_ids in self, if already known
+        :return: tuple of the new Interfaces
         """
+        if circuit_ids is None:
+            circuit_ids = self.all_interface_circuit_ids
 
         if circuit_id is None:
-            circuit_ids = self.all_interface_circuit_ids
             circuit_id = max(circuit_ids, default=0) + 1
-        else:
-            circuit_ids = self.all_interface_circuit_ids
 
         if circuit_id in circuit_ids:
             err_msg = "circuit_id value {} is already exists in model".format(
@@ -2441,6 +4247,9 @@ class Model(object):
             )
             raise ModelException(err_msg)
 
+        # The Interfaces are made in the Model's InterfaceState, and their
+        # rows are freed again if they are not added
+        interface_state = self._interface_state
         int_a = Interface(
             node_a_interface_name,
             cost_intf_a,
@@ -2448,33 +4257,37 @@ class Model(object):
             node_a_object,
             node_b_object,
             circuit_id,
+            interface_state=interface_state,
         )
-        int_b = Interface(
-            node_b_interface_name,
-            cost_intf_b,
-            capacity,
-            node_b_object,
-            node_a_object,
-            circuit_id,
-        )
-
-        existing_int_keys = {interface._key for interface in self.interface_objects}
-
-        if int_a._key in existing_int_keys:
-            raise ModelException(
-                "interface {} on node {} - "
-                "interface already exists in model".format(int_a, node_a_object)
+        try:
+            int_b = Interface(
+                node_b_interface_name,
+                cost_intf_b,
+                capacity,
+                node_b_object,
+                node_a_object,
+                circuit_id,
+                interface_state=interface_state,
             )
-        elif int_b._key in existing_int_keys:
-            raise ModelException(
-                "interface {} on node {} - "
-                "interface already exists in model".format(int_b, node_b_object)
+        except Exception:
+            interface_state.discard(int_a)
+            raise
+
+        if self.interface_objects.lookup("key", int_a._key):
+            duplicate_interface, duplicate_node = int_a, node_a_object
+        elif self.interface_objects.lookup("key", int_b._key):
+            duplicate_interface, duplicate_node = int_b, node_b_object
+        else:
+            return int_a, int_b
+
+        interface_state.discard(int_a)
+        interface_state.discard(int_b)
+        raise ModelException(
+            "interface {} on node {} - "
+            "interface already exists in model".format(
+                duplicate_interface, duplicate_node
             )
-
-        self.interface_objects.add(int_a)
-        self.interface_objects.add(int_b)
-
-        self.validate_model()
+        )
 
     def get_all_paths_reservable_bw(
         self,
@@ -2561,30 +4374,59 @@ class Model(object):
                  shortest_path = {'path': [list of shortest path routes], 'cost': path_cost}
         """
 
-        # Define a networkx DiGraph to find the path
-        G = self._make_weighted_network_graph_mdg(
-            include_failed_circuits=False, needed_bw=needed_bw
+        self._sync_routing_graph()
+
+        return self._get_shortest_path(source_node_name, dest_node_name, needed_bw)
+
+    def _get_shortest_path(self, source_node_name, dest_node_name, needed_bw=0):
+        """
+        get_shortest_path on the routing graph as of its last sync; used
+        while the simulation is being updated, when the topology is not
+        changing.  Results are kept in the path cache until the routing graph
+        changes or, for needed_bw > 0, the reservable bandwidth changes.
+        """
+        version = self._routing_graph_version
+        if needed_bw > 0:
+            version = (version,) + self._versions.key("capacity", "reservations")
+        shortest_path = self._path_cache.get(
+            ("shortest_path", source_node_name, dest_node_name, needed_bw),
+            version,
+            lambda: self._find_shortest_path(
+                source_node_name, dest_node_name, needed_bw
+            ),
         )
+        return _copy_shortest_path(shortest_path)
+
+    def _find_shortest_path(self, source_node_name, dest_node_name, needed_bw):
+        """Computes _get_shortest_path"""
+
+        G = self._routing_graph
 
         # Define the Model-style path to be built
         converted_path = dict()
         converted_path["path"] = []
         converted_path["cost"] = None
 
-        # Find the shortest paths in G between source and dest
+        # The routing graph only has Interfaces with reservable_bandwidth >= 0
+        if needed_bw > 0:
+
+            def interface_filter(interface):
+                return interface.reservable_bandwidth >= needed_bw
+
+        else:
+            interface_filter = None
 
-        multidigraph_shortest_paths = nx.all_shortest_paths(
-            G, source_node_name, dest_node_name, weight="cost"
-        )
         # Get shortest path(s) from source to destination; this may include paths
         # that have multiple links between nodes
         try:
-            for path in multidigraph_shortest_paths:
+            if interface_filter is None:
+                spf_dag = self._get_spf_dag(source_node_name)
+            else:
+                spf_dag = SPFDag(G, source_node_name, interface_filter=interface_filter)
+            for path in spf_dag.node_paths(dest_node_name):
                 model_path = self._convert_nx_path_to_model_path(path, needed_bw)
                 converted_path["path"].append(model_path)
-                converted_path["cost"] = nx.shortest_path_length(
-                    G, source_node_name, dest_node_name, weight="cost"
-                )
+                converted_path["cost"] = spf_dag.cost(dest_node_name)
         except BaseException:
             return converted_path
 
@@ -2610,25 +4452,68 @@ class Model(object):
         :return: dict {'path': [list of lists, each list a shortest path route], 'cost': path_cost}
         """
 
-        # Define a networkx DiGraph to find the path
-        G = self._make_weighted_network_graph_routed_lsp(lsp, needed_bw=needed_bw)
+        self._sync_routing_graph()
+
+        return self._get_shortest_path_for_routed_lsp(
+            source_node_name, dest_node_name, lsp, needed_bw
+        )
+
+    def _get_shortest_path_for_routed_lsp(
+        self, source_node_name, dest_node_name, lsp, needed_bw
+    ):
+        """
+        get_shortest_path_for_routed_lsp on the routing graph as of its last
+        sync; used while the simulation is being updated, when the topology
+        is not changing.  Results are kept in the path cache until the routing
+        graph or the reservable bandwidth changes.
+        """
+        version = (
+            (self._routing_graph_version,)
+            + self._versions.key("capacity", "reservations")
+            + (lsp.reserved_bandwidth,)
+        )
+        shortest_path = self._path_cache.get(
+            ("routed_lsp_path", source_node_name, dest_node_name, lsp._key, needed_bw),
+            version,
+            lambda: self._find_shortest_path_for_routed_lsp(
+                source_node_name, dest_node_name, lsp, needed_bw
+            ),
+        )
+        return _copy_shortest_path(shortest_path)
+
+    def _find_shortest_path_for_routed_lsp(
+        self, source_node_name, dest_node_name, lsp, needed_bw
+    ):
+        """Computes _get_shortest_path_for_routed_lsp"""
+
+        G = self._routing_graph
+
+        # The Interfaces that the lsp is routed over currently
+        lsp_path_interfaces = set(lsp.path["interfaces"])
+
+        def routed_lsp_interface_filter(interface):
+            # Add back the lsp's reserved bandwidth to Interfaces already in its path
+            if interface.rsvp_enabled is not True:
+                return False
+            if interface in lsp_path_interfaces:
+                return (
+                    interface.reservable_bandwidth + lsp.reserved_bandwidth >= needed_bw
+                )
+            return interface.reservable_bandwidth >= needed_bw
 
         # Define the Model-style path to be built
         converted_path = {"path": [], "cost": None}
-        # Find the shortest paths in G between source and dest
-        digraph_shortest_paths = nx.all_shortest_paths(
-            G, source_node_name, dest_node_name, weight="cost"
-        )
 
         try:
-            for path in digraph_shortest_paths:
+            spf_dag = SPFDag(
+                G, source_node_name, interface_filter=routed_lsp_interface_filter
+            )
+            for path in spf_dag.node_paths(dest_node_name):
                 model_path = self._convert_nx_path_to_model_path_routed_lsp(
                     path, needed_bw, lsp
                 )
                 converted_path["path"].append(model_path)
-                converted_path["cost"] = nx.shortest_path_length(
-                    G, source_node_name, dest_node_name, weight="cost"
-                )
+                converted_path["cost"] = spf_dag.cost(dest_node_name)
         except BaseException:
             return converted_path
 
@@ -2750,10 +4635,7 @@ class Model(object):
         and also consumes reservable bandwidth on each Interface each LSP transits
         """
 
-        # Track the needed_bw for which the graph was last built so we
-        # only rebuild when the bandwidth requirement changes
-        cached_graph = None
-        cached_needed_bw = None
+        cspf = self._get_cspf()
 
         for lsp in lsps:
             # Check to see if configured_setup_bandwidth is set; if so,
@@ -2766,158 +4648,38 @@ class Model(object):
                 lsp.reserved_bandwidth = lsp.configured_setup_bandwidth
                 lsp.setup_bandwidth = lsp.configured_setup_bandwidth
 
-            # Rebuild graph only when needed_bw changes or after bandwidth
-            # was consumed by a previously routed LSP in this group
-            if cached_graph is None or lsp.setup_bandwidth != cached_needed_bw:
-                cached_graph = self._make_weighted_network_graph_mdg(
-                    include_failed_circuits=False,
-                    rsvp_required=True,
-                    needed_bw=lsp.setup_bandwidth,
-                )
-                cached_needed_bw = lsp.setup_bandwidth
-
-            G = cached_graph
-
-            lsp.path = {}
-
-            # Get shortest paths in networkx multidigraph
-            try:
-                nx_sp = list(
-                    nx.all_shortest_paths(
-                        G,
-                        lsp.source_node_object.name,
-                        lsp.dest_node_object.name,
-                        weight="cost",
-                    )
-                )
-            except nx.exception.NetworkXNoPath:
-                # There is no path; path = 'Unrouted'
-                lsp.path = "Unrouted"
-                lsp.reserved_bandwidth = "Unrouted"
-                continue
-
-            # Convert node hop by hop paths from G into Interface-based paths
-            all_paths = self._get_all_paths_mdg(G, nx_sp)
-
-            # all_paths may have hops between nodes that can take different Interfaces;
-            # normalize those hops that could transit any of multiple Interfaces into
-            # distinct, unique possible paths
-            candidate_path_info = self._normalize_multidigraph_paths(all_paths)
-
-            # Candidate paths with enough reservable bandwidth
-            candidate_path_info_w_reservable_bw = []
-
-            # Determine which candidate paths have enough reservable bandwidth
-            for path in candidate_path_info:
-                if (
-                    min(interface.reservable_bandwidth for interface in path)
-                    >= lsp.setup_bandwidth
-                ):
-                    candidate_path_info_w_reservable_bw.append(path)
-
-            # If multiple lowest_metric_paths, find those with fewest hops
-            if not candidate_path_info_w_reservable_bw:
+            # Lowest cost path with enough reservable bandwidth; ties are
+            # broken on fewest hops, then at random
+            new_path = cspf.find_path(
+                lsp.source_node_object.name,
+                lsp.dest_node_object.name,
+                lsp.setup_bandwidth,
+            )
+            if new_path is None:
                 lsp.path = "Unrouted"
                 lsp.reserved_bandwidth = "Unrouted"
                 continue
 
-            elif len(candidate_path_info_w_reservable_bw) > 1:
-                fewest_hops = min(
-                    len(path) for path in candidate_path_info_w_reservable_bw
-                )
-                lowest_hop_count_paths = [
-                    path
-                    for path in candidate_path_info_w_reservable_bw
-                    if len(path) == fewest_hops
-                ]
-                if len(lowest_hop_count_paths) > 1:
-                    new_path = random.choice(lowest_hop_count_paths)
-                else:
-                    new_path = lowest_hop_count_paths[0]
-            else:
-                new_path = candidate_path_info_w_reservable_bw[0]
-
             # Change LSP path into more verbose form and set LSP's path
             self._add_lsp_path_data(lsp, new_path)
 
-            for interface in [
-                interface
-                for interface in lsp.path["interfaces"]
-                if lsp.path != "Unrouted"
-            ]:
+            for interface in new_path:
                 interface.reserved_bandwidth += lsp.reserved_bandwidth
 
-            # Invalidate cached graph since bandwidth was consumed
-            cached_graph = None
-
-    def _make_weighted_network_graph_routed_lsp(self, lsp, needed_bw=0):
-        """
-        Returns a networkx weighted network directional graph from the input Model object.
-        Considers edges with needed_bw of reservable_bandwidth and also takes into account
-        reserved_bandwidth by the lsp on Interfaces in the existing LSP path.
-
-        :param include_failed_circuits: failed circuits can be included in
-        the graph as functional edges
-        :param lsp:  LSP to be considered
-        :param needed_bw: amount of reservable bandwidth an interface must have
-        to be added to the graph
-        :return:
-        """
-
-        # The Interfaces that the lsp is routed over currently
-        lsp_path_interfaces = lsp.path["interfaces"]
-
-        eligible_interface_generator = (
-            interface
-            for interface in self.interface_objects
-            if (interface.failed is False and interface.rsvp_enabled is True)
-        )
-
-        eligible_interfaces = set()
-
-        # Find only the interfaces that are not failed and that have
-        # enough reservable_bandwidth
-        for interface in eligible_interface_generator:
-            # Add back the lsp's reserved bandwidth to Interfaces already in its path
-            if interface in lsp_path_interfaces:
-                effective_reservable_bw = (
-                    interface.reservable_bandwidth + lsp.reserved_bandwidth
-                )
-            else:
-                effective_reservable_bw = interface.reservable_bandwidth
-
-            if effective_reservable_bw >= needed_bw:
-                eligible_interfaces.add(interface)
-
-        # Get edge names in eligible_interfaces
-        edge_names = (
-            (
-                interface.node_object.name,
-                interface.remote_node_object.name,
-                interface.cost,
-            )
-            for interface in eligible_interfaces
-        )
-
-        # Make a new graph with the eligible interfaces (interfaces
-        # with enough effective_reservable_bw)
-        G = nx.MultiDiGraph()
-
-        # Add edges to networkx MultiDiGraph
-        G.add_weighted_edges_from(edge_names, weight="cost")
-
-        # Add all the nodes
-        node_name_iterator = (node.name for node in self.node_objects)
-        G.add_nodes_from(node_name_iterator)
-
-        return G
-
     @classmethod
-    def load_model_file(cls, data_file):  # TODO - allow commas instead of tabs
+    def load_model_file(
+        cls, data_file, use_snapshot=False
+    ):  # TODO - allow commas instead of tabs
         """
         Opens a network_modeling data file, returns a model containing
         the info in the data file, and runs update_simulation().
 
+        With use_snapshot, if the data file has a snapshot saved with
+        save_snapshot() next to it (the data file name with '.snapshot'
+        appended), taken from a data file with the same contents, the Model
+        is loaded from the snapshot instead, with its simulation results.
+        Snapshots are pickles: only use snapshots from trusted sources.
+
         The data file must be of the appropriate
         format to produce a valid model.  This cannot be used to open
         multiple models in a single python instance - there may be
@@ -3015,214 +4777,367 @@ class Model(object):
             A	B	lsp_a_b_2       6
 
         :param data_file: file with model info
+        :param use_snapshot: (optional) load the Model from an up to date
+                             snapshot of data_file if there is one, and keep
+                             what save_snapshot() needs to tell if a snapshot
+                             is up to date; default is False
         :return: Model object
 
         """
         # TODO - allow user to add user-defined columns in NODES_TABLE and add that as an attribute to the Node
 
-        interface_set = set()
-        node_set = set()
-        demand_set = set()
-        lsp_set = set()
+        if not use_snapshot:
+            # Read the file with the data one line at a time
+            with open(data_file, "r", encoding="utf-8-sig") as f:
+                model = cls._model_from_data(f)
+            model._source = (os.fspath(data_file), None, None)
+            return model
 
-        # Open the file with the data, read it, and split it into lines
-        with open(data_file, "r", encoding="utf-8-sig") as f:
-            data = f.read()
+        snapshot_file = default_snapshot_file(data_file)
+        try:
+            snapshot_hash = read_snapshot_source_hash(snapshot_file)
+            if snapshot_hash is not None and snapshot_hash == file_hash(data_file):
+                return cls.load_snapshot(snapshot_file)
+        except ModelException:
+            # Not a snapshot, or a snapshot of another Model class; read the
+            # data file
+            pass
+
+        # Read the file one line at a time, hashing it as it is read, and
+        # keep the hash and a fingerprint of the Model for save_snapshot
+        content_hash = hashlib.sha256()
+        with open(data_file, "rb") as raw:
+            hashing_reader = HashingReader(raw, content_hash)
+            with io.TextIOWrapper(
+                io.BufferedReader(hashing_reader), encoding="utf-8-sig"
+            ) as f:
+                model = cls._model_from_data(f)
+                hashing_reader.readall()
+
+        model._source = (
+            os.fspath(data_file),
+            content_hash.digest(),
+            input_fingerprint(model),
+        )
+        return model
 
-        lines = data.splitlines()
+    @classmethod
+    def _model_from_data(cls, lines):
+        """
+        Returns a Model with the objects defined by the lines of a
+        network_modeling data file.  The Interfaces are made in the Model's
+        InterfaceState, so the Model takes them without moving their rows.
 
-        # Define the Interfaces from the data and extract the presence of
-        # Nodes from the Interface data
-        int_info_begin_index = lines.index("INTERFACES_TABLE") + 2
-        int_info_end_index = find_end_index(int_info_begin_index, lines)
+        :param lines: iterable of lines of data (such as an open file)
+        :return: Model object
+        """
+        model = cls()
+        (
+            model.interface_objects,
+            model.node_objects,
+            model.demand_objects,
+            model.rsvp_lsp_objects,
+        ) = cls._read_model_data(lines, model._interface_state)
+        return model
 
-        # Detect whether the file has a circuit_id column by checking
-        # the header line (the line right after INTERFACES_TABLE)
-        header_line = lines[lines.index("INTERFACES_TABLE") + 1]
-        header_cols = [col.strip().lower() for col in header_line.split("\t")]
-        has_circuit_id_col = "circuit_id" in header_cols
+    @classmethod
+    def _read_model_data(cls, lines, interface_state=None):
+        """
+        Reads the tables from the lines of a network_modeling data file in a
+        single pass and returns the Model objects they define.
+
+        Nodes are inferred from the INTERFACES_TABLE and updated from the
+        NODES_TABLE.  Rows from the DEMANDS_TABLE and RSVP_LSP_TABLE are
+        added as they are read if both of those tables come before them
+        in the file (the usual order); otherwise they are held until the
+        end of the file.
+
+        :param lines: iterable of lines of data (such as an open file)
+        :param interface_state: (optional) InterfaceState to make the
+                                Interfaces in; each Interface has one of its
+                                own by default
+        :return: set of Interfaces, set of Nodes, set of Demands, set of RSVP_LSPs
+        """
+        interface_set = InterfaceSet()
+        node_set = NodeSet()
+        demand_set = DemandSet()
+        lsp_set = RSVPLSPSet()
+
+        tables_read = set()
+        held_rows = []
+
+        for table_name, header_line, rows in _model_file_tables(lines):
+            # Only the first instance of each table is used
+            if table_name in tables_read:
+                continue
 
-        # Check that each circuit_id appears exactly 2 times (only for
-        # files that include circuit_id column)
-        if has_circuit_id_col:
-            circuit_id_list = []
-            for line in lines[int_info_begin_index:int_info_end_index]:
-                try:
-                    circuit_id_item = line.split("\t")[5]
-                    circuit_id_list.append(circuit_id_item)
-                except IndexError:
-                    pass
+            if table_name == "INTERFACES_TABLE":
+                cls._add_interfaces_from_data(
+                    header_line, rows, interface_set, node_set, interface_state
+                )
+            elif table_name == "NODES_TABLE":
+                for line_index, node_line in rows:
+                    cls._add_node_from_data(node_line, node_set)
+            elif {"INTERFACES_TABLE", "NODES_TABLE"}.issubset(tables_read):
+                cls._add_table_rows_from_data(
+                    table_name, rows, demand_set, lsp_set, node_set
+                )
+            else:
+                held_rows.append((table_name, list(rows)))
 
-            bad_circuit_ids = [
-                {"circuit_id": item, "appearances": circuit_id_list.count(item)}
-                for item in set(circuit_id_list)
-                if circuit_id_list.count(item) != 2
-            ]
+            tables_read.add(table_name)
 
-            if len(bad_circuit_ids) != 0:
-                msg = (
-                    "Each circuit_id value must appear exactly twice; the following circuit_id values "
-                    "do not meet that criteria: {}".format(bad_circuit_ids)
-                )
-                raise ModelException(msg)
+        for table_name in ("INTERFACES_TABLE", "NODES_TABLE", "DEMANDS_TABLE"):
+            if table_name not in tables_read:
+                raise ValueError("'{}' is not in list".format(table_name))
 
-        interface_set, node_set = cls._extract_interface_data_and_implied_nodes(
-            int_info_begin_index, int_info_end_index, lines, has_circuit_id_col
-        )
-        # Define the explicit nodes info from the file
-        nodes_info_begin_index = lines.index("NODES_TABLE") + 2
-        nodes_info_end_index = find_end_index(nodes_info_begin_index, lines)
-        node_lines = lines[nodes_info_begin_index:nodes_info_end_index]
-        for node_line in node_lines:
-            node_set = cls._add_node_from_data(
-                demand_set, interface_set, lsp_set, node_line, node_set
+        for table_name, rows in held_rows:
+            cls._add_table_rows_from_data(
+                table_name, rows, demand_set, lsp_set, node_set
             )
 
-        # Define the demands info
-        demands_info_begin_index = lines.index("DEMANDS_TABLE") + 2
-        demands_info_end_index = find_end_index(demands_info_begin_index, lines)
-        # There may or may not be LSPs in the model, so if there are not,
-        # set the demands_info_end_index as the last line in the file
-        if not demands_info_end_index:
-            demands_info_end_index = len(lines)
-
-        demands_lines = lines[demands_info_begin_index:demands_info_end_index]
+        if "RSVP_LSP_TABLE" not in tables_read:
+            print("RSVP_LSP_TABLE not in file; no LSPs added to model")
 
-        for demand_line in demands_lines:
-            try:
-                cls._add_demand_from_data(demand_line, demand_set, lines, node_set)
-            except ModelException as e:
-                err_msg = e.args[0]
-                raise ModelException(err_msg)
+        return interface_set, node_set, demand_set, lsp_set
 
-        # Define the LSP info (if present)
-        try:
-            lsp_info_begin_index = lines.index("RSVP_LSP_TABLE") + 2
-            cls._add_lsp_from_data(lsp_info_begin_index, lines, lsp_set, node_set)
-        except ValueError:
-            print("RSVP_LSP_TABLE not in file; no LSPs added to model")
-        except ModelException as e:
-            err_msg = e.args[0]
-            raise ModelException(err_msg)
+    @classmethod
+    def _add_table_rows_from_data(cls, table_name, rows, demand_set, lsp_set, node_set):
+        """
+        Adds the Demands or RSVP LSPs from the rows of a DEMANDS_TABLE or
+        RSVP_LSP_TABLE
 
-        return cls(interface_set, node_set, demand_set, lsp_set)
+        :param table_name: 'DEMANDS_TABLE' or 'RSVP_LSP_TABLE'
+        :param rows: iterable of (line index, line) for the table's rows
+        :param demand_set: set of Demands in model
+        :param lsp_set: set of RSVP_LSPs in model
+        :param node_set: set of Nodes in model
+        """
+        if table_name == "DEMANDS_TABLE":
+            for line_index, demand_line in rows:
+                cls._add_demand_from_data(demand_line, line_index, demand_set, node_set)
+        else:
+            for line_index, lsp_line in rows:
+                cls._add_lsp_from_data(lsp_line, line_index, lsp_set, node_set)
 
     @classmethod
-    def _extract_interface_data_and_implied_nodes(
-        cls, int_info_begin_index, int_info_end_index, lines, has_circuit_id_col=True
+    def _add_interfaces_from_data(
+        cls, header_line, rows, interface_set, node_set, interface_state=None
     ):
         """
-        Extracts interface data from lines and adds Interface objects to a set.
-        Also extracts the implied Nodes from the Interfaces and adds those Nodes to a set.
+        Adds the Interfaces from the rows of an INTERFACES_TABLE to
+        interface_set and the Nodes they imply to node_set.
 
-        :param int_info_begin_index: Index position in lines where interface info begins
-        :param int_info_end_index:  Index position in lines where interface info ends
-        :param lines: lines of data describing a Model objects
-        :param has_circuit_id_col: True if file has circuit_id column (6th column)
-        :return: set of Interface objects, set of Node objects created from lines
+        If the table has a circuit_id column, each circuit_id must appear
+        exactly twice.  That is checked over the whole table before any
+        error from an individual row is raised.
+
+        :param header_line: column header line of the INTERFACES_TABLE
+        :param rows: iterable of (line index, line) for the table's rows
+        :param interface_set: set of Interfaces in model
+        :param node_set: set of Nodes in model
+        :param interface_state: (optional) InterfaceState to make the
+                                Interfaces in
         """
+        # Detect whether the file has a circuit_id column by checking
+        # the header line (the line right after INTERFACES_TABLE)
+        header_cols = [col.strip().lower() for col in header_line.split("\t")]
+        has_circuit_id_col = "circuit_id" in header_cols
 
-        interface_set = set()
-        node_set = set()
-        interface_lines = lines[int_info_begin_index:int_info_end_index]
+        circuit_id_counts = Counter()
         # Auto-assign circuit_ids for files without circuit_id column.
         # Paired interfaces (A->B and B->A) must share the same circuit_id.
-        _auto_circuit_id_counter = 1
-        _node_pair_to_circuit_id = {}  # frozenset({nodeA, nodeB}) -> circuit_id
-        # Add the Interfaces to a set
-        for interface_line in interface_lines:
-            cols = interface_line.split("\t")
-            num_cols = len(cols)
-
-            # Minimum columns required
-            if num_cols < 5:
-                msg = (
-                    "node_name, remote_node_name, name, cost, capacity "
-                    "must be defined for line {}, line index {}".format(
-                        interface_line, lines.index(interface_line)
-                    )
+        auto_circuit_ids = itertools.count(1)
+        node_pair_to_circuit_id = {}  # frozenset({nodeA, nodeB}) -> circuit_id
+        row_error = None
+
+        for line_index, interface_line in rows:
+            if has_circuit_id_col:
+                circuit_id_counts.update(interface_line.split("\t")[5:6])
+            if row_error is not None:
+                continue
+            try:
+                cls._add_interface_from_data(
+                    interface_line,
+                    line_index,
+                    interface_set,
+                    node_set,
+                    has_circuit_id_col,
+                    auto_circuit_ids,
+                    node_pair_to_circuit_id,
+                    interface_state,
                 )
-                raise ModelException(msg)
+            except Exception as e:
+                row_error = e
 
-            node_name = cols[0]
-            remote_node_name = cols[1]
-            name = cols[2]
-            cost = cols[3]
-            capacity = cols[4]
-            rsvp_enabled_bool = True
-            percent_reservable_bandwidth = 100
+        bad_circuit_ids = [
+            {"circuit_id": item, "appearances": count}
+            for item, count in circuit_id_counts.items()
+            if count != 2
+        ]
 
-            if has_circuit_id_col:
-                # Format with circuit_id column: cols[5] = circuit_id
-                if num_cols < 6:
-                    msg = (
-                        "node_name, remote_node_name, name, cost, capacity "
-                        "must be defined for line {}, line index {}".format(
-                            interface_line, lines.index(interface_line)
-                        )
-                    )
-                    raise ModelException(msg)
-                circuit_id = cols[5]
-                if num_cols >= 7:
-                    rsvp_enabled = cols[6]
-                    rsvp_enabled_bool = rsvp_enabled in [True, "T", "True", "true"]
-                if num_cols >= 8:
-                    percent_reservable_bandwidth = cols[7]
-            else:
-                # No circuit_id column — auto-assign paired circuit_ids
-                pair_key = frozenset([node_name, remote_node_name])
-                if pair_key in _node_pair_to_circuit_id:
-                    circuit_id = _node_pair_to_circuit_id.pop(pair_key)
-                else:
-                    circuit_id = _auto_circuit_id_counter
-                    _node_pair_to_circuit_id[pair_key] = circuit_id
-                    _auto_circuit_id_counter += 1
-                if num_cols >= 6:
-                    rsvp_enabled = cols[5]
-                    rsvp_enabled_bool = rsvp_enabled in [True, "T", "True", "true"]
-                if num_cols >= 7:
-                    percent_reservable_bandwidth = cols[6]
-
-            node_names = [node.name for node in node_set]
-
-            if node_name in node_names:
-                node_object = [node for node in node_set if node.name == node_name][0]
-            else:
-                node_object = Node(node_name)
+        if len(bad_circuit_ids) != 0:
+            msg = (
+                "Each circuit_id value must appear exactly twice; the following circuit_id values "
+                "do not meet that criteria: {}".format(bad_circuit_ids)
+            )
+            raise ModelException(msg)
 
-            if remote_node_name in node_names:
-                remote_node_object = [
-                    node for node in node_set if node.name == remote_node_name
-                ][0]
-            else:
-                remote_node_object = Node(remote_node_name)
-
-            new_interface = Interface(
-                name,
-                int(cost),
-                int(capacity),
-                node_object,
-                remote_node_object,
-                circuit_id,
-                rsvp_enabled_bool,
-                float(percent_reservable_bandwidth),
+        if row_error is not None:
+            raise row_error
+
+    @classmethod
+    def _add_interface_from_data(
+        cls,
+        interface_line,
+        line_index,
+        interface_set,
+        node_set,
+        has_circuit_id_col,
+        auto_circuit_ids,
+        node_pair_to_circuit_id,
+        interface_state=None,
+    ):
+        """
+        Adds Interface from line of data, and the Nodes it implies
+
+        :param interface_line: line of data for Interface
+        :param line_index: index of interface_line in data file
+        :param interface_set: set of Interfaces in model
+        :param node_set: set of Nodes in model
+        :param has_circuit_id_col: True if file has circuit_id column (6th column)
+        :param auto_circuit_ids: iterator of circuit_ids to assign if there is no circuit_id column
+        :param node_pair_to_circuit_id: auto-assigned circuit_ids waiting for the
+            other Interface of their Circuit
+        :param interface_state: (optional) InterfaceState to make the Interface in
+        """
+        cols = interface_line.split("\t")
+        num_cols = len(cols)
+
+        # Minimum columns required
+        if num_cols < 5 or (has_circuit_id_col and num_cols < 6):
+            msg = (
+                "node_name, remote_node_name, name, cost, capacity "
+                "must be defined for line {}, line index {}".format(
+                    interface_line, line_index
+                )
             )
+            raise ModelException(msg)
 
-            if new_interface._key not in {
-                interface._key for interface in interface_set
-            }:
-                interface_set.add(new_interface)
+        node_name = cols[0]
+        remote_node_name = cols[1]
+        name = cols[2]
+        cost = cols[3]
+        capacity = cols[4]
+        rsvp_enabled_bool = True
+        percent_reservable_bandwidth = 100
+
+        if has_circuit_id_col:
+            # Format with circuit_id column: cols[5] = circuit_id
+            circuit_id = cols[5]
+            if num_cols >= 7:
+                rsvp_enabled = cols[6]
+                rsvp_enabled_bool = rsvp_enabled in [True, "T", "True", "true"]
+            if num_cols >= 8:
+                percent_reservable_bandwidth = cols[7]
+        else:
+            # No circuit_id column — auto-assign paired circuit_ids
+            pair_key = frozenset([node_name, remote_node_name])
+            if pair_key in node_pair_to_circuit_id:
+                circuit_id = node_pair_to_circuit_id.pop(pair_key)
             else:
-                print(
-                    "{} already exists in model; disregarding line {}".format(
-                        new_interface, lines.index(interface_line)
-                    )
+                circuit_id = next(auto_circuit_ids)
+                node_pair_to_circuit_id[pair_key] = circuit_id
+            if num_cols >= 6:
+                rsvp_enabled = cols[5]
+                rsvp_enabled_bool = rsvp_enabled in [True, "T", "True", "true"]
+            if num_cols >= 7:
+                percent_reservable_bandwidth = cols[6]
+
+        # Derive Nodes from the Interface data
+        node_object = cls._get_or_add_node(node_name, node_set)
+        remote_node_object = cls._get_or_add_node(remote_node_name, node_set)
+
+        new_interface = Interface(
+            name,
+            int(cost),
+            int(capacity),
+            node_object,
+            remote_node_object,
+            circuit_id,
+            rsvp_enabled_bool,
+            float(percent_reservable_bandwidth),
+            interface_state=interface_state,
+        )
+
+        if not interface_set.lookup("key", new_interface._key):
+            interface_set.add(new_interface)
+        else:
+            new_interface._state.discard(new_interface)
+            print(
+                "{} already exists in model; disregarding line {}".format(
+                    new_interface, line_index
                 )
+            )
+
 
-            # Derive Nodes from the Interface data
-            if node_name not in {node.name for node in node_set}:
-                node_set.add(new_interface.node_object)
-            if remote_node_name not in {node.name for node in node_set}:
-                node_set.add(new_interface.remote_node_object)
+_MODEL_FILE_TABLES = (
+    "INTERFACES_TABLE",
+    "NODES_TABLE",
+    "DEMANDS_TABLE",
+    "RSVP_LSP_TABLE",
+)
 
-        return interface_set, node_set
+
+def _model_file_tables(lines):
+    """
+    Yields (table name, column header line, rows) for each table in the
+    lines of a network_modeling data file, where rows iterates over
+    (line index, line) for each row of the table.
+
+    A table's rows end at the first empty line, except for the
+    RSVP_LSP_TABLE, which runs to the end of the file.  Rows that are not
+    read before the next table is requested are skipped.
+
+    :param lines: iterable of lines of data (such as an open file)
+    """
+    numbered_lines = enumerate(line.rstrip("\n") for line in lines)
+    for line_index, line in numbered_lines:
+        if line not in _MODEL_FILE_TABLES:
+            continue
+        header_line = next(numbered_lines, (None, ""))[1]
+        rows = _model_file_table_rows(numbered_lines, line == "RSVP_LSP_TABLE")
+        yield line, header_line, rows
+        for row in rows:
+            pass
+
+
+def _model_file_table_rows(numbered_lines, to_end_of_file):
+    """
+    Yields (line index, line) from numbered_lines up to the first empty
+    line, or to the end of the file if to_end_of_file is True
+    """
+    for line_index, line in numbered_lines:
+        if line == "" and not to_end_of_file:
+            return
+        yield line_index, line
+
+
+def _copy_shortest_path(shortest_path):
+    """
+    Returns a copy of a shortest path dict from the path cache that the
+    caller can change without changing the cached dict
+    """
+    shortest_path = dict(shortest_path)
+    shortest_path["path"] = [list(path) for path in shortest_path["path"]]
+    return shortest_path
+
+
+def _indexed_set(set_class, objects):
+    """
+    Returns objects if it is already a set_class (IndexedSet subclass);
+    otherwise returns a new set_class with the members of objects
+    """
+    if type(objects) is set_class:
+        return objects
+    return set_class(objects)
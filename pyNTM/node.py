@@ -2,9 +2,10 @@
 
 from .exceptions import ModelException
 from .srlg import SRLG
+from .versions import _Versioned
 
 
-class Node(object):
+class Node(_Versioned):
     """
     A class to represent a layer 3 device in the model.
 
@@ -61,6 +62,7 @@ class Node(object):
     def failed(self, status):
         if not isinstance(status, bool):
             raise ModelException("must be boolean")
+        self._bump_versions("topology")
 
         if status is False:  # False means Node would not be failed
             # Check for any SRLGs with self as a member and get status
@@ -113,6 +115,7 @@ class Node(object):
     def igp_shortcuts_enabled(self, status):
         if isinstance(status, bool):
             self._igp_shortcuts_enabled = status
+            self._bump_versions("lsps")
         elif status == "True":
             self.igp_shortcuts_enabled = True
         elif status == "False":
@@ -127,15 +130,7 @@ class Node(object):
         :param model: model structure
         :return adjacency_list: (list) list of interfaces on the given node
         """
-        adjacency_list = []
-
-        interface_iterator = (interface for interface in model.interface_objects)
-
-        for interface in interface_iterator:
-            if interface.node_object.name == self.name:
-                adjacency_list.append(interface)
-
-        return adjacency_list
+        return model.get_node_interfaces(self.name)
 
     def adjacent_nodes(self, model):
         """
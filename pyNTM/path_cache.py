@@ -0,0 +1,112 @@
+"""Bounded least recently used cache for shortest path results"""
+
+from collections import OrderedDict
+
+
+class PathCache(object):
+    """
+    Least recently used cache of shortest path results (SPFDags and
+    shortest path dicts) shared by a Model's routing entry points.
+
+    Each entry is stored with the version key (see Model.versions) of the
+    state it was computed from.  An entry whose version key does not match
+    the current one is stale: it is dropped and counted as a miss when it
+    is looked up, so the cache never has to be flushed when the Model
+    changes.  Once the cache holds maxsize entries, the least recently used
+    entry is dropped to make room for a new one.
+
+    :param maxsize: maximum number of entries
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __repr__(self):
+        return "PathCache(size = %s, maxsize = %s, hits = %s, misses = %s)" % (
+            len(self._entries),
+            self.maxsize,
+            self.hits,
+            self.misses,
+        )
+
+    def __getstate__(self):
+        # The entries refer to the Model's objects; a copy of the Model
+        # starts with an empty cache
+        state = dict(self.__dict__)
+        state["_entries"] = OrderedDict()
+        return state
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, version, compute):
+        """
+        Returns the value cached for key at version; on a miss, the value
+        is computed with compute(), cached and returned
+
+        :param key: hashable key for the result
+        :param version: hashable version key of the state the result
+                        depends on
+        :param compute: function with no arguments that computes the result
+        :return: cached or computed result
+        """
+        try:
+            entry_version, value = self._entries[key]
+        except KeyError:
+            pass
+        else:
+            if entry_version == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        self.misses += 1
+        value = compute()
+        self.put(key, version, value)
+        return value
+
+    def put(self, key, version, value):
+        """
+        Caches value for key at version
+
+        :param key: hashable key for the result
+        :param version: hashable version key of the state the result
+                        depends on
+        :param value: result to cache
+        :return: None
+        """
+        self._entries[key] = (version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def items(self):
+        """
+        Returns the cached entries, least recently used first
+
+        :return: list of (key, version, value) tuples
+        """
+        return [
+            (key, version, value) for key, (version, value) in self._entries.items()
+        ]
+
+    def clear(self):
+        """Drops every entry; the hit and miss counters are kept"""
+        self._entries.clear()
+
+    def info(self):
+        """
+        Returns the cache statistics
+
+        :return: dict with 'hits', 'misses', 'size' and 'maxsize'
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
@@ -0,0 +1,160 @@
+"""Sparse Demand to Interface routing matrix for a simulated Model"""
+
+import numpy as np
+from scipy import sparse
+
+from .exceptions import ModelException
+
+
+class RoutingMatrix(object):
+    """
+    Sparse routing matrix R for the Demands and Interfaces in a Model, as
+    routed by the last simulation.  R has one row per Demand and one column
+    per Interface; R[i, j] is the fraction of the traffic of Demand i that
+    egresses Interface j, from the Demand's ECMP splits (and LSPs, if the
+    Demand takes any).
+
+    With the routing held fixed, Interface traffic is linear in the Demand
+    traffic, so the traffic on the Interfaces for a vector of Demand
+    traffic values is R.T @ traffic (see interface_traffic).  Unrouted
+    Demands have empty rows; failed Interfaces have empty columns.
+
+    The rows and columns are ordered by Demand and Interface key, so
+    matrices from the same Model line up with each other.
+
+    Requires numpy and scipy.
+
+    :param matrix: scipy.sparse matrix with shape (number of Demands,
+                   number of Interfaces)
+    :param demand_keys: list of Demand keys (source, dest, name), in row order
+    :param interface_keys: list of Interface keys (name, node name), in column order
+    """
+
+    def __init__(self, matrix, demand_keys, interface_keys):
+        self.matrix = sparse.csr_matrix(matrix)
+        self.demand_keys = [tuple(key) for key in demand_keys]
+        self.interface_keys = [tuple(key) for key in interface_keys]
+        if self.matrix.shape != (len(self.demand_keys), len(self.interface_keys)):
+            raise ModelException(
+                "routing matrix shape {} does not match {} demand keys "
+                "and {} interface keys".format(
+                    self.matrix.shape, len(self.demand_keys), len(self.interface_keys)
+                )
+            )
+        # Row of each Demand key and column of each Interface key
+        self.demand_index = {key: row for row, key in enumerate(self.demand_keys)}
+        self.interface_index = {
+            key: column for column, key in enumerate(self.interface_keys)
+        }
+
+    def __repr__(self):
+        return "RoutingMatrix(demands = %s, interfaces = %s, nonzero = %s)" % (
+            len(self.demand_keys),
+            len(self.interface_keys),
+            self.matrix.nnz,
+        )
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Builds the routing matrix for the Demands and Interfaces in model,
+        as routed by the last update_simulation() (see Model.routing_matrix)
+
+        :param model: Model object
+        :return: RoutingMatrix
+        """
+        demands = sorted(model.demand_objects, key=lambda demand: demand._key)
+        interfaces = sorted(
+            model.interface_objects, key=lambda interface: interface._key
+        )
+        column_of = {interface: column for column, interface in enumerate(interfaces)}
+
+        rows = []
+        columns = []
+        shares = []
+        dag_route_shares = {}
+        for row, demand in enumerate(demands):
+            for interface, share in model._demand_interface_shares(
+                demand, dag_route_shares
+            ).items():
+                rows.append(row)
+                columns.append(column_of[interface])
+                shares.append(share)
+
+        matrix = sparse.csr_matrix(
+            (shares, (rows, columns)), shape=(len(demands), len(interfaces))
+        )
+        return cls(
+            matrix,
+            [demand._key for demand in demands],
+            [interface._key for interface in interfaces],
+        )
+
+    def traffic_vector(self, model):
+        """
+        Returns the traffic of the Demands in model, in row order
+
+        :param model: Model object with the Demands in demand_keys
+        :return: numpy array of Demand traffic
+        """
+        traffic = np.zeros(len(self.demand_keys))
+        for demand in model.demand_objects:
+            traffic[self.demand_index[demand._key]] = demand.traffic
+        return traffic
+
+    def interface_traffic(self, traffic):
+        """
+        Returns the traffic on each Interface for the Demand traffic in
+        traffic, without rerouting: R.T @ traffic
+
+        :param traffic: array of Demand traffic in row order, with shape
+                        (number of Demands,), or (number of Demands, k) for
+                        k traffic matrices at once
+        :return: numpy array of Interface traffic in column order, with shape
+                 (number of Interfaces,) or (number of Interfaces, k)
+        """
+        traffic = np.asarray(traffic, dtype=float)
+        if traffic.shape[0] != len(self.demand_keys):
+            raise ModelException(
+                "traffic has {} rows; the routing matrix has {} demands".format(
+                    traffic.shape[0], len(self.demand_keys)
+                )
+            )
+        return self.matrix.T @ traffic
+
+    def save(self, file):
+        """
+        Saves the routing matrix and its Demand and Interface keys to a
+        numpy .npz file; the keys are saved as strings
+
+        :param file: file name or file object
+        :return: None
+        """
+        np.savez_compressed(
+            file,
+            data=self.matrix.data,
+            indices=self.matrix.indices,
+            indptr=self.matrix.indptr,
+            shape=np.array(self.matrix.shape),
+            demand_keys=np.array(self.demand_keys, dtype=str).reshape(-1, 3),
+            interface_keys=np.array(self.interface_keys, dtype=str).reshape(-1, 2),
+        )
+
+    @classmethod
+    def load(cls, file):
+        """
+        Loads a routing matrix saved by save()
+
+        :param file: file name or file object
+        :return: RoutingMatrix
+        """
+        with np.load(file, allow_pickle=False) as data:
+            matrix = sparse.csr_matrix(
+                (data["data"], data["indices"], data["indptr"]),
+                shape=tuple(data["shape"]),
+            )
+            return cls(
+                matrix,
+                data["demand_keys"].tolist(),
+                data["interface_keys"].tolist(),
+            )
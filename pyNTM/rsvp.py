@@ -1,10 +1,10 @@
 """A class to represent an RSVP label-switched-path in the network model"""
 
-import random
 from .exceptions import ModelException
+from .versions import _Versioned
 
 
-class RSVP_LSP(object):
+class RSVP_LSP(_Versioned):
     """A class to represent an RSVP label-switched-path in the network model
 
     source_node_object: Node where LSP ingresses the network (LSP starts here)
@@ -109,6 +109,19 @@ class RSVP_LSP(object):
 
         return candidate_path_info
 
+    @property
+    def configured_setup_bandwidth(self):
+        """
+        Fixed bandwidth the LSP signals for; None for an auto-bandwidth LSP
+        that signals for its share of the traffic of its parallel LSP group
+        """
+        return self._configured_setup_bandwidth
+
+    @configured_setup_bandwidth.setter
+    def configured_setup_bandwidth(self, configured_setup_bandwidth):
+        self._configured_setup_bandwidth = configured_setup_bandwidth
+        self._bump_versions("lsps")
+
     @property
     def setup_bandwidth(self):
         """
@@ -169,6 +182,7 @@ class RSVP_LSP(object):
 
     @manual_metric.setter
     def manual_metric(self, value):
+        self._bump_versions("lsps")
         if self.initial_manual_metric:
             if (
                 isinstance(self.initial_manual_metric, int)
@@ -221,30 +235,25 @@ class RSVP_LSP(object):
 
         """
 
-        # Get candidate paths; only include interfaces that have requested_bandwidth
-        # of reservable_bandwidth
-        candidate_paths = model.get_shortest_path_for_routed_lsp(
+        # Lowest cost path whose interfaces have requested_bandwidth of
+        # reservable_bandwidth, counting self's own reservation on its
+        # current path; ties are broken at random
+        path = model._get_cspf().find_path(
             self.source_node_object.name,
             self.dest_node_object.name,
-            self,
             requested_bandwidth,
-        )
-
-        # Find the path cost and path headroom for each path candidate
-        candidate_path_info = self._find_path_cost_and_headroom_routed_lsp(
-            candidate_paths
+            fewest_hops=False,
+            credit={
+                interface: self.reserved_bandwidth
+                for interface in self.path["interfaces"]
+            },
         )
 
         # If there are no paths with enough headroom, return self
-        if len(candidate_path_info) == 0:
+        if path is None:
             return self
-        # If there is only one path with enough headroom, make that self.path
-        elif len(candidate_path_info) == 1:
-            self.path = candidate_path_info[0]
-        # If there is more than one path with enough headroom,
-        # choose one at random and make that self.path
-        elif len(candidate_path_info) > 1:
-            self.path = random.choice(candidate_path_info)
+
+        self.path = self._find_path_cost_and_headroom_routed_lsp({"path": [path]})[0]
 
         self.reserved_bandwidth = requested_bandwidth
         self.setup_bandwidth = requested_bandwidth
@@ -257,15 +266,7 @@ class RSVP_LSP(object):
         :param model: model object containing LSP
         :return: List of demands in model object that LSP carries
         """
-        demand_set = set()
-        for demand in iter(model.demand_objects):
-            # TODO - add unit test to test for unrouted demands on an LSP
-            if demand.path != "Unrouted":
-                for dmd_path in demand.path:
-                    if self in dmd_path:
-                        demand_set.add(demand)
-
-        return list(demand_set)
+        return list(model._get_routing_index()["lsp_demands"].get(self, ()))
 
     def traffic_on_lsp(self, model):
         """
@@ -276,7 +277,7 @@ class RSVP_LSP(object):
         """
 
         # Find all LSPs with same source and dest as self
-        parallel_lsp_groups = model.parallel_lsp_groups()
+        parallel_lsp_groups = model._get_parallel_lsp_groups()
 
         total_traffic = sum(demand.traffic for demand in self.demands_on_lsp(model))
 
@@ -301,15 +302,10 @@ class RSVP_LSP(object):
         if not any(node.igp_shortcuts_enabled for node in model.node_objects):
             return source_dest_match_traffic
         else:
-            igp_shortcut_traffic = 0
-            # Account for possible IGP shortcut splits
-            for demand_object in self.demands_on_lsp(model):
-                for path, path_data in demand_object.path_detail.items():
-                    # Check if self is in path_data
-                    if self in path_data["items"]:
-                        igp_shortcut_traffic += path_data["path_traffic"]
-
-        return igp_shortcut_traffic
+            # Account for possible IGP shortcut splits: add up the traffic
+            # on each demand path that takes self
+            demand_traffic = model._get_routing_index()["lsp_demands"].get(self, {})
+            return sum(demand_traffic.values())
 
     def effective_metric(self, model):
         """
@@ -318,12 +314,15 @@ class RSVP_LSP(object):
         metric for the shortest possible path from LSP's source to dest,
         regardless of whether the LSP takes that shortest path or not.
 
-        Results are cached per simulation run; cache is cleared when
-        clear_effective_metric_cache() is called (during update_simulation).
+        Results are cached until the Interfaces, their costs or the LSPs in
+        model change, or clear_effective_metric_cache() is called (during
+        update_simulation).  The metrics for all the LSPs in model are
+        computed together, with one shortest path tree per LSP source node.
 
         :param model: model object containing self
         :return: metric for the LSP's shortest possible path
         """
+        model._check_lsp_effective_metrics()
         if self._cached_effective_metric is not None:
             return self._cached_effective_metric
 
@@ -333,9 +332,11 @@ class RSVP_LSP(object):
         elif "Unrouted" in self.path:
             result = "Unrouted"
         else:
-            result = model.get_shortest_path(
-                self.source_node_object.name, self.dest_node_object.name, needed_bw=0
-            )["cost"]
+            # The routing graph is synced by update_simulation(); bring it up
+            # to date with changes made since
+            model._sync_routing_graph()
+            model._set_lsp_effective_metrics()
+            return self._cached_effective_metric
 
         self._cached_effective_metric = result
         return result
@@ -0,0 +1,489 @@
+"""Immutable, picklable snapshot of the results of a Model simulation"""
+
+from array import array
+import math
+
+from .exceptions import ModelException
+
+
+class SimulationResult(object):
+    """
+    The results of one update_simulation() run, held apart from the Model's
+    objects: Interface traffic and reserved bandwidth, RSVP LSP reserved
+    bandwidth and paths, and Demand paths.  update_simulation() returns one
+    (as does Model.simulation_result()), so results from different runs,
+    Models or forks (see Model.fork) can be kept, compared and merged after
+    the Model has moved on.
+
+    Interfaces, LSPs and Demands are identified by their keys, and are
+    numbered in key order; the numbers are used as references in the
+    paths.  Loads are held in float arrays, with NaN for the traffic of a
+    failed Interface and the reserved bandwidth of an Unrouted LSP, and the
+    arrays are exposed as read-only memoryviews (numpy.asarray() can wrap
+    them without a copy).  The paths are tuples:
+
+    - LSP paths: tuple of Interface numbers; None if Unrouted
+    - Demand routes: ('dag', tuple of Interface numbers) for an IGP route,
+      which holds every shortest path from the source to the dest made of
+      those Interfaces; ('paths', tuple of paths) for explicit paths, where
+      each path item is an Interface number, or the number of Interfaces
+      plus an LSP number for an LSP; None if Unrouted.  Demands with the
+      same route share one tuple.
+
+    Use get_interface_traffic, get_lsp_path and get_demand_path to read
+    the results by key.  A SimulationResult cannot be changed.
+
+    :param interface_keys: Interface keys (name, node name), in key order
+    :param interface_remote_node_names: name of each Interface's remote Node
+    :param interface_traffic: traffic on each Interface; NaN if failed
+    :param interface_reserved_bandwidth: reserved bandwidth on each Interface
+    :param lsp_keys: RSVP LSP keys (source, dest, name), in key order
+    :param lsp_reserved_bandwidth: reserved bandwidth of each LSP; NaN if
+                                   Unrouted
+    :param lsp_paths: path of each LSP
+    :param demand_keys: Demand keys (source, dest, name), in key order
+    :param demand_routes: route of each Demand
+    :param versions: Model versions key (see Model.versions) when the result
+                     was taken
+    """
+
+    __slots__ = (
+        "interface_keys",
+        "interface_remote_node_names",
+        "_interface_traffic",
+        "_interface_reserved_bandwidth",
+        "lsp_keys",
+        "_lsp_reserved_bandwidth",
+        "lsp_paths",
+        "demand_keys",
+        "_demand_routes",
+        "_demand_route_refs",
+        "versions",
+        "_interface_index",
+        "_lsp_index",
+        "_demand_index",
+        "_pending",
+    )
+
+    def __init__(
+        self,
+        interface_keys,
+        interface_remote_node_names,
+        interface_traffic,
+        interface_reserved_bandwidth,
+        lsp_keys,
+        lsp_reserved_bandwidth,
+        lsp_paths,
+        demand_keys,
+        demand_routes,
+        versions=None,
+    ):
+        object.__setattr__(self, "_pending", None)
+        self._set_values(
+            interface_keys,
+            interface_remote_node_names,
+            interface_traffic,
+            interface_reserved_bandwidth,
+            lsp_keys,
+            lsp_reserved_bandwidth,
+            lsp_paths,
+            demand_keys,
+            demand_routes,
+            versions,
+        )
+
+    def _set_values(
+        self,
+        interface_keys,
+        interface_remote_node_names,
+        interface_traffic,
+        interface_reserved_bandwidth,
+        lsp_keys,
+        lsp_reserved_bandwidth,
+        lsp_paths,
+        demand_keys,
+        demand_routes,
+        versions,
+    ):
+        values = {
+            "interface_keys": tuple(interface_keys),
+            "interface_remote_node_names": tuple(interface_remote_node_names),
+            "_interface_traffic": array("d", interface_traffic),
+            "_interface_reserved_bandwidth": array("d", interface_reserved_bandwidth),
+            "lsp_keys": tuple(lsp_keys),
+            "_lsp_reserved_bandwidth": array("d", lsp_reserved_bandwidth),
+            "lsp_paths": tuple(lsp_paths),
+            "demand_keys": tuple(demand_keys),
+            "_demand_routes": None if demand_routes is None else tuple(demand_routes),
+            "_demand_route_refs": None,
+            "versions": versions,
+        }
+        for name, count in (
+            ("interface_remote_node_names", len(values["interface_keys"])),
+            ("_interface_traffic", len(values["interface_keys"])),
+            ("_interface_reserved_bandwidth", len(values["interface_keys"])),
+            ("_lsp_reserved_bandwidth", len(values["lsp_keys"])),
+            ("lsp_paths", len(values["lsp_keys"])),
+            ("_demand_routes", len(values["demand_keys"])),
+        ):
+            if values[name] is not None and len(values[name]) != count:
+                raise ModelException(
+                    "{} has {} entries for {} keys".format(
+                        name.lstrip("_"), len(values[name]), count
+                    )
+                )
+        values["_interface_index"] = {
+            key: number for number, key in enumerate(values["interface_keys"])
+        }
+        values["_lsp_index"] = {
+            key: number for number, key in enumerate(values["lsp_keys"])
+        }
+        values["_demand_index"] = {
+            key: number for number, key in enumerate(values["demand_keys"])
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __getattr__(self, name):
+        # Only called for the slots that are not set yet: those of a result
+        # taken by from_model are set from what it captured on first use
+        if name == "_pending" or self._pending is None:
+            raise AttributeError(name)
+        self._build()
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SimulationResult cannot be changed")
+
+    def __delattr__(self, name):
+        raise AttributeError("SimulationResult cannot be changed")
+
+    def __reduce__(self):
+        # The key indexes are rebuilt instead of pickled
+        return (
+            self.__class__,
+            (
+                self.interface_keys,
+                self.interface_remote_node_names,
+                self._interface_traffic,
+                self._interface_reserved_bandwidth,
+                self.lsp_keys,
+                self._lsp_reserved_bandwidth,
+                self.lsp_paths,
+                self.demand_keys,
+                self.demand_routes,
+                self.versions,
+            ),
+        )
+
+    @property
+    def demand_routes(self):
+        """Route of each Demand"""
+        if self._demand_routes is None:
+            object.__setattr__(self, "_demand_routes", self._encode_demand_routes())
+            object.__setattr__(self, "_demand_route_refs", None)
+        return self._demand_routes
+
+    def _encode_demand_routes(self):
+        # Demands with the same route share one tuple
+        interface_number, item_number, route_refs = self._demand_route_refs
+        routes = {}
+        dag_routes = {}
+        demand_routes = []
+        for route_ref in route_refs:
+            if route_ref is None:
+                route = None
+            elif isinstance(route_ref, list):
+                route = (
+                    "paths",
+                    tuple(
+                        tuple(item_number[id(item)] for item in path)
+                        for path in route_ref
+                    ),
+                )
+            else:
+                if id(route_ref) not in dag_routes:
+                    dag_routes[id(route_ref)] = (
+                        "dag",
+                        tuple(
+                            sorted(
+                                interface_number[id(interface)]
+                                for interface in route_ref.interfaces()
+                            )
+                        ),
+                    )
+                route = dag_routes[id(route_ref)]
+            demand_routes.append(routes.setdefault(route, route))
+        return tuple(demand_routes)
+
+    def __repr__(self):
+        return "SimulationResult(interfaces = %s, lsps = %s, demands = %s)" % (
+            len(self.interface_keys),
+            len(self.lsp_keys),
+            len(self.demand_keys),
+        )
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Takes the results of the last update_simulation() from model.
+
+        Only the Model objects, the Interface load columns and the routes are
+        captured here; LSP paths and Demand routes are replaced by
+        update_simulation(), never changed in place, so they are held by
+        reference.  Sorting by key and building the arrays is left to the
+        first use of the result, and the Demand routes are encoded when they
+        are first read, so taking a result adds little to an update.
+
+        :param model: Model object
+        :return: SimulationResult
+        """
+        interface_state = model.interface_state
+        lsps = list(model.rsvp_lsp_objects)
+        demands = list(model.demand_objects)
+        result = cls.__new__(cls)
+        object.__setattr__(result, "versions", model.versions.key())
+        object.__setattr__(
+            result,
+            "_pending",
+            (
+                list(interface_state.interfaces),
+                interface_state.traffic[:],
+                interface_state.reserved_bandwidth[:],
+                lsps,
+                [lsp.path for lsp in lsps],
+                [lsp.reserved_bandwidth for lsp in lsps],
+                demands,
+                [demand._dag_route for demand in demands],
+                [demand._path for demand in demands],
+            ),
+        )
+        return result
+
+    def _build(self):
+        """Sets the values of a result taken by from_model from its capture"""
+        (
+            interface_rows,
+            traffic_column,
+            reserved_bandwidth_column,
+            lsps,
+            lsp_paths,
+            lsp_reserved_bandwidths,
+            demands,
+            demand_dag_routes,
+            demand_paths,
+        ) = self._pending
+
+        # (Interface, row) in key order, leaving out the free rows
+        interfaces = sorted(
+            (
+                (interface, row)
+                for row, interface in enumerate(interface_rows)
+                if interface is not None
+            ),
+            key=lambda interface_row: interface_row[0]._key,
+        )
+        interface_number = {
+            id(interface): number for number, (interface, _) in enumerate(interfaces)
+        }
+        lsp_order = sorted(range(len(lsps)), key=lambda number: lsps[number]._key)
+        item_number = dict(interface_number)
+        item_number.update(
+            (id(lsps[index]), len(interfaces) + number)
+            for number, index in enumerate(lsp_order)
+        )
+        demand_order = sorted(
+            range(len(demands)), key=lambda number: demands[number]._key
+        )
+
+        self._set_values(
+            [interface._key for interface, _ in interfaces],
+            [interface.remote_node_object.name for interface, _ in interfaces],
+            [traffic_column[row] for _, row in interfaces],
+            [reserved_bandwidth_column[row] for _, row in interfaces],
+            [lsps[index]._key for index in lsp_order],
+            [
+                (
+                    math.nan
+                    if "Unrouted" in lsp_paths[index]
+                    else lsp_reserved_bandwidths[index]
+                )
+                for index in lsp_order
+            ],
+            [
+                (
+                    None
+                    if "Unrouted" in lsp_paths[index]
+                    else tuple(
+                        interface_number[id(item)]
+                        for item in lsp_paths[index]["interfaces"]
+                    )
+                )
+                for index in lsp_order
+            ],
+            [demands[index]._key for index in demand_order],
+            None,
+            self.versions,
+        )
+        route_refs = [
+            (
+                None
+                if demand_paths[index] == "Unrouted"
+                else (
+                    demand_dag_routes[index]
+                    if demand_dag_routes[index] is not None
+                    else demand_paths[index]
+                )
+            )
+            for index in demand_order
+        ]
+        object.__setattr__(
+            self, "_demand_route_refs", (interface_number, item_number, route_refs)
+        )
+        object.__setattr__(self, "_pending", None)
+
+    @property
+    def interface_traffic(self):
+        """Read-only view of the traffic on each Interface; NaN if failed"""
+        return memoryview(self._interface_traffic).toreadonly()
+
+    @property
+    def interface_reserved_bandwidth(self):
+        """Read-only view of the reserved bandwidth on each Interface"""
+        return memoryview(self._interface_reserved_bandwidth).toreadonly()
+
+    @property
+    def lsp_reserved_bandwidth(self):
+        """Read-only view of the reserved bandwidth of each LSP; NaN if Unrouted"""
+        return memoryview(self._lsp_reserved_bandwidth).toreadonly()
+
+    def _get_number(self, index, key, kind):
+        try:
+            return index[tuple(key)]
+        except KeyError:
+            raise ModelException("no matching {} in the result".format(kind))
+
+    def get_interface_traffic(self, interface_name, node_name):
+        """
+        Returns the traffic on an Interface, as Interface.traffic had it
+
+        :param interface_name: name of Interface
+        :param node_name: name of the Interface's Node
+        :return: traffic, or 'Down' if the Interface was failed
+        """
+        traffic = self._interface_traffic[
+            self._get_number(
+                self._interface_index, (interface_name, node_name), "interface"
+            )
+        ]
+        return "Down" if math.isnan(traffic) else traffic
+
+    def get_lsp_path(self, source_node_name, dest_node_name, lsp_name):
+        """
+        Returns the keys of the Interfaces on an RSVP LSP's path
+
+        :param source_node_name: name of the LSP's source Node
+        :param dest_node_name: name of the LSP's destination Node
+        :param lsp_name: name of the LSP
+        :return: list of Interface keys, or 'Unrouted'
+        """
+        path = self.lsp_paths[
+            self._get_number(
+                self._lsp_index, (source_node_name, dest_node_name, lsp_name), "lsp"
+            )
+        ]
+        if path is None:
+            return "Unrouted"
+        return [self.interface_keys[number] for number in path]
+
+    def get_demand_path(self, source_node_name, dest_node_name, demand_name="none"):
+        """
+        Returns a Demand's paths, in the form of Demand.path with keys in
+        place of the objects: each path is a list of Interface keys (name,
+        node name) and/or LSP keys (source, dest, name)
+
+        :param source_node_name: name of the Demand's source Node
+        :param dest_node_name: name of the Demand's destination Node
+        :param demand_name: name of the Demand
+        :return: list of paths, or 'Unrouted'
+        """
+        route = self.demand_routes[
+            self._get_number(
+                self._demand_index,
+                (source_node_name, dest_node_name, demand_name),
+                "demand",
+            )
+        ]
+        if route is None:
+            return "Unrouted"
+        if route[0] == "paths":
+            return [[self._item_key(number) for number in path] for path in route[1]]
+
+        # Walk the Interfaces of the shortest path DAG from source to dest
+        next_interfaces = {}
+        for number in route[1]:
+            next_interfaces.setdefault(self.interface_keys[number][1], []).append(
+                number
+            )
+        paths = []
+        stack = [(source_node_name, [])]
+        while stack:
+            node_name, path = stack.pop()
+            if node_name == dest_node_name:
+                paths.append([self.interface_keys[number] for number in path])
+                continue
+            for number in reversed(next_interfaces.get(node_name, [])):
+                stack.append(
+                    (self.interface_remote_node_names[number], path + [number])
+                )
+        return paths
+
+    def _item_key(self, number):
+        if number < len(self.interface_keys):
+            return self.interface_keys[number]
+        return self.lsp_keys[number - len(self.interface_keys)]
+
+    def compare(self, other):
+        """
+        Returns the Interfaces whose traffic differs between self and other
+
+        :param other: SimulationResult
+        :return: dict of (traffic in self, traffic in other) tuples, keyed by
+                 Interface key, for the Interfaces in both results; traffic
+                 is 'Down' for failed Interfaces
+        """
+        differences = {}
+        for key, number in self._interface_index.items():
+            other_number = other._interface_index.get(key)
+            if other_number is None:
+                continue
+            traffic = self._interface_traffic[number]
+            other_traffic = other._interface_traffic[other_number]
+            if math.isnan(traffic) and math.isnan(other_traffic):
+                continue
+            if traffic != other_traffic:
+                differences[key] = (
+                    "Down" if math.isnan(traffic) else traffic,
+                    "Down" if math.isnan(other_traffic) else other_traffic,
+                )
+        return differences
+
+    @staticmethod
+    def peak_interface_traffic(results):
+        """
+        Merges results into the highest traffic on each Interface across
+        them, such as the worst case over a set of failure scenarios
+
+        :param results: iterable of SimulationResults
+        :return: dict of (traffic, number of the result with that traffic)
+                 tuples, keyed by Interface key; Interfaces that are failed in
+                 every result are left out
+        """
+        peak = {}
+        for result_number, result in enumerate(results):
+            for key, traffic in zip(result.interface_keys, result._interface_traffic):
+                if math.isnan(traffic):
+                    continue
+                if key not in peak or traffic > peak[key][0]:
+                    peak[key] = (traffic, result_number)
+        return peak
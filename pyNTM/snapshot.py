@@ -0,0 +1,444 @@
+"""Binary snapshots of a Model with its simulation state; see
+Model.save_snapshot and Model.load_snapshot"""
+
+import copyreg
+import gc
+import hashlib
+import io
+import itertools
+import mmap
+import os
+import pickle
+import struct
+
+from .demand import Demand
+from .exceptions import ModelException
+from .interface import Interface
+from .rsvp import RSVP_LSP
+from .spf import DagRoute
+
+# Magic, format version, hash of the model file the snapshot was taken from
+# (zeros if none), pickle offset and length, and number of buffers; each
+# buffer is then listed by offset and length
+_HEADER = struct.Struct("<8sI32sQQQ")
+_BUFFER_ENTRY = struct.Struct("<QQ")
+_MAGIC = b"pyNTMsnp"
+_FORMAT_VERSION = 2
+_NO_SOURCE_HASH = bytes(32)
+
+# Buffers start on this boundary so arrays mapped from them are aligned
+_ALIGNMENT = 64
+
+# Model attributes holding caches, which are rebuilt on their next use
+_MODEL_CACHES = (
+    "_parallel_lsp_groups",
+    "_parallel_demand_groups",
+    "_igp_routed_demands",
+    "_cspf",
+    "_routing_index",
+)
+
+# Attributes of the Model objects that hold simulation results, caches or
+# references to the Model, left out of input_fingerprint; RSVP LSP manual
+# metrics are taken from RSVP_LSP.manual_metric, which moves the configured
+# value into _manual_metric when it is first read, and the Interface inputs
+# kept in the Model's InterfaceState are taken from their properties
+_NON_INPUT_ATTRIBUTES = frozenset(
+    (
+        "traffic",
+        "_reserved_bandwidth",
+        "in_ckt",
+        "path",
+        "reserved_bandwidth",
+        "_setup_bandwidth",
+        "_cached_effective_metric",
+        "initial_manual_metric",
+        "_manual_metric",
+        "_path",
+        "_dag_route",
+        "_path_detail",
+        "_model_versions",
+        "_state",
+        "_row",
+        "model",
+    )
+)
+
+# Size of the chunks a model file is hashed in
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def default_snapshot_file(data_file):
+    """
+    Returns the snapshot file that Model.load_model_file checks for
+    data_file: data_file with '.snapshot' appended
+
+    :param data_file: model file name
+    :return: snapshot file name
+    """
+    return os.fspath(data_file) + ".snapshot"
+
+
+def file_hash(data_file):
+    """
+    Returns the content hash of a model file, as kept in snapshots
+
+    :param data_file: model file name
+    :return: SHA-256 digest (bytes)
+    """
+    content_hash = hashlib.sha256()
+    with open(data_file, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            content_hash.update(chunk)
+    return content_hash.digest()
+
+
+class HashingReader(io.RawIOBase):
+    """
+    Binary reader that updates a hash with the bytes read through it, so a
+    model file can be hashed as it is parsed
+
+    :param raw: binary file object to read from
+    :param content_hash: hashlib hash object
+    """
+
+    def __init__(self, raw, content_hash):
+        super().__init__()
+        self.raw = raw
+        self.content_hash = content_hash
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self.raw.readinto(buffer)
+        if count:
+            self.content_hash.update(memoryview(buffer)[:count])
+        return count
+
+
+def input_fingerprint(model):
+    """
+    Returns a fingerprint of the inputs of model: the attributes of its
+    Nodes, SRLGs, Interfaces, RSVP LSPs and Demands other than the
+    simulation results, and its load_propagation (Circuits are made from
+    the Interfaces by update_simulation).  Nodes and
+    Interfaces in attribute values are hashed by name or key and other
+    Model objects by identity.  The fingerprint is a hash
+    that changes when any input changes, even the ones that are not
+    versioned (see Model.versions), such as Node coordinates and SRLG
+    memberships; it is only comparable within one Python process.
+
+    :param model: Model object
+    :return: int, or None for a Model with a demand table, whose columns
+             can be changed in place
+    """
+    if model._demand_table is not None:
+        return None
+    fingerprint = hash(model.load_propagation)
+    for object_set in (
+        model.node_objects,
+        model.srlg_objects,
+        model.interface_objects,
+        model.rsvp_lsp_objects,
+        model.demand_objects,
+    ):
+        for model_object in object_set:
+            row = [
+                value
+                for name, value in model_object.__dict__.items()
+                if name not in _NON_INPUT_ATTRIBUTES
+            ]
+            if type(model_object) is RSVP_LSP:
+                row.append(model_object.manual_metric)
+            elif type(model_object) is Interface:
+                row.extend(
+                    (
+                        model_object.capacity,
+                        model_object.cost,
+                        model_object.percent_reservable_bandwidth,
+                        model_object.rsvp_enabled,
+                        model_object.failed,
+                    )
+                )
+            try:
+                row_hash = hash(tuple(row))
+            except TypeError:
+                row_hash = hash(tuple(map(_input_value, row)))
+            # Order independent sum of the row hashes
+            fingerprint += row_hash
+    return fingerprint & 0xFFFFFFFFFFFFFFFF
+
+
+def _input_value(value):
+    # Hashable stand-in for an unhashable attribute value, such as a set of
+    # SRLGs
+    if isinstance(value, set):
+        return frozenset(value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """
+    Pickler for a Model that writes the Model's Demands, and the DagRoutes
+    they are routed along, as columns of attribute values, which load much
+    faster than a pickled object each.  The explicit paths and path detail
+    of Demands routed along a DagRoute are left out; they are rebuilt from
+    the DagRoute if they are requested after loading, as in a fork (see
+    pyNTM.fork).  The Model's caches are left out as well.
+
+    The number of Demands is dumped first, then the Model, with each
+    reference to a Demand written as a persistent id, then the columns.
+    """
+
+    def __init__(self, file, model, buffer_callback):
+        super().__init__(file, protocol=5, buffer_callback=buffer_callback)
+        self.model = model
+        self.demands = [
+            demand
+            for demand in itertools.chain(
+                model.demand_objects, model._demand_table_demands.values()
+            )
+            if type(demand) is Demand
+        ]
+        self.demand_numbers = {
+            id(demand): number for number, demand in enumerate(self.demands)
+        }
+
+    def dump_model(self):
+        self.dump(len(self.demands))
+        self.dump(self.model)
+        self.dump(self.demand_columns())
+
+    def persistent_id(self, obj):
+        if type(obj) is Demand:
+            number = self.demand_numbers.get(id(obj))
+            if number is not None:
+                return ("demand", number)
+        return None
+
+    def reducer_override(self, obj):
+        if obj is self.model:
+            state = dict(obj.__dict__)
+            state.update(dict.fromkeys(_MODEL_CACHES))
+            return copyreg.__newobj__, (type(obj),), state
+        return NotImplemented
+
+    def demand_columns(self):
+        """
+        Returns the Demand columns: a list of (attribute names, Demand
+        numbers, attribute value columns) for each set of attribute names,
+        and the source SPFDag and dest Node name columns of the DagRoutes.
+        The _dag_route column holds DagRoute numbers.
+        """
+        groups = {}
+        for number, demand in enumerate(self.demands):
+            groups.setdefault(tuple(demand.__dict__), []).append(number)
+
+        dag_route_numbers = {}
+        dag_routes = []
+        columns = []
+        for names, numbers in groups.items():
+            demands = [self.demands[number] for number in numbers]
+            group_columns = []
+            for name in names:
+                if name == "_dag_route":
+                    column = []
+                    for demand in demands:
+                        dag_route = demand._dag_route
+                        if dag_route is None:
+                            column.append(None)
+                            continue
+                        if id(dag_route) not in dag_route_numbers:
+                            dag_route_numbers[id(dag_route)] = len(dag_routes)
+                            dag_routes.append(dag_route)
+                        column.append(dag_route_numbers[id(dag_route)])
+                elif name in ("_path", "_path_detail"):
+                    column = [
+                        None if demand._dag_route is not None else demand.__dict__[name]
+                        for demand in demands
+                    ]
+                else:
+                    column = [demand.__dict__[name] for demand in demands]
+                group_columns.append(column)
+            columns.append((names, numbers, group_columns))
+
+        dag_route_columns = (
+            [dag_route.spf_dag for dag_route in dag_routes],
+            [dag_route.dest_node_name for dag_route in dag_routes],
+        )
+        return columns, dag_route_columns
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """
+    Unpickler for the Model written by _SnapshotPickler
+    """
+
+    def load_model(self):
+        # The Demands are created empty for the persistent ids to refer to
+        # and filled in from the columns
+        self.demands = list(map(object.__new__, itertools.repeat(Demand, self.load())))
+        model = self.load()
+        columns, dag_route_columns = self.load()
+
+        dag_routes = list(map(DagRoute, *dag_route_columns))
+        for names, numbers, group_columns in columns:
+            demand_dicts = [self.demands[number].__dict__ for number in numbers]
+            for name, column in zip(names, group_columns):
+                if name == "_dag_route":
+                    column = [
+                        None if number is None else dag_routes[number]
+                        for number in column
+                    ]
+                for demand_dict, value in zip(demand_dicts, column):
+                    demand_dict[name] = value
+        return model
+
+    def persistent_load(self, pid):
+        kind, number = pid
+        if kind != "demand":
+            raise pickle.UnpicklingError("unsupported persistent id {}".format(pid))
+        return self.demands[number]
+
+
+def write_snapshot(model, snapshot_file):
+    """
+    Writes model to snapshot_file.
+
+    The Model objects and simulation state are pickled, with numpy arrays
+    (such as the columns of a demand table) written out of band after the
+    pickle so read_snapshot can map them from the file without reading
+    them.  The hash of the model file model was loaded from is kept if the
+    Model inputs have not changed since, so load_model_file can reuse the
+    snapshot.  The snapshot is written to a temporary file that replaces
+    snapshot_file once it is complete.
+
+    :param model: Model object
+    :param snapshot_file: file name
+    :return: None
+    """
+    buffers = []
+    data = io.BytesIO()
+    _SnapshotPickler(data, model, buffers.append).dump_model()
+    data = data.getbuffer()
+    buffers = [buffer.raw() for buffer in buffers]
+
+    pickle_offset = _HEADER.size + _BUFFER_ENTRY.size * len(buffers)
+    offset = pickle_offset + len(data)
+    buffer_entries = []
+    for buffer in buffers:
+        offset += -offset % _ALIGNMENT
+        buffer_entries.append((offset, buffer.nbytes))
+        offset += buffer.nbytes
+
+    temporary_file = os.fspath(snapshot_file) + ".tmp"
+    with open(temporary_file, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                _MAGIC,
+                _FORMAT_VERSION,
+                _fresh_source_hash(model) or _NO_SOURCE_HASH,
+                pickle_offset,
+                len(data),
+                len(buffers),
+            )
+        )
+        for buffer_entry in buffer_entries:
+            f.write(_BUFFER_ENTRY.pack(*buffer_entry))
+        f.write(data)
+        for (offset, _), buffer in zip(buffer_entries, buffers):
+            f.write(bytes(offset - f.tell()))
+            f.write(buffer)
+    os.replace(temporary_file, snapshot_file)
+
+
+def read_snapshot(snapshot_file):
+    """
+    Reads a Model from a snapshot written by write_snapshot.
+
+    The file is memory mapped copy-on-write: arrays in the snapshot are
+    views of the mapping, and changes to them are not written back to the
+    file.
+
+    :param snapshot_file: file name
+    :return: Model object
+    """
+    with open(snapshot_file, "rb") as f:
+        try:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except ValueError:
+            raise ModelException("{} is not a pyNTM snapshot".format(snapshot_file))
+    view = memoryview(mapping)
+    _, _, pickle_offset, pickle_length, buffer_count = _read_header(view, snapshot_file)
+    buffers = []
+    for number in range(buffer_count):
+        offset, length = _BUFFER_ENTRY.unpack_from(
+            view, _HEADER.size + _BUFFER_ENTRY.size * number
+        )
+        buffers.append(view[offset : offset + length])
+
+    unpickler = _SnapshotUnpickler(
+        io.BytesIO(view[pickle_offset : pickle_offset + pickle_length]),
+        buffers=buffers,
+    )
+    # The collector would walk the growing heap many times over while the
+    # objects are created; nothing loaded is garbage
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return unpickler.load_model()
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def read_snapshot_source_hash(snapshot_file):
+    """
+    Returns the hash of the model file a snapshot was taken from, without
+    reading the rest of the snapshot
+
+    :param snapshot_file: file name
+    :return: SHA-256 digest (bytes), or None if the snapshot has none or
+             snapshot_file does not exist
+    """
+    try:
+        with open(snapshot_file, "rb") as f:
+            header = f.read(_HEADER.size)
+    except FileNotFoundError:
+        return None
+    model_source_hash = _read_header(header, snapshot_file)[1]
+    return None if model_source_hash == _NO_SOURCE_HASH else model_source_hash
+
+
+def _read_header(data, snapshot_file):
+    if len(data) < _HEADER.size or bytes(data[: len(_MAGIC)]) != _MAGIC:
+        raise ModelException("{} is not a pyNTM snapshot".format(snapshot_file))
+    header = _HEADER.unpack_from(data)
+    if header[1] != _FORMAT_VERSION:
+        raise ModelException(
+            "{} has snapshot format version {}; version {} is supported".format(
+                snapshot_file, header[1], _FORMAT_VERSION
+            )
+        )
+    return header[1:]
+
+
+def _fresh_source_hash(model):
+    """
+    Returns the hash of the model file model was loaded from, or None if
+    model was not loaded with load_model_file(use_snapshot=True) or its
+    inputs have changed since
+    """
+    if model._source is None:
+        return None
+    _, model_source_hash, fingerprint = model._source
+    if model_source_hash is None or fingerprint is None:
+        return None
+    if input_fingerprint(model) != fingerprint:
+        return None
+    return model_source_hash
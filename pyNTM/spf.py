@@ -0,0 +1,617 @@
+"""Shortest path first (SPF) computations shared by the Model routing calls"""
+
+import heapq
+import itertools
+
+import networkx as nx
+
+
+class SPFDag(object):
+    """
+    The shortest path directed acyclic graph (DAG) from a single source Node
+    to every other reachable Node in a weighted networkx multidigraph.
+
+    A single Dijkstra run from the source produces the predecessor lists and
+    path costs for every destination, so all the Demands sharing a source Node
+    can be routed from one SPFDag instead of running a separate shortest path
+    search for each Demand.
+
+    The lowest cost (ECMP) Interfaces between each predecessor and Node pair
+    are captured when the SPFDag is created, so the DAG remains a snapshot of
+    the topology at the time it was computed.
+
+    :param G: networkx multidigraph with 'cost' and 'interface' edge data, as
+              produced by Model._make_weighted_network_graph_mdg
+    :param source_node_name: name of the source Node
+    :param ecmp_links: (optional) dict of ECMP Interface lists keyed by
+                       (node_name, next_node_name), shared by SPFDags computed
+                       on the same G; the lowest cost Interfaces between two
+                       Nodes do not depend on the source, so sharing the dict
+                       keeps a single copy of each list
+    :param interface_filter: (optional) function that takes an Interface and
+                             returns True if the Interface's edge in G may be
+                             used; edges whose Interface fails the filter are
+                             hidden from the SPF.  ecmp_links must only be
+                             shared by SPFDags that use the same filter
+    """
+
+    def __init__(self, G, source_node_name, ecmp_links=None, interface_filter=None):
+        self.source_node_name = source_node_name
+
+        if interface_filter is None:
+            weight = "cost"
+        else:
+
+            def weight(node_name, next_node_name, parallel_edges):
+                # None hides the edge from the networkx SPF
+                return min(
+                    (
+                        edge["cost"]
+                        for edge in parallel_edges.values()
+                        if interface_filter(edge["interface"])
+                    ),
+                    default=None,
+                )
+
+        # pred is a dict of predecessor node name lists, keyed by node name;
+        # dist is a dict of path costs from the source, keyed by node name
+        self.pred, self.dist = nx.dijkstra_predecessor_and_distance(
+            G, source_node_name, weight=weight
+        )
+
+        # ECMP Interfaces from each predecessor to each node in the DAG;
+        # keys are (predecessor_name, node_name) tuples
+        self._ecmp_links = {} if ecmp_links is None else ecmp_links
+        for node_name, predecessors in self.pred.items():
+            for predecessor in predecessors:
+                if (predecessor, node_name) in self._ecmp_links:
+                    continue
+                parallel_edges = [
+                    edge
+                    for edge in G[predecessor][node_name].values()
+                    if interface_filter is None or interface_filter(edge["interface"])
+                ]
+                min_cost = min(edge["cost"] for edge in parallel_edges)
+                self._ecmp_links[(predecessor, node_name)] = [
+                    edge["interface"]
+                    for edge in parallel_edges
+                    if edge["cost"] == min_cost
+                ]
+
+    def __repr__(self):
+        return "SPFDag(source = %s, reachable nodes = %s)" % (
+            self.source_node_name,
+            len(self.dist),
+        )
+
+    def is_reachable(self, dest_node_name):
+        """
+        Is dest_node_name reachable from the source Node?
+
+        :param dest_node_name: name of destination Node
+        :return: Boolean
+        """
+        return dest_node_name in self.pred
+
+    def cost(self, dest_node_name):
+        """
+        Returns the shortest path cost from the source Node to dest_node_name
+
+        :param dest_node_name: name of destination Node
+        :return: shortest path cost; raises networkx NetworkXNoPath if
+                 dest_node_name is not reachable
+        """
+        try:
+            return self.dist[dest_node_name]
+        except KeyError:
+            raise nx.NetworkXNoPath(
+                "Target {} cannot be reached from {}".format(
+                    dest_node_name, self.source_node_name
+                )
+            )
+
+    def node_paths(self, dest_node_name):
+        """
+        Generates each shortest path from the source Node to dest_node_name
+        as a list of Node names.  The paths are generated in the same order
+        as networkx all_shortest_paths would generate them.
+
+        :param dest_node_name: name of destination Node
+        :return: generator of lists of Node names; raises networkx NetworkXNoPath
+                 if dest_node_name is not reachable
+
+        Example::
+
+            >>> list(spf_dag.node_paths('D'))
+            [['A', 'D'], ['A', 'B', 'D'], ['A', 'B', 'G', 'D']]
+        """
+        if dest_node_name not in self.pred:
+            raise nx.NetworkXNoPath(
+                "Target {} cannot be reached from {}".format(
+                    dest_node_name, self.source_node_name
+                )
+            )
+
+        return self._build_node_paths(dest_node_name)
+
+    def _build_node_paths(self, dest_node_name):
+        """
+        Walks the predecessor lists back from dest_node_name to the source
+        Node with an explicit stack, yielding each complete path
+        """
+        pred = self.pred
+        seen = {dest_node_name}
+        stack = [[dest_node_name, 0]]
+        top = 0
+        while top >= 0:
+            node_name, index = stack[top]
+            if node_name == self.source_node_name:
+                yield [hop for hop, _ in reversed(stack[: top + 1])]
+            if len(pred[node_name]) > index:
+                stack[top][1] = index + 1
+                next_node_name = pred[node_name][index]
+                if next_node_name in seen:
+                    continue
+                seen.add(next_node_name)
+                top += 1
+                if top == len(stack):
+                    stack.append([next_node_name, 0])
+                else:
+                    stack[top][:] = [next_node_name, 0]
+            else:
+                seen.discard(node_name)
+                top -= 1
+
+    def ecmp_links(self, node_name, next_node_name):
+        """
+        Returns the lowest cost Interfaces from node_name to next_node_name
+        in the DAG
+
+        :param node_name: name of Node where the Interfaces reside
+        :param next_node_name: name of the downstream Node in the DAG
+        :return: list of Interface objects
+        """
+        return self._ecmp_links[(node_name, next_node_name)]
+
+    def interface_paths(self, dest_node_name, node_paths=None):
+        """
+        Returns the shortest paths from the source Node to dest_node_name
+        as hop lists of ECMP Interfaces; this is the same form as returned by
+        Model._get_all_paths_mdg.
+
+        :param dest_node_name: name of destination Node
+        :param node_paths: (optional) the already generated node_paths for
+                           dest_node_name, to avoid walking the DAG again
+        :return: list of paths; each path is a list of hops and each hop is a
+                 list of the ECMP Interfaces between consecutive Nodes in the path
+        """
+        if node_paths is None:
+            node_paths = self.node_paths(dest_node_name)
+
+        all_paths = []
+        for node_path in node_paths:
+            all_paths.append(
+                [
+                    self._ecmp_links[(node_path[index], node_path[index + 1])]
+                    for index in range(len(node_path) - 1)
+                ]
+            )
+        return all_paths
+
+    def next_hops(self, dest_node_name):
+        """
+        Returns the part of the DAG that leads to dest_node_name: the ECMP
+        egress Interfaces from each Node that is on a shortest path from the
+        source Node to dest_node_name.
+
+        :param dest_node_name: name of destination Node
+        :return: dict with Node names as keys and lists of egress Interfaces
+                 toward dest_node_name as values
+        """
+        next_hops = {}
+        visited = {dest_node_name}
+        nodes_to_visit = [dest_node_name]
+        while nodes_to_visit:
+            node_name = nodes_to_visit.pop()
+            for predecessor in self.pred[node_name]:
+                next_hops.setdefault(predecessor, []).extend(
+                    self._ecmp_links[(predecessor, node_name)]
+                )
+                if predecessor not in visited:
+                    visited.add(predecessor)
+                    nodes_to_visit.append(predecessor)
+
+        return next_hops
+
+    def interface_traffic(self, dest_node_name, traffic):
+        """
+        Pushes traffic from the source Node to dest_node_name along the DAG,
+        hop by hop.  At each Node, the traffic arriving at the Node is split
+        evenly over the Node's ECMP egress Interfaces toward dest_node_name.
+
+        The work done is proportional to the number of edges in the DAG
+        toward dest_node_name, not to the number of distinct paths.
+
+        :param dest_node_name: name of destination Node
+        :param traffic: amount of traffic to push from source to destination
+        :return: dict with Interfaces as keys and traffic on each Interface as values
+        """
+        next_hops = self.next_hops(dest_node_name)
+
+        # Interface costs are at least 1, so processing the Nodes in order of
+        # increasing distance from the source means all the traffic arriving at
+        # a Node has been accounted for before the Node's traffic is split
+        node_traffic = {self.source_node_name: float(traffic)}
+        interface_traffic = {}
+        for node_name in sorted(next_hops, key=self.dist.__getitem__):
+            egress_interfaces = next_hops[node_name]
+            traffic_per_interface = node_traffic[node_name] / len(egress_interfaces)
+            for interface in egress_interfaces:
+                interface_traffic[interface] = traffic_per_interface
+                remote_node_name = interface.remote_node_object.name
+                node_traffic[remote_node_name] = (
+                    node_traffic.get(remote_node_name, 0.0) + traffic_per_interface
+                )
+
+        return interface_traffic
+
+    def repair(self, G, changed_node_pairs, ecmp_links):
+        """
+        Returns the SPFDag for G after the edges between some Node pairs have
+        been added, removed or had their cost changed, and the names of the
+        destination Nodes whose shortest paths changed.
+
+        Only the part of the DAG that the changes reach is recomputed, in the
+        style of the Ramalingam-Reps dynamic SPF algorithm:
+
+        1. Edges that are no longer on a shortest path are taken out of the
+           DAG; Nodes left with no predecessors, and the Nodes that only
+           reach the source through them, lose their distance
+        2. A Dijkstra run seeded from the unaffected Nodes next to the Nodes
+           that lost their distance, and from the changed edges that are now
+           shorter, settles only the Nodes whose distance changes
+        3. The predecessors are recomputed for the Nodes around those changes
+
+        self is not changed, so DagRoutes on self stay valid for destinations
+        whose shortest paths did not change.  Only SPFDags computed without
+        an interface_filter can be repaired.
+
+        :param G: networkx multidigraph self was computed on, with the changes
+        :param changed_node_pairs: set of (node_name, next_node_name) tuples;
+                                   the Node pairs whose edges in G changed
+        :param ecmp_links: dict of ECMP Interface lists shared by the SPFDags
+                           repaired or computed on G after the changes
+        :return: (SPFDag, set of changed destination Node names); self and an
+                 empty set if none of the changes touch the DAG
+        """
+        dist = self.dist
+        pred = self.pred
+        cost = self._pair_cost_function(G)
+
+        touched_pairs = [
+            (node_name, next_node_name)
+            for node_name, next_node_name in changed_node_pairs
+            if node_name in pred.get(next_node_name, ())
+            or (
+                node_name in dist
+                and cost(node_name, next_node_name) is not None
+                and dist[node_name] + cost(node_name, next_node_name)
+                <= dist.get(next_node_name, float("inf"))
+            )
+        ]
+        if not touched_pairs:
+            return self, set()
+
+        new_dist = dict(dist)
+        # The predecessor lists are shared with self until they change
+        new_pred = dict(pred)
+
+        # 1. Take the edges that are no longer on a shortest path out of the
+        # DAG and find the Nodes that lose their shortest paths
+        affected = self._remove_lost_edges(G, touched_pairs, new_pred, cost)
+        for node_name in affected:
+            del new_dist[node_name]
+            del new_pred[node_name]
+
+        # 2. Settle the Nodes whose distance changes
+        settled = self._settle_changed_nodes(G, affected, touched_pairs, new_dist, cost)
+
+        # 3. Recompute the predecessors around the changes
+        recompute = self._recompute_predecessors(
+            G, affected | settled, touched_pairs, new_pred, new_dist, cost
+        )
+
+        repaired = SPFDag._from_parts(
+            self.source_node_name, new_pred, new_dist, ecmp_links
+        )
+        self._repair_ecmp_links(G, new_pred, changed_node_pairs, ecmp_links, cost)
+
+        changed = self._changed_destinations(
+            G, recompute | affected, touched_pairs, new_pred, new_dist, ecmp_links
+        )
+        return repaired, changed
+
+    @staticmethod
+    def _pair_cost_function(G):
+        """
+        Returns a function that gives the lowest edge cost from one Node to
+        another in G, or None if there is no edge; the costs are cached, so
+        the function must only be used while G does not change
+        """
+        pair_costs = {}
+
+        def cost(node_name, next_node_name):
+            try:
+                return pair_costs[(node_name, next_node_name)]
+            except KeyError:
+                pass
+            try:
+                edges = G[node_name][next_node_name]
+                pair_cost = min(edge["cost"] for edge in edges.values())
+            except KeyError:
+                pair_cost = None
+            pair_costs[(node_name, next_node_name)] = pair_cost
+            return pair_cost
+
+        return cost
+
+    def _remove_lost_edges(self, G, touched_pairs, new_pred, cost):
+        """
+        Takes the touched edges that are no longer on a shortest path out of
+        new_pred, along with the edges out of the Nodes that are left with
+        no predecessors, in place.
+
+        :return: set of the names of the Nodes that lost their shortest paths
+        """
+        dist = self.dist
+        affected = set()
+        nodes_to_visit = []
+        for node_name, next_node_name in touched_pairs:
+            pair_cost = cost(node_name, next_node_name)
+            if node_name in new_pred.get(next_node_name, ()) and (
+                pair_cost is None or dist[node_name] + pair_cost > dist[next_node_name]
+            ):
+                new_pred[next_node_name] = [
+                    predecessor
+                    for predecessor in new_pred[next_node_name]
+                    if predecessor != node_name
+                ]
+                if not new_pred[next_node_name]:
+                    affected.add(next_node_name)
+                    nodes_to_visit.append(next_node_name)
+        while nodes_to_visit:
+            node_name = nodes_to_visit.pop()
+            for successor in G.successors(node_name):
+                predecessors = new_pred.get(successor, ())
+                if node_name in predecessors:
+                    predecessors = [
+                        predecessor
+                        for predecessor in predecessors
+                        if predecessor != node_name
+                    ]
+                    new_pred[successor] = predecessors
+                    if not predecessors and successor not in affected:
+                        affected.add(successor)
+                        nodes_to_visit.append(successor)
+        return affected
+
+    @staticmethod
+    def _settle_changed_nodes(G, affected, touched_pairs, new_dist, cost):
+        """
+        Runs Dijkstra seeded from the unaffected Nodes next to the affected
+        Nodes and from the touched edges, updating new_dist in place.
+
+        :return: set of the names of the Nodes whose distance was settled
+        """
+        infinity = float("inf")
+        heap = []
+        for node_name in affected:
+            for predecessor in G.predecessors(node_name):
+                if predecessor in new_dist:
+                    heapq.heappush(
+                        heap,
+                        (
+                            new_dist[predecessor] + cost(predecessor, node_name),
+                            node_name,
+                        ),
+                    )
+        for node_name, next_node_name in touched_pairs:
+            pair_cost = cost(node_name, next_node_name)
+            if node_name in new_dist and pair_cost is not None:
+                heapq.heappush(heap, (new_dist[node_name] + pair_cost, next_node_name))
+
+        settled = set()
+        while heap:
+            node_dist, node_name = heapq.heappop(heap)
+            if node_dist >= new_dist.get(node_name, infinity):
+                continue
+            new_dist[node_name] = node_dist
+            settled.add(node_name)
+            for next_node_name in G.successors(node_name):
+                next_dist = node_dist + cost(node_name, next_node_name)
+                if next_dist < new_dist.get(next_node_name, infinity):
+                    heapq.heappush(heap, (next_dist, next_node_name))
+        return settled
+
+    def _recompute_predecessors(
+        self, G, changed_nodes, touched_pairs, new_pred, new_dist, cost
+    ):
+        """
+        Recomputes, in new_pred, the predecessors of the changed Nodes, their
+        successors and the far ends of the touched edges.
+
+        :return: set of the names of the Nodes whose predecessors were
+                 recomputed
+        """
+        recompute = set(changed_nodes)
+        for node_name in changed_nodes:
+            if node_name in G:
+                recompute.update(G.successors(node_name))
+        recompute.update(next_node_name for _, next_node_name in touched_pairs)
+        recompute.discard(self.source_node_name)
+        for node_name in recompute:
+            if node_name not in new_dist:
+                new_pred.pop(node_name, None)
+                continue
+            new_pred[node_name] = [
+                predecessor
+                for predecessor in G.predecessors(node_name)
+                if predecessor in new_dist
+                and new_dist[predecessor] + cost(predecessor, node_name)
+                == new_dist[node_name]
+            ]
+        return recompute
+
+    def _repair_ecmp_links(self, G, new_pred, changed_node_pairs, ecmp_links, cost):
+        """
+        Fills ecmp_links for the edges in new_pred, reusing the ECMP links of
+        self for the unchanged edges that were already in the DAG
+        """
+        pred = self.pred
+        for node_name, predecessors in new_pred.items():
+            for predecessor in predecessors:
+                pair = (predecessor, node_name)
+                if pair in ecmp_links:
+                    continue
+                if (
+                    predecessor in pred.get(node_name, ())
+                    and pair not in changed_node_pairs
+                ):
+                    # Unchanged edge that was already in the DAG
+                    ecmp_links[pair] = self._ecmp_links[pair]
+                else:
+                    min_cost = cost(predecessor, node_name)
+                    ecmp_links[pair] = [
+                        edge["interface"]
+                        for edge in G[predecessor][node_name].values()
+                        if edge["cost"] == min_cost
+                    ]
+
+    def _changed_destinations(
+        self, G, candidates, touched_pairs, new_pred, new_dist, ecmp_links
+    ):
+        """
+        Returns the names of the destinations whose shortest paths changed:
+        the candidate Nodes whose distance, predecessors or ECMP links
+        changed, and everything downstream of them in the repaired DAG
+        """
+        dist = self.dist
+        pred = self.pred
+        changed = {
+            node_name
+            for node_name in candidates
+            if new_dist.get(node_name) != dist.get(node_name)
+            or set(new_pred.get(node_name, ())) != set(pred.get(node_name, ()))
+        }
+        for node_name, next_node_name in touched_pairs:
+            if next_node_name in new_pred and node_name in new_pred[next_node_name]:
+                if ecmp_links[(node_name, next_node_name)] != self._ecmp_links.get(
+                    (node_name, next_node_name)
+                ):
+                    changed.add(next_node_name)
+
+        nodes_to_visit = list(changed)
+        while nodes_to_visit:
+            node_name = nodes_to_visit.pop()
+            if node_name not in G:
+                continue
+            for successor in G.successors(node_name):
+                if successor not in changed and node_name in new_pred.get(
+                    successor, ()
+                ):
+                    changed.add(successor)
+                    nodes_to_visit.append(successor)
+
+        return changed
+
+    @classmethod
+    def _from_parts(cls, source_node_name, pred, dist, ecmp_links):
+        """
+        Returns an SPFDag made from already computed predecessor lists,
+        distances and ECMP links
+        """
+        spf_dag = cls.__new__(cls)
+        spf_dag.source_node_name = source_node_name
+        spf_dag.pred = pred
+        spf_dag.dist = dist
+        spf_dag._ecmp_links = ecmp_links
+        return spf_dag
+
+
+class DagRoute(object):
+    """
+    Compact representation of all the shortest (ECMP) paths from the source
+    Node of an SPFDag to a destination Node.
+
+    A DagRoute only holds a reference to the SPFDag, which is shared by all
+    the routes from the same source Node, and the destination Node name.
+    The explicit paths are only built if they are requested, so IGP routed
+    Demands do not each need to carry a full list of their paths.
+
+    :param spf_dag: SPFDag rooted at the source Node
+    :param dest_node_name: name of the destination Node; must be reachable
+                           in spf_dag
+    """
+
+    __slots__ = ("spf_dag", "dest_node_name", "_paths")
+
+    def __init__(self, spf_dag, dest_node_name):
+        self.spf_dag = spf_dag
+        self.dest_node_name = dest_node_name
+        self._paths = None
+
+    def __repr__(self):
+        return "DagRoute(source = %s, dest = %s)" % (
+            self.spf_dag.source_node_name,
+            self.dest_node_name,
+        )
+
+    def paths(self):
+        """
+        Returns the explicit paths from source to destination, in the same
+        form as a Demand's path: each path is a list of Interfaces, with a
+        single Interface between each pair of Nodes.  The paths are built the
+        first time they are requested and reused after that.
+
+        :return: list of paths
+        """
+        if self._paths is None:
+            self._paths = []
+            for hops in self.spf_dag.interface_paths(self.dest_node_name):
+                self._paths.extend(list(path) for path in itertools.product(*hops))
+        return self._paths
+
+    def node_names(self):
+        """
+        Returns the names of the Nodes on any shortest path from source
+        to destination
+
+        :return: set of Node names
+        """
+        node_names = set(self.spf_dag.next_hops(self.dest_node_name))
+        node_names.add(self.dest_node_name)
+        return node_names
+
+    def interfaces(self):
+        """
+        Returns the Interfaces on any shortest path from source to destination
+
+        :return: set of Interfaces
+        """
+        return {
+            interface
+            for egress_interfaces in self.spf_dag.next_hops(
+                self.dest_node_name
+            ).values()
+            for interface in egress_interfaces
+        }
+
+    def interface_traffic(self, traffic):
+        """
+        Pushes traffic from source to destination along the SPFDag;
+        see SPFDag.interface_traffic
+
+        :param traffic: amount of traffic to push from source to destination
+        :return: dict with Interfaces as keys and traffic on each Interface as values
+        """
+        return self.spf_dag.interface_traffic(self.dest_node_name, traffic)
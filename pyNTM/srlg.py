@@ -23,7 +23,7 @@ class SRLG(object):
     def __init__(self, name, model, circuit_objects=set(), node_objects=set()):
         # self.circuit_objects = circuit_objects
         # self.node_objects = node_objects
-        if name in set([srlg.name for srlg in model.srlg_objects]):
+        if model.srlg_objects.lookup("name", name):
             raise ModelException(
                 "SRLG with name {} already exists in Model".format(name)
             )
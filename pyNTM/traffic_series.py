@@ -0,0 +1,146 @@
+"""Evaluation of a series of traffic matrices against a Model's routing"""
+
+import contextlib
+import io
+
+import numpy as np
+
+from .exceptions import ModelException
+
+
+def run_traffic_series(model, traffic, demand_keys=None):
+    """
+    Evaluates a series of traffic matrices (for example, one every five
+    minutes) against the routing from model's last simulation.  See
+    Model.evaluate_traffic_series for the returned data.
+
+    Demand routes do not depend on Demand traffic, so the Interface traffic
+    for every time step comes from one sparse product with the routing
+    matrix (see Model.routing_matrix).  The exception is the Demands that
+    ride RSVP LSPs when the Model has auto-bandwidth LSPs (LSPs with no
+    configured_setup_bandwidth), since the LSP reservations, and so the LSP
+    paths, follow the traffic: those Demands are rerouted with a full
+    update_simulation() on a copy of model for each distinct set of their
+    traffic values.
+
+    :param model: Model object, simulated with update_simulation()
+    :param traffic: 2-D array-like of Demand traffic, one row per Demand and
+                    one column per time step
+    :param demand_keys: Demand keys (source, dest, name) for the rows of
+                        traffic; defaults to the Demands in key order
+    :return: dict of traffic series results
+    """
+    routing_matrix = model.routing_matrix()
+
+    traffic = np.asarray(traffic, dtype=float)
+    if traffic.ndim != 2:
+        raise ModelException("traffic must be a 2-D array (demands x time steps)")
+    if demand_keys is None:
+        demand_keys = routing_matrix.demand_keys
+    if traffic.shape[0] != len(demand_keys):
+        raise ModelException(
+            "traffic has {} rows for {} demand keys".format(
+                traffic.shape[0], len(demand_keys)
+            )
+        )
+
+    # Traffic for every Demand in routing matrix row order; Demands that
+    # are not in demand_keys carry no traffic
+    try:
+        rows = [routing_matrix.demand_index[tuple(key)] for key in demand_keys]
+    except KeyError as key:
+        raise ModelException("demand {} is not in the model".format(key))
+    demand_traffic = np.zeros((len(routing_matrix.demand_keys), traffic.shape[1]))
+    demand_traffic[rows] = traffic
+
+    rerouted_rows = _traffic_dependent_rows(model, routing_matrix)
+    fixed_traffic = demand_traffic.copy()
+    fixed_traffic[rerouted_rows] = 0
+    interface_traffic = routing_matrix.interface_traffic(fixed_traffic)
+
+    if rerouted_rows:
+        interface_traffic += _rerouted_interface_traffic(
+            model, routing_matrix, demand_traffic, rerouted_rows
+        )
+
+    interfaces = [
+        model.interface_objects.lookup("key", interface_key)[0]
+        for interface_key in routing_matrix.interface_keys
+    ]
+    # The utilization is NaN for failed Interfaces
+    interface_state = model.interface_state
+    rows = interface_state.rows(interfaces)
+    utilization = interface_state.utilization(interface_traffic, rows)
+    failed = interface_state.view("failed")[rows].astype(bool)
+    peak_utilization = np.full(len(interfaces), np.nan)
+    p95_utilization = np.full(len(interfaces), np.nan)
+    if utilization.shape[1]:
+        peak_utilization[~failed] = utilization[~failed].max(axis=1)
+        p95_utilization[~failed] = np.percentile(utilization[~failed], 95, axis=1)
+
+    return {
+        "interfaces": routing_matrix.interface_keys,
+        "traffic": interface_traffic,
+        "utilization": utilization,
+        "peak_utilization": peak_utilization,
+        "p95_utilization": p95_utilization,
+        "rerouted_demands": [routing_matrix.demand_keys[row] for row in rerouted_rows],
+    }
+
+
+def _traffic_dependent_rows(model, routing_matrix):
+    """
+    Returns the routing matrix rows of the Demands whose routes can change
+    with the traffic: if model has an auto-bandwidth LSP, the Demands in
+    the parallel LSP groups and the Demands with LSPs on their paths
+
+    :return: sorted list of rows
+    """
+    if all(
+        lsp.configured_setup_bandwidth is not None for lsp in model.rsvp_lsp_objects
+    ):
+        return []
+
+    lsp_groups = {
+        (lsp.source_node_object.name, lsp.dest_node_object.name)
+        for lsp in model.rsvp_lsp_objects
+    }
+    demand_keys = set()
+    for demand in model.demand_objects:
+        if (demand.source_node_object.name, demand.dest_node_object.name) in lsp_groups:
+            demand_keys.add(demand._key)
+    for demands in model._get_routing_index()["lsp_demands"].values():
+        demand_keys.update(demand._key for demand in demands)
+
+    return sorted(routing_matrix.demand_index[key] for key in demand_keys)
+
+
+def _rerouted_interface_traffic(model, routing_matrix, demand_traffic, rerouted_rows):
+    """
+    Returns the Interface traffic from the Demands in rerouted_rows for each
+    time step, rerouting a copy of model with each step's traffic.  Steps
+    with the same traffic for those Demands share a reroute.
+    """
+    model_copy = model.fork()
+    demands = [
+        model_copy.demand_objects.lookup("key", demand_key)[0]
+        for demand_key in routing_matrix.demand_keys
+    ]
+
+    interface_traffic = np.zeros(
+        (len(routing_matrix.interface_keys), demand_traffic.shape[1])
+    )
+    step_routing = {}
+    for step in range(demand_traffic.shape[1]):
+        step_traffic = demand_traffic[:, step]
+        step_key = tuple(step_traffic[rerouted_rows])
+        if step_key not in step_routing:
+            for row in rerouted_rows:
+                demands[row].traffic = float(step_traffic[row])
+            with contextlib.redirect_stdout(io.StringIO()):
+                model_copy._run_simulation()
+            step_matrix = model_copy.routing_matrix().matrix[rerouted_rows]
+            step_routing[step_key] = step_matrix.T @ step_traffic[rerouted_rows]
+        interface_traffic[:, step] = step_routing[step_key]
+
+    return interface_traffic
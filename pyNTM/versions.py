@@ -0,0 +1,114 @@
+"""Version counters that track changes to the state of a Model"""
+
+
+class ModelVersions(object):
+    """
+    Monotonically increasing version counters for the parts of a Model that
+    routing results depend on:
+
+    - 'topology': Nodes and Interfaces added or removed, failed or unfailed
+    - 'metrics': Interface costs
+    - 'capacity': Interface capacity, rsvp_enabled and
+      percent_reservable_bandwidth
+    - 'demands': Demands added or removed and Demand traffic
+    - 'lsps': RSVP LSPs added or removed, LSP configured_setup_bandwidth and
+      manual_metric, and Node igp_shortcuts_enabled
+    - 'reservations': bandwidth reserved on the Interfaces by RSVP LSPs
+
+    The counters are bumped by the property setters of the Interfaces,
+    Nodes, Demands and RSVP LSPs in the Model and by the Model's object
+    sets when members are added or removed.  Other simulation results
+    (traffic, paths) are not versioned.
+
+    A result computed from the Model can be kept with key() for the
+    counters it depends on and reused for as long as key() returns the
+    same value, across calls and across update_simulation() runs.
+
+    Changes to Demand traffic and Interface capacity are also tracked by
+    object: the value before the first change since the last
+    pop_changes() is kept for each changed object.
+    """
+
+    kinds = ("topology", "metrics", "capacity", "demands", "lsps", "reservations")
+
+    # Kinds whose changes are tracked by object
+    tracked_kinds = ("capacity", "demands")
+
+    def __init__(self):
+        self._versions = dict.fromkeys(self.kinds, 0)
+        self._changes = {kind: {} for kind in self.tracked_kinds}
+
+    def __repr__(self):
+        return "ModelVersions(%s)" % ", ".join(
+            "%s = %s" % (kind, version) for kind, version in self._versions.items()
+        )
+
+    def __getitem__(self, kind):
+        return self._versions[kind]
+
+    def key(self, *kinds):
+        """
+        Returns the versions of kinds (all the kinds if none are given)
+
+        :param kinds: names of version counters
+        :return: tuple of versions
+        """
+        return tuple(self._versions[kind] for kind in kinds or self.kinds)
+
+    def bump(self, kind, model_object=None, old_value=None):
+        """
+        Increments the kind counter; if kind is tracked by object, also
+        keeps old_value for model_object unless model_object has already
+        changed since the last pop_changes()
+
+        :param kind: name of version counter
+        :param model_object: changed object
+        :param old_value: model_object's value before the change
+        :return: None
+        """
+        self._versions[kind] += 1
+        if model_object is not None and kind in self._changes:
+            self._changes[kind].setdefault(model_object, old_value)
+
+    def pop_changes(self, kind):
+        """
+        Returns the objects changed since the last pop_changes() for kind,
+        with their values before the first change, and forgets them
+
+        :param kind: 'capacity' or 'demands'
+        :return: dict of old values keyed by object
+        """
+        changes = self._changes[kind]
+        self._changes[kind] = {}
+        return changes
+
+    def clear_changes(self):
+        """Forgets the changes tracked by object for every kind"""
+        self._changes = {kind: {} for kind in self.tracked_kinds}
+
+
+class _Versioned(object):
+    """
+    Base for the objects held by a Model (Interface, Node, Demand, RSVP_LSP).
+    The ModelVersions of the Models whose object sets hold the object are
+    kept in a slot, outside the object's __dict__, so they do not take part
+    in equality comparisons.
+    """
+
+    __slots__ = ("_model_versions",)
+
+    def _bump_versions(self, kind, old_value=None):
+        for versions in getattr(self, "_model_versions", ()):
+            versions.bump(kind, self, old_value)
+
+    def _add_model_versions(self, versions):
+        model_versions = getattr(self, "_model_versions", ())
+        if versions not in model_versions:
+            self._model_versions = model_versions + (versions,)
+
+    def _remove_model_versions(self, versions):
+        self._model_versions = tuple(
+            model_versions
+            for model_versions in getattr(self, "_model_versions", ())
+            if model_versions is not versions
+        )
@@ -0,0 +1,72 @@
+import unittest
+from unittest import mock
+
+from pyNTM import Model
+
+
+class TestBatchEdit(unittest.TestCase):
+    def setUp(self):
+        self.model = Model.load_model_file("test/igp_routing_topology.csv")
+        self.model.update_simulation()
+
+    def _patch_validate_model(self):
+        return mock.patch.object(
+            self.model, "validate_model", wraps=self.model.validate_model
+        )
+
+    def test_validates_once_on_exit(self):
+        with self._patch_validate_model() as validate_model:
+            with self.model.batch_edit() as model:
+                self.assertIs(model, self.model)
+                self.model.add_demand("A", "B", 10, "dmd_a_b_1")
+                self.model.add_rsvp_lsp("A", "D", "lsp_a_d_1")
+                self.model.fail_interface("A-to-B", "A")
+                self.model.unfail_interface("A-to-B", "A")
+                self.assertEqual(validate_model.call_count, 0)
+            self.assertEqual(validate_model.call_count, 1)
+
+    def test_nested_blocks(self):
+        with self._patch_validate_model() as validate_model:
+            with self.model.batch_edit():
+                with self.model.batch_edit():
+                    self.model.add_demand("A", "B", 10, "dmd_a_b_1")
+                self.assertEqual(validate_model.call_count, 0)
+            self.assertEqual(validate_model.call_count, 1)
+
+    def test_no_edits(self):
+        with self._patch_validate_model() as validate_model:
+            with self.model.batch_edit():
+                pass
+            self.assertEqual(validate_model.call_count, 0)
+
+    def test_exception_skips_validation(self):
+        with self._patch_validate_model() as validate_model:
+            with self.assertRaises(KeyError):
+                with self.model.batch_edit():
+                    self.model.add_demand("A", "B", 10, "dmd_a_b_1")
+                    raise KeyError("abort")
+            self.assertEqual(validate_model.call_count, 0)
+
+            self.model.add_demand("A", "B", 10, "dmd_a_b_2")
+            self.assertEqual(validate_model.call_count, 1)
+
+    def test_update_simulation_in_block(self):
+        with self._patch_validate_model() as validate_model:
+            with self.model.batch_edit():
+                self.model.add_demand("A", "B", 10, "dmd_a_b_1")
+                self.model.update_simulation()
+                # Deferred validation, then update_simulation's own validation
+                self.assertEqual(validate_model.call_count, 2)
+            self.assertEqual(validate_model.call_count, 2)
+
+        dmd_a_b_1 = self.model.get_demand_object("A", "B", "dmd_a_b_1")
+        self.assertEqual(
+            [interface.name for interface in dmd_a_b_1.path[0]], ["A-to-B"]
+        )
+
+    def test_unfail_node_validates_once(self):
+        self.model.fail_node("A")
+        with self._patch_validate_model() as validate_model:
+            self.model.unfail_node("A")
+            self.assertEqual(validate_model.call_count, 1)
+        self.assertEqual(self.model.get_failed_interface_objects(), [])
@@ -0,0 +1,133 @@
+import unittest
+
+from pyNTM import Model
+from pyNTM import ModelException
+from pyNTM import Node
+
+
+class TestBulkAdd(unittest.TestCase):
+    def setUp(self):
+        self.model = Model.load_model_file("test/igp_routing_topology.csv")
+        self.model.update_simulation()
+
+    def test_add_demands(self):
+        self.model.add_demands(
+            [
+                ("A", "B", 10, "dmd_a_b_1"),
+                ("A", "B"),
+                {"source_node_name": "C", "dest_node_name": "D", "traffic": 5},
+            ]
+        )
+        self.assertEqual(
+            self.model.get_demand_object("A", "B", "dmd_a_b_1").traffic, 10
+        )
+        self.assertEqual(self.model.get_demand_object("A", "B").traffic, 0)
+        self.assertEqual(self.model.get_demand_object("C", "D").traffic, 5)
+
+        self.model.update_simulation()
+        self.assertEqual(
+            self.model.get_demand_object("C", "D").path[0][0].name, "C-to-D"
+        )
+
+    def test_add_demands_bad_rows(self):
+        demand_count = len(self.model.demand_objects)
+
+        with self.assertRaises(ModelException) as context:
+            self.model.add_demands(
+                [
+                    ("A", "B", 10, "dmd_a_b_1"),
+                    ("A", "Y", 10, "dmd_a_y_1"),
+                    ("A", "F", 40, "dmd_a_f_1"),
+                    ("A", "B", 20, "dmd_a_b_1"),
+                    ("A",),
+                ]
+            )
+
+        message, bad_rows = context.exception.args[0]
+        self.assertEqual(message, "4 rows could not be added, see returned data")
+        self.assertEqual([bad_row["row"] for bad_row in bad_rows], [1, 2, 3, 4])
+        self.assertEqual(bad_rows[1]["data"], ("A", "F", 40, "dmd_a_f_1"))
+        self.assertIn("already exists in demand_objects", bad_rows[1]["error"])
+        self.assertEqual(len(self.model.demand_objects), demand_count)
+        with self.assertRaises(ModelException):
+            self.model.get_demand_object("A", "B", "dmd_a_b_1")
+
+    def test_add_rsvp_lsps(self):
+        self.model.add_rsvp_lsps(
+            [
+                ("A", "D", "lsp_a_d_1"),
+                {"source_node_name": "A", "dest_node_name": "D", "name": "lsp_a_d_2"},
+            ]
+        )
+        self.model.update_simulation()
+        self.assertEqual(
+            self.model.get_rsvp_lsp("A", "D", "lsp_a_d_2")
+            .path["interfaces"][0]
+            .node_object.name,
+            "A",
+        )
+
+        with self.assertRaises(ModelException) as context:
+            self.model.add_rsvp_lsps([("A", "D", "lsp_a_d_1"), ("A", "D", "lsp_a_d_3")])
+        self.assertEqual([row["row"] for row in context.exception.args[0][1]], [0])
+        with self.assertRaises(ModelException):
+            self.model.get_rsvp_lsp("A", "D", "lsp_a_d_3")
+
+    def test_add_nodes(self):
+        node_x = Node("X")
+        self.model.add_nodes([node_x, ("Y", 10, 20), {"name": "Z", "lon": 5}])
+        self.assertIs(self.model.get_node_object("X"), node_x)
+        self.assertEqual(self.model.get_node_object("Y").lon, 20)
+        self.assertEqual(self.model.get_node_object("Z").lon, 5)
+
+        with self.assertRaises(ModelException) as context:
+            self.model.add_nodes(["W", "A", Node("W"), ("V", "bad lat")])
+        self.assertEqual(
+            [row["row"] for row in context.exception.args[0][1]], [1, 2, 3]
+        )
+        with self.assertRaises(ModelException):
+            self.model.get_node_object("W")
+
+    def test_add_circuits(self):
+        node_a = self.model.get_node_object("A")
+        node_f = self.model.get_node_object("F")
+        self.model.add_circuits(
+            [
+                (node_a, node_f, "A-to-F", "F-to-A"),
+                {
+                    "node_a_object": node_a,
+                    "node_b_object": node_f,
+                    "node_a_interface_name": "A-to-F_2",
+                    "node_b_interface_name": "F-to-A_2",
+                    "capacity": 100,
+                },
+            ]
+        )
+
+        circuit_1 = self.model.get_circuit_object_from_interface("A-to-F", "A")
+        circuit_2 = self.model.get_circuit_object_from_interface("A-to-F_2", "A")
+        self.assertNotEqual(
+            circuit_1.interface_a.circuit_id, circuit_2.interface_a.circuit_id
+        )
+        self.assertEqual(circuit_2.interface_a.capacity, 100)
+
+    def test_add_circuits_bad_rows(self):
+        node_a = self.model.get_node_object("A")
+        node_f = self.model.get_node_object("F")
+        interface_count = len(self.model.interface_objects)
+
+        with self.assertRaises(ModelException) as context:
+            self.model.add_circuits(
+                [
+                    (node_a, node_f, "A-to-F", "F-to-A", 1, 1, 100, False, 100),
+                    (node_a, node_f, "A-to-F_2", "F-to-A_2", 1, 1, 100, False, 100),
+                    (node_a, node_f, "A-to-B", "F-to-A_3"),
+                ]
+            )
+
+        bad_rows = context.exception.args[0][1]
+        self.assertEqual([bad_row["row"] for bad_row in bad_rows], [1, 2])
+        self.assertEqual(
+            bad_rows[0]["error"], "circuit_id value 100 is already exists in model"
+        )
+        self.assertEqual(len(self.model.interface_objects), interface_count)
@@ -0,0 +1,92 @@
+import random
+import unittest
+
+from pyNTM import Model
+from pyNTM.cspf import CSPF
+
+
+class TestCSPF(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.model = Model.load_model_file(
+            "test/parallel_link_model_test_topology_igp_only.csv"
+        )
+        self.model.update_simulation()
+        self.cspf = CSPF(self.model._sync_routing_graph(), self.model.interface_state)
+
+    def _interface_names(self, path):
+        return [interface.name for interface in path]
+
+    def _candidate_paths(self, source, dest, needed_bw, fewest_hops=True):
+        paths = self.model.get_shortest_path(source, dest, needed_bw)["path"]
+        if fewest_hops and paths:
+            fewest = min(len(path) for path in paths)
+            paths = [path for path in paths if len(path) == fewest]
+        return sorted(self._interface_names(path) for path in paths)
+
+    def test_paths_are_lowest_cost_fewest_hops(self):
+        random.seed(0)
+        node_names = sorted(node.name for node in self.model.node_objects)
+        for source in node_names:
+            for dest in node_names:
+                if source == dest:
+                    continue
+                candidates = self._candidate_paths(source, dest, 0)
+                path = self.cspf.find_path(source, dest, 0)
+                if not candidates:
+                    self.assertIsNone(path)
+                    continue
+                self.assertIn(self._interface_names(path), candidates)
+
+    def test_random_choice_covers_all_paths(self):
+        random.seed(0)
+        candidates = self._candidate_paths("A", "E", 0, fewest_hops=False)
+        self.assertEqual(len(candidates), 6)
+        chosen = {
+            tuple(
+                self._interface_names(
+                    self.cspf.find_path("A", "E", 0, fewest_hops=False)
+                )
+            )
+            for _ in range(200)
+        }
+        self.assertEqual(sorted(list(path) for path in chosen), candidates)
+
+    def test_needed_bandwidth(self):
+        # A-to-B_2 only has 50 reservable; A-to-B has 100
+        random.seed(0)
+        for _ in range(20):
+            path = self.cspf.find_path("A", "E", 60)
+            self.assertEqual(path[0].name, "A-to-B")
+        self.assertIsNone(self.cspf.find_path("A", "E", 500))
+
+    def test_residual_bandwidth_and_credit(self):
+        cspf = CSPF(self.model._sync_routing_graph(), self.model.interface_state)
+        int_a_b = self.model.get_interface_object("A-to-B", "A")
+        self.assertEqual(cspf.find_path("A", "E", 60)[0], int_a_b)
+        int_a_b.reserved_bandwidth = 90
+        try:
+            # The reservation is read from the Interface state as it is made
+            self.assertNotEqual(cspf.find_path("A", "E", 60)[0], int_a_b)
+            self.assertEqual(
+                cspf.find_path("A", "E", 60, credit={int_a_b: 90})[0], int_a_b
+            )
+        finally:
+            int_a_b.reserved_bandwidth = 0
+        self.assertEqual(cspf.find_path("A", "E", 60)[0], int_a_b)
+
+    def test_lsps_routed_with_bandwidth(self):
+        model = Model.load_model_file("test/parallel_link_model_w_lsps.csv")
+        model.update_simulation()
+        for lsp in model.rsvp_lsp_objects:
+            if lsp.path == "Unrouted":
+                continue
+            interfaces = lsp.path["interfaces"]
+            self.assertEqual(
+                interfaces[0].node_object.name, lsp.source_node_object.name
+            )
+            self.assertEqual(
+                interfaces[-1].remote_node_object.name, lsp.dest_node_object.name
+            )
+            for interface in interfaces:
+                self.assertGreaterEqual(interface.reservable_bandwidth, 0)
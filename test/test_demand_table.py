@@ -0,0 +1,107 @@
+import unittest
+
+from pyNTM import Model
+from pyNTM import ModelException
+from pyNTM.demand_table import DemandTable
+
+
+class TestDemandTable(unittest.TestCase):
+    def setUp(self):
+        # The same Model with its Demands as objects and in a demand table
+        self.model = Model.load_model_file("test/model_test_topology.csv")
+        self.table_model = Model.load_model_file("test/model_test_topology.csv")
+        self.table = DemandTable.from_demands(self.table_model.demand_objects)
+        self.table_model.demand_objects = set()
+        self.table_model.set_demand_table(self.table)
+
+    def _assert_same_routing(self):
+        for interface in self.model.interface_objects:
+            self.assertAlmostEqual(
+                interface.traffic,
+                self.table_model.get_interface_object(*interface._key).traffic,
+                places=1,
+            )
+        for lsp in self.model.rsvp_lsp_objects:
+            self.assertEqual(
+                lsp.reserved_bandwidth,
+                self.table_model.get_rsvp_lsp(*lsp._key).reserved_bandwidth,
+            )
+
+    def test_rows(self):
+        table = DemandTable.from_rows([("A", "B", 10, "x"), ("B", "A"), ("A", "B")])
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.key(1), ("B", "A", "none"))
+        self.assertEqual(table.find("A", "B"), 2)
+        self.assertEqual(table.pair_traffic(), [("A", "B", 10.0), ("B", "A", 0.0)])
+        self.assertEqual(table.pair_rows([("A", "B")]).tolist(), [0, 2])
+        with self.assertRaises(ModelException):
+            table.find("A", "B", "y")
+        with self.assertRaises(ModelException):
+            DemandTable.from_rows([("A", "B", -1)])
+
+    def test_routing_matches_demand_objects(self):
+        self.model.update_simulation()
+        self.table_model.update_simulation()
+        self._assert_same_routing()
+
+        self.model.load_propagation = "dag"
+        self.table_model.load_propagation = "dag"
+        self.model.fail_interface("A-to-B", "A")
+        self.table_model.fail_interface("A-to-B", "A")
+        self.model.update_simulation()
+        self.table_model.update_simulation()
+        self._assert_same_routing()
+
+    def test_table_traffic_edit(self):
+        self.table.traffic[self.table.find("A", "F", "dmd_a_f_1")] = 60
+        self.model.set_demand_traffic("A", "F", "dmd_a_f_1", 60)
+        self.model.update_simulation()
+        self.table_model.update_simulation()
+        self._assert_same_routing()
+
+    def test_get_table_demand(self):
+        self.model.update_simulation()
+        self.table_model.update_simulation()
+        for demand in self.model.demand_objects:
+            table_demand = self.table_model.get_table_demand(*demand._key)
+            self.assertEqual(table_demand._key, demand._key)
+            self.assertEqual(table_demand.traffic, demand.traffic)
+            self.assertEqual(
+                sorted([item._key for item in path] for path in table_demand.path),
+                sorted([item._key for item in path] for path in demand.path),
+            )
+            self.assertEqual(
+                sorted(
+                    path_info["path_traffic"]
+                    for path_info in table_demand.path_detail.values()
+                ),
+                sorted(
+                    path_info["path_traffic"]
+                    for path_info in demand.path_detail.values()
+                ),
+            )
+        with self.assertRaises(ModelException):
+            self.table_model.get_table_demand("A", "D", "no_such_demand")
+
+    def test_unrouted_rows(self):
+        self.table_model.fail_node("F")
+        self.table_model.update_simulation()
+        self.assertEqual(
+            sorted(
+                self.table.key(row)
+                for row in self.table_model.get_unrouted_demand_table_rows()
+            ),
+            [("A", "F", "dmd_a_f_1"), ("F", "E", "dmd_f_e_1")],
+        )
+        self.assertEqual(
+            self.table_model.get_table_demand("F", "E", "dmd_f_e_1").path, "Unrouted"
+        )
+
+    def test_bad_table(self):
+        with self.assertRaises(ModelException):
+            self.model.set_demand_table(DemandTable.from_rows([("A", "Z", 10)]))
+        with self.assertRaises(ModelException):
+            self.model.set_demand_table(
+                DemandTable.from_rows([("A", "B", 10), ("A", "B", 20)])
+            )
+        self.assertIsNone(self.model.demand_table)
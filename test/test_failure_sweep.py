@@ -0,0 +1,89 @@
+import unittest
+
+from pyNTM import Model
+
+
+class TestFailureSweep(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.model = Model.load_model_file("test/model_test_topology.csv")
+        self.model.update_simulation()
+        self.model.add_srlg("srlg_1")
+        self.model.get_node_object("B").add_to_srlg("srlg_1", self.model)
+        self.model.update_simulation()
+        self.sweep = self.model.failure_sweep(max_workers=1)
+
+    def _utilization(self):
+        return [
+            (
+                None
+                if self.model.get_interface_object(*interface_key).failed
+                else self.model.get_interface_object(*interface_key).utilization
+            )
+            for interface_key in self.sweep["interfaces"]
+        ]
+
+    def test_scenarios(self):
+        failures = [scenario["failure"] for scenario in self.sweep["scenarios"]]
+        self.assertEqual(
+            len(failures),
+            len(self.model.circuit_objects)
+            + len(self.model.node_objects)
+            + len(self.model.srlg_objects),
+        )
+        self.assertEqual(failures[-1], ("srlg", "srlg_1"))
+        self.assertIn(("node", "A"), failures)
+
+    def test_scenarios_match_serial_failures(self):
+        for scenario in self.sweep["scenarios"]:
+            failure_type, name = scenario["failure"]
+            if failure_type == "circuit":
+                self.model.fail_interface(*name[0])
+            elif failure_type == "node":
+                self.model.fail_node(name)
+            else:
+                self.model.fail_srlg(name)
+            self.model.update_simulation()
+
+            self.assertEqual(scenario["utilization"], self._utilization())
+            self.assertEqual(
+                scenario["unrouted_demands"],
+                sorted(
+                    demand._key for demand in self.model.get_unrouted_demand_objects()
+                ),
+            )
+
+            if failure_type == "circuit":
+                self.model.unfail_interface(*name[0])
+            elif failure_type == "node":
+                self.model.unfail_node(name)
+            else:
+                self.model.unfail_srlg(name)
+        self.model.update_simulation()
+
+    def test_worst_case_utilization(self):
+        for position, interface_key in enumerate(self.sweep["interfaces"]):
+            worst_case = self.sweep["worst_case_utilization"][interface_key]
+            self.assertEqual(
+                worst_case["utilization"],
+                max(
+                    scenario["utilization"][position]
+                    for scenario in self.sweep["scenarios"]
+                    if scenario["utilization"][position] is not None
+                ),
+            )
+
+    def test_model_not_changed(self):
+        self.assertEqual(self.model.get_failed_interface_objects(), [])
+        self.assertEqual(self.model.get_failed_node_objects(), [])
+
+    def test_process_pool(self):
+        sweep = self.model.failure_sweep(max_workers=2, per_scenario_utilization=False)
+        self.assertEqual(
+            sweep["worst_case_utilization"], self.sweep["worst_case_utilization"]
+        )
+        self.assertEqual(
+            [scenario["failure"] for scenario in sweep["scenarios"]],
+            [scenario["failure"] for scenario in self.sweep["scenarios"]],
+        )
+        self.assertNotIn("utilization", sweep["scenarios"][0])
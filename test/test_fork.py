@@ -0,0 +1,87 @@
+import unittest
+from unittest import mock
+
+from pyNTM import Model
+
+
+class TestFork(unittest.TestCase):
+    def setUp(self):
+        self.model = Model.load_model_file("test/model_test_topology.csv")
+        self.model.update_simulation()
+
+    def _traffic(self, model):
+        return {
+            interface._key: interface.traffic for interface in model.interface_objects
+        }
+
+    def test_fork_is_independent(self):
+        traffic = self._traffic(self.model)
+        fork = self.model.fork()
+        self.assertEqual(self._traffic(fork), traffic)
+
+        fork.add_demand("A", "B", 10, "dmd_a_b_1")
+        fork.get_demand_object("A", "F", "dmd_a_f_1").traffic = 60
+        fork.fail_interface("A-to-B", "A")
+        fork.update_simulation()
+
+        self.assertFalse(self.model.get_interface_object("A-to-B", "A").failed)
+        self.assertEqual(
+            self.model.get_demand_object("A", "F", "dmd_a_f_1").traffic, 40
+        )
+        self.assertEqual(len(self.model.demand_objects), 4)
+        self.assertEqual(self._traffic(self.model), traffic)
+        self.assertNotEqual(self._traffic(fork), traffic)
+
+    def test_fork_objects(self):
+        fork = self.model.fork()
+        interfaces = {id(interface) for interface in fork.interface_objects}
+        lsps = {id(lsp) for lsp in fork.rsvp_lsp_objects}
+        for interface in fork.interface_objects:
+            self.assertIs(
+                interface.node_object, fork.get_node_object(interface.node_object.name)
+            )
+        for lsp in fork.rsvp_lsp_objects:
+            if lsp.path == "Unrouted":
+                continue
+            for interface in lsp.path["interfaces"]:
+                self.assertIn(id(interface), interfaces)
+        for demand in fork.demand_objects:
+            for path in demand.path:
+                for item in path:
+                    self.assertIn(id(item), interfaces | lsps)
+
+        # The shortest path DAGs are shared
+        self.assertIs(fork._spf_dags["A"].pred, self.model._spf_dags["A"].pred)
+
+        # Changes to the fork's objects only bump the fork's versions
+        before = self.model.versions.key()
+        fork.get_interface_object("A-to-B", "A").cost = 100
+        self.assertEqual(self.model.versions.key(), before)
+        self.assertGreater(fork.versions["metrics"], before[1])
+
+    def test_srlg(self):
+        self.model.add_srlg("srlg_1")
+        self.model.get_node_object("B").add_to_srlg("srlg_1", self.model)
+        fork = self.model.fork()
+        fork.fail_srlg("srlg_1")
+        self.assertTrue(fork.get_node_object("B").failed)
+        self.assertFalse(self.model.get_node_object("B").failed)
+
+    def test_incremental_update_on_fork(self):
+        self.model.load_propagation = "dag"
+        self.model.rsvp_lsp_objects = set()
+        self.model.update_simulation()
+        fork = self.model.fork()
+        fork.fail_interface("A-to-B", "A")
+        fork.set_demand_traffic("A", "D", "dmd_a_d_1", 20)
+        with mock.patch.object(fork, "_route_demands") as route_demands:
+            fork.update_simulation(incremental=True)
+            route_demands.assert_not_called()
+
+        traffic = self._traffic(fork)
+        fork.update_simulation()
+        for key, interface_traffic in self._traffic(fork).items():
+            if interface_traffic == "Down":
+                self.assertEqual(traffic[key], "Down")
+            else:
+                self.assertAlmostEqual(traffic[key], interface_traffic)
@@ -0,0 +1,289 @@
+import unittest
+from unittest import mock
+
+from pyNTM import Model
+
+
+class TestIncrementalUpdate(unittest.TestCase):
+    def setUp(self):
+        self.model = Model.load_model_file(
+            "test/parallel_link_model_test_topology_igp_only.csv"
+        )
+        self.model.update_simulation()
+
+    def _state(self):
+        traffic = {
+            interface._key: interface.traffic
+            for interface in self.model.interface_objects
+        }
+        paths = {
+            demand._key: (
+                demand.path
+                if demand.path == "Unrouted"
+                else sorted(
+                    [interface._key for interface in path] for path in demand.path
+                )
+            )
+            for demand in self.model.demand_objects
+        }
+        return traffic, paths
+
+    def _assert_matches_full_update(self):
+        traffic, paths = self._state()
+        self.model.update_simulation()
+        full_traffic, full_paths = self._state()
+
+        self.assertEqual(paths, full_paths)
+        self.assertEqual(traffic.keys(), full_traffic.keys())
+        for interface_key, interface_traffic in full_traffic.items():
+            if interface_traffic == "Down":
+                self.assertEqual(traffic[interface_key], "Down")
+            else:
+                self.assertAlmostEqual(traffic[interface_key], interface_traffic)
+
+    def _assert_each_circuit_failure_matches(self):
+        for circuit in sorted(self.model.circuit_objects, key=lambda ckt: ckt._key()):
+            interface_name, node_name = circuit._key()[0]
+            self.model.fail_interface(interface_name, node_name)
+            with mock.patch.object(self.model, "_route_lsps") as route_lsps:
+                self.model.update_simulation(incremental=True)
+                route_lsps.assert_not_called()
+            self._assert_matches_full_update()
+
+            self.model.unfail_interface(interface_name, node_name)
+            self.model.update_simulation()
+
+    def test_circuit_failures_paths(self):
+        self._assert_each_circuit_failure_matches()
+
+    def test_circuit_failures_dag(self):
+        self.model.load_propagation = "dag"
+        self.model.update_simulation()
+        self._assert_each_circuit_failure_matches()
+
+    def test_successive_failures(self):
+        self.model.fail_interface("A-to-B", "A")
+        self.model.update_simulation(incremental=True)
+        self.model.fail_node("G")
+        self.model.update_simulation(incremental=True)
+        self.model.fail_interface("B-to-D", "B")
+        self.model.update_simulation(incremental=True)
+        self._assert_matches_full_update()
+
+    def test_failure_outside_routing_graph(self):
+        # A-to-D has more reserved than reservable bandwidth, so it is not
+        # in the routing graph
+        self.model = Model.load_model_file("test/traffic_eng_test_model.csv")
+        self.model.update_simulation()
+        self.assertLess(
+            self.model.get_interface_object("A-to-D", "A").reservable_bandwidth, 0
+        )
+        self.model.fail_interface("A-to-D", "A")
+        self.model.update_simulation(incremental=True)
+        self.assertEqual(self.model.get_interface_object("A-to-D", "A").traffic, "Down")
+        self._assert_matches_full_update()
+
+        self.model.update_simulation()
+        self.model.unfail_interface("A-to-D", "A")
+        self.model.update_simulation(incremental=True)
+        self.assertEqual(self.model.get_interface_object("A-to-D", "A").traffic, 0)
+        self._assert_matches_full_update()
+
+    def test_unfail(self):
+        self.model.fail_node("B")
+        self.model.update_simulation()
+        with mock.patch.object(self.model, "_route_lsps") as route_lsps:
+            self.model.unfail_node("B")
+            self.model.update_simulation(incremental=True)
+            route_lsps.assert_not_called()
+        self._assert_matches_full_update()
+
+    def test_cost_changes(self):
+        for cost in (1, 8, 20, 4):
+            for interface_name, node_name in (("A-to-B", "A"), ("B-to-E_2", "B")):
+                with mock.patch.object(self.model, "_route_lsps") as route_lsps:
+                    interface = self.model.set_interface_cost(
+                        interface_name, node_name, cost, update=True
+                    )
+                    route_lsps.assert_not_called()
+                self.assertEqual(interface.cost, cost)
+                self._assert_matches_full_update()
+
+    def test_changes_synced_before_update(self):
+        # get_shortest_path syncs the routing graph before the update does
+        self.model.set_interface_cost("A-to-B", "A", 100)
+        self.model.fail_interface("B-to-D", "B")
+        self.model.get_shortest_path("A", "D")
+        self.model.set_interface_cost("A-to-B", "A", 20)
+        self.model.update_simulation(incremental=True)
+        self._assert_matches_full_update()
+
+    def test_mixed_changes_dag(self):
+        self.model.load_propagation = "dag"
+        self.model.update_simulation()
+        self.model.fail_interface("A-to-C", "A", update=True)
+        self.model.set_interface_cost("B-to-D", "B", 1)
+        self.model.set_interface_cost("A-to-D", "A", 2, update=True)
+        self.model.unfail_interface("A-to-C", "A", update=True)
+        self.model.fail_interface("B-to-D_2", "B", update=True)
+        self._assert_matches_full_update()
+
+    def test_lsp_model_unfail_falls_back_to_full_update(self):
+        self.model = Model.load_model_file("test/model_test_topology.csv")
+        self.model.fail_interface("A-to-B", "A")
+        self.model.update_simulation()
+        self.model.unfail_interface("A-to-B", "A")
+        with mock.patch.object(
+            self.model, "_route_lsps", wraps=self.model._route_lsps
+        ) as route_lsps:
+            self.model.update_simulation(incremental=True)
+            route_lsps.assert_called_once()
+
+    def test_new_demand_falls_back_to_full_update(self):
+        self.model.add_demand("A", "E", 10, "dmd_a_e_incremental")
+        self.model.fail_interface("A-to-B", "A")
+        self.model.update_simulation(incremental=True)
+        self.assertTrue(
+            self.model.get_demand_object("A", "E", "dmd_a_e_incremental")._is_routed()
+        )
+        self._assert_matches_full_update()
+
+    def _assert_lsp_failures_resignal_incrementally(self, model_file):
+        self.model = Model.load_model_file(model_file)
+        self.model.update_simulation()
+        for circuit in sorted(self.model.circuit_objects, key=lambda ckt: ckt._key()):
+            lsp_paths = {lsp: lsp.path for lsp in self.model.rsvp_lsp_objects}
+            interface_name, node_name = circuit._key()[0]
+            self.model.fail_interface(interface_name, node_name)
+            with mock.patch.object(self.model, "_route_lsps") as route_lsps:
+                self.model.update_simulation(incremental=True)
+                route_lsps.assert_not_called()
+
+            # LSPs in groups without a broken LSP keep their paths
+            interfaces = set(circuit.get_circuit_interfaces(self.model))
+            touched_groups = {
+                (lsp.source_node_object, lsp.dest_node_object)
+                for lsp, path in lsp_paths.items()
+                if path != "Unrouted" and not interfaces.isdisjoint(path["interfaces"])
+            }
+            for lsp, path in lsp_paths.items():
+                if (lsp.source_node_object, lsp.dest_node_object) in touched_groups:
+                    if lsp.path != "Unrouted":
+                        self.assertTrue(interfaces.isdisjoint(lsp.path["interfaces"]))
+                else:
+                    self.assertIs(lsp.path, path)
+
+            # Reservations add up; Interface traffic matches the LSP paths
+            self.model.validate_model()
+            traffic, paths = self._state()
+            self.model._route_demands(self.model)
+            self.assertEqual(paths, self._state()[1])
+            for interface_key, interface_traffic in self._state()[0].items():
+                if interface_traffic == "Down":
+                    self.assertEqual(traffic[interface_key], "Down")
+                else:
+                    self.assertAlmostEqual(traffic[interface_key], interface_traffic)
+
+            self.model.unfail_interface(interface_name, node_name)
+            self.model.update_simulation()
+
+    def test_lsp_failures(self):
+        self._assert_lsp_failures_resignal_incrementally("test/model_test_topology.csv")
+
+    def test_lsp_failures_parallel_links(self):
+        self._assert_lsp_failures_resignal_incrementally(
+            "test/parallel_link_model_w_lsps.csv"
+        )
+
+    def _assert_traffic_edits_are_load_only(self):
+        for traffic in (0, 35, 120.5):
+            for demand in sorted(self.model.demand_objects, key=lambda dmd: dmd._key):
+                with mock.patch.object(self.model, "_route_demand") as route_demand:
+                    self.model.set_demand_traffic(
+                        *demand._key, traffic=traffic, update=True
+                    )
+                    route_demand.assert_not_called()
+                self.assertEqual(demand.traffic, traffic)
+            self._assert_matches_full_update()
+
+    def test_demand_traffic_edits_paths(self):
+        self.model.fail_interface("A-to-B", "A")
+        self.model.update_simulation()
+        self._assert_traffic_edits_are_load_only()
+
+    def test_demand_traffic_edits_dag(self):
+        self.model.load_propagation = "dag"
+        self.model.update_simulation()
+        self._assert_traffic_edits_are_load_only()
+
+    def test_bad_demand_traffic(self):
+        with self.assertRaises(ValueError):
+            self.model.set_demand_traffic("A", "B", "dmd_a_b_1", -1)
+
+    def test_configured_setup_bandwidth_lsp_traffic_edits(self):
+        self.model = Model.load_model_file("test/model_test_topology.csv")
+        for lsp in self.model.rsvp_lsp_objects:
+            lsp.configured_setup_bandwidth = 10
+        self.model.update_simulation()
+        lsp_paths = {lsp: lsp.path for lsp in self.model.rsvp_lsp_objects}
+
+        with mock.patch.object(self.model, "_route_demand") as route_demand:
+            self.model.set_demand_traffic("A", "D", "dmd_a_d_1", 20, update=True)
+            route_demand.assert_not_called()
+        for lsp, path in lsp_paths.items():
+            self.assertIs(lsp.path, path)
+        self._assert_matches_full_update()
+
+    def test_auto_bandwidth_lsp_traffic_edits(self):
+        self.model = Model.load_model_file("test/model_test_topology.csv")
+        self.model.update_simulation()
+        lsp_f_e_1 = self.model.get_rsvp_lsp("F", "E", "lsp_f_e_1")
+        lsp_paths = {lsp: lsp.path for lsp in self.model.rsvp_lsp_objects}
+
+        with mock.patch.object(self.model, "_route_lsps") as route_lsps:
+            self.model.set_demand_traffic("A", "D", "dmd_a_d_1", 40)
+            self.model.set_demand_traffic("A", "D", "dmd_a_d_2", 20, update=True)
+            route_lsps.assert_not_called()
+
+        # Only the A-D group is re-signaled, for the new traffic
+        for lsp, path in lsp_paths.items():
+            if lsp.source_node_object.name == "A":
+                self.assertEqual(lsp.reserved_bandwidth, 30)
+            else:
+                self.assertIs(lsp.path, path)
+        self.assertEqual(lsp_f_e_1.path, "Unrouted")
+        self.model.validate_model()
+        self._assert_matches_full_update()
+
+    def test_capacity_edits(self):
+        interface = self.model.set_interface_capacity("A-to-B", "A", 50, update=True)
+        remote_interface = interface.get_remote_interface(self.model)
+        self.assertEqual(remote_interface.capacity, 50)
+        self.assertAlmostEqual(interface.utilization, interface.traffic / 50 * 100)
+        self._assert_matches_full_update()
+
+    def test_capacity_edit_resignals_overbooked_lsps(self):
+        self.model = Model.load_model_file("test/model_test_topology.csv")
+        self.model.update_simulation()
+        lsp_a_d_1 = self.model.get_rsvp_lsp("A", "D", "lsp_a_d_1")
+        interface = lsp_a_d_1.path["interfaces"][0]
+
+        with mock.patch.object(self.model, "_route_lsps") as route_lsps:
+            self.model.set_interface_capacity(
+                interface.name, interface.node_object.name, 50, update=True
+            )
+            route_lsps.assert_not_called()
+
+        self.assertGreaterEqual(interface.reservable_bandwidth, 0)
+        self.model.validate_model()
+        self._assert_matches_full_update()
+
+    def test_capacity_increase_with_unrouted_lsp_falls_back_to_full_update(self):
+        self.model = Model.load_model_file("test/model_test_topology.csv")
+        self.model.update_simulation()
+        self.model.set_interface_capacity("A-to-E", "A", 1000)
+        with mock.patch.object(
+            self.model, "_route_lsps", wraps=self.model._route_lsps
+        ) as route_lsps:
+            self.model.update_simulation(incremental=True)
+            route_lsps.assert_called_once()
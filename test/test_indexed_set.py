@@ -0,0 +1,119 @@
+import pickle
+import unittest
+
+from pyNTM import Model
+from pyNTM import ModelException
+from pyNTM import Node
+from pyNTM.indexed_set import NodeSet
+
+
+class TestIndexedSet(unittest.TestCase):
+    def test_add_remove(self):
+        node_a = Node("A")
+        node_b = Node("B")
+        nodes = NodeSet([node_a])
+        self.assertEqual(nodes.lookup("name", "A"), [node_a])
+
+        nodes.add(node_b)
+        self.assertEqual(nodes.lookup("name", "B"), [node_b])
+
+        nodes.remove(node_a)
+        self.assertEqual(nodes.lookup("name", "A"), [])
+
+        nodes.discard(node_b)
+        nodes.discard(node_b)
+        self.assertEqual(nodes.lookup("name", "B"), [])
+        self.assertEqual(len(nodes), 0)
+
+    def test_pop(self):
+        nodes = NodeSet([Node("A")])
+        nodes.lookup("name", "A")
+        nodes.pop()
+        self.assertEqual(nodes.lookup("name", "A"), [])
+
+    def test_bulk_operations_rebuild_indexes(self):
+        node_a = Node("A")
+        node_b = Node("B")
+        nodes = NodeSet([node_a])
+        nodes.lookup("name", "A")
+
+        nodes |= {node_b}
+        self.assertEqual(nodes.lookup("name", "B"), [node_b])
+
+        nodes -= {node_a}
+        self.assertEqual(nodes.lookup("name", "A"), [])
+
+        nodes.update([node_a])
+        self.assertEqual(nodes.lookup("name", "A"), [node_a])
+
+        nodes.clear()
+        self.assertEqual(nodes.lookup("name", "A"), [])
+
+    def test_set_operations_return_plain_sets(self):
+        nodes = NodeSet([Node("A")])
+        self.assertIs(type(nodes | {Node("B")}), set)
+
+    def test_pickle(self):
+        nodes = NodeSet([Node("A")])
+        nodes.lookup("name", "A")
+        unpickled_nodes = pickle.loads(pickle.dumps(nodes))
+        self.assertIsInstance(unpickled_nodes, NodeSet)
+        self.assertEqual(
+            [node.name for node in unpickled_nodes.lookup("name", "A")], ["A"]
+        )
+
+
+class TestModelIndexes(unittest.TestCase):
+    def setUp(self):
+        self.model = Model.load_model_file("test/igp_routing_topology.csv")
+        self.model.update_simulation()
+
+    def test_assigned_sets_are_indexed(self):
+        self.model.demand_objects = set()
+        self.model.add_demand("A", "B", 10, "dmd_a_b")
+        self.assertEqual(
+            self.model.get_demand_object("A", "B", "dmd_a_b")._key,
+            ("A", "B", "dmd_a_b"),
+        )
+
+    def test_direct_set_changes(self):
+        node_z = Node("Z")
+        self.model.node_objects.add(node_z)
+        self.assertIs(self.model.get_node_object("Z"), node_z)
+
+        self.model.node_objects.remove(node_z)
+        with self.assertRaises(ModelException):
+            self.model.get_node_object("Z")
+
+    def test_node_interfaces(self):
+        node_a = self.model.get_node_object("A")
+        self.assertEqual(
+            sorted(interface.name for interface in node_a.interfaces(self.model)),
+            ["A-to-B", "A-to-C", "A-to-D", "A-to-E"],
+        )
+
+    def test_change_interface_name_reindexes(self):
+        interface = self.model.get_interface_object("A-to-B", "A")
+        circuit = self.model.get_circuit_object_from_interface("A-to-B", "A")
+
+        self.model.change_interface_name("A", "A-to-B", "A-to-B-changed")
+
+        self.assertIs(self.model.get_interface_object("A-to-B-changed", "A"), interface)
+        self.assertIn(interface, self.model.interface_objects)
+        self.assertIs(
+            self.model.get_circuit_object_from_interface("A-to-B-changed", "A"),
+            circuit,
+        )
+        with self.assertRaises(ModelException):
+            self.model.get_interface_object("A-to-B", "A")
+
+    def test_get_remote_interface(self):
+        interface = self.model.get_interface_object("A-to-B", "A")
+        self.assertEqual(
+            interface.get_remote_interface(self.model),
+            self.model.get_interface_object("B-to-A", "B"),
+        )
+
+    def test_get_interface_object_from_nodes(self):
+        interfaces = self.model.get_interface_object_from_nodes("A", "B")
+        self.assertEqual([interface.name for interface in interfaces], ["A-to-B"])
@@ -0,0 +1,139 @@
+import math
+import pickle
+import unittest
+
+from pyNTM import Interface
+from pyNTM import Model
+from pyNTM import ModelException
+from pyNTM import Node
+
+
+class TestInterfaceState(unittest.TestCase):
+    def setUp(self):
+        self.model = Model.load_model_file("test/traffic_eng_test_model.csv")
+        self.model.update_simulation()
+
+    def test_columns_match_interfaces(self):
+        interface_state = self.model.interface_state
+        for interface in self.model.interface_objects:
+            self.assertIs(interface._state, interface_state)
+            row = interface._row
+            self.assertIs(interface_state.interfaces[row], interface)
+            self.assertEqual(interface_state.capacity[row], interface.capacity)
+            self.assertEqual(interface_state.cost[row], interface.cost)
+            self.assertEqual(
+                interface_state.reservable_bandwidth[row],
+                interface.reservable_bandwidth,
+            )
+            self.assertEqual(
+                interface_state.traffic[row],
+                0.0 if interface.traffic == "Down" else interface.traffic,
+            )
+            self.assertEqual(
+                round(interface_state.reserved_bandwidth[row], 1),
+                interface.reserved_bandwidth,
+            )
+
+    def test_utilization(self):
+        int_a_b = self.model.get_interface_object("A-to-B", "A")
+        self.model.fail_interface("A-to-B", "A")
+        self.model.update_simulation()
+        interface_state = self.model.interface_state
+        utilization = interface_state.utilization()
+        for interface in self.model.interface_objects:
+            if interface.failed:
+                self.assertTrue(math.isnan(utilization[interface._row]))
+            else:
+                self.assertAlmostEqual(
+                    utilization[interface._row], interface.utilization
+                )
+        self.assertTrue(math.isnan(utilization[int_a_b._row]))
+        self.assertEqual(int_a_b.traffic, "Down")
+
+    def test_usable_matches_routing_graph(self):
+        self.model.fail_interface("A-to-B", "A")
+        self.model._sync_routing_graph()
+        interface_state = self.model.interface_state
+        usable = {
+            interface_state.interfaces[row]
+            for row, is_usable in enumerate(interface_state.usable())
+            if is_usable
+        }
+        self.assertEqual(usable, set(self.model._routing_graph_edges))
+
+    def test_loaded_interfaces_made_in_model_state(self):
+        model = Model.load_model_file("test/traffic_eng_test_model.csv")
+        interface_state = model._interface_state
+        self.assertEqual(len(interface_state), len(model.interface_objects))
+        self.assertEqual(interface_state._free_rows, [])
+        for interface in model.interface_objects:
+            self.assertIs(interface._state, interface_state)
+
+    def test_duplicate_circuit_leaves_no_rows(self):
+        interface_state = self.model.interface_state
+        rows = len(interface_state) - len(interface_state._free_rows)
+        node_a = self.model.get_node_object("A")
+        node_b = self.model.get_node_object("B")
+        with self.assertRaises(ModelException):
+            self.model.add_circuit(node_a, node_b, "A-to-B", "B-to-A_new", 5, 5, 300)
+        with self.assertRaises(ModelException):
+            self.model.add_circuit(node_a, node_b, "A-to-B_new", "B-to-A", 5, 5, 0)
+        self.assertEqual(len(interface_state) - len(interface_state._free_rows), rows)
+
+    def test_interfaces_added_and_removed(self):
+        interface_state = self.model.interface_state
+        node_a = self.model.get_node_object("A")
+        node_z = Node("Z")
+        self.model.add_node(node_z)
+        self.model.add_circuit(node_a, node_z, "A-to-Z", "Z-to-A", 5, 5, 300)
+        int_a_z = self.model.get_interface_object("A-to-Z", "A")
+        self.assertIs(int_a_z._state, interface_state)
+        self.assertEqual(interface_state.capacity[int_a_z._row], 300)
+
+        self.model.interface_objects.remove(int_a_z)
+        self.assertIsNot(int_a_z._state, interface_state)
+        self.assertEqual(int_a_z.capacity, 300)
+        self.assertEqual(int_a_z.cost, 5)
+
+    def test_standalone_interface(self):
+        interface = Interface("A-to-B", 4, 100, Node("A"), Node("B"), 1)
+        interface.reserved_bandwidth = 25
+        self.assertEqual(len(interface._state), 1)
+        self.assertEqual(interface.reservable_bandwidth, 75)
+        self.assertEqual(interface.capacity, 100)
+        self.assertIs(type(interface.capacity), int)
+
+    def test_reserved_bandwidth_keeps_type(self):
+        interface = Interface("A-to-B", 4, 100, Node("A"), Node("B"), 1)
+        self.assertIs(type(interface.reserved_bandwidth), float)
+        interface.reserved_bandwidth = 25
+        self.assertIs(type(interface.reserved_bandwidth), int)
+        interface.reserved_bandwidth = 25.25
+        self.assertEqual(interface.reserved_bandwidth, 25.2)
+
+        # Interfaces without LSPs have int 0 reserved after a simulation
+        for interface in self.model.interface_objects:
+            if not interface.lsps(self.model):
+                self.assertEqual(interface.reserved_bandwidth, 0)
+                self.assertIs(type(interface.reserved_bandwidth), int)
+
+    def test_fork_is_independent(self):
+        fork = self.model.fork()
+        self.assertIsNot(fork.interface_state, self.model.interface_state)
+        fork.get_interface_object("A-to-B", "A").capacity = 10
+        self.assertNotEqual(self.model.get_interface_object("A-to-B", "A").capacity, 10)
+        for interface in fork.interface_objects:
+            self.assertIs(interface._state, fork.interface_state)
+
+    def test_pickle(self):
+        model = pickle.loads(pickle.dumps(self.model))
+        interface_state = model.interface_state
+        for interface in model.interface_objects:
+            self.assertIs(interface._state, interface_state)
+            original = self.model.get_interface_object(
+                interface.name, interface.node_object.name
+            )
+            self.assertEqual(interface.traffic, original.traffic)
+            self.assertEqual(
+                interface.reservable_bandwidth, original.reservable_bandwidth
+            )
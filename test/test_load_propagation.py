@@ -0,0 +1,124 @@
+import random
+import unittest
+
+from pyNTM import Model
+from pyNTM import ModelException
+from pyNTM import Node
+
+
+class TestDAGLoadPropagation(unittest.TestCase):
+    model_files = [
+        "test/igp_routing_topology.csv",
+        "test/parallel_link_model_test_topology_igp_only.csv",
+        "test/parallel_link_model_test_topology.csv",
+        "test/model_test_topology.csv",
+        "test/igp_shortcuts_model_mult_lsps_in_path_parallel_links.csv",
+        "test/traffic_eng_test_parallel_link_model.csv",
+    ]
+
+    def _interface_traffic(self, model_file, load_propagation):
+        model = Model.load_model_file(model_file)
+        model.load_propagation = load_propagation
+        random.seed(1)
+        model.update_simulation()
+        return model, {
+            interface._key: interface.traffic for interface in model.interface_objects
+        }
+
+    def test_dag_matches_paths(self):
+        for model_file in self.model_files:
+            _, paths_traffic = self._interface_traffic(model_file, "paths")
+            _, dag_traffic = self._interface_traffic(model_file, "dag")
+            self.assertEqual(set(paths_traffic), set(dag_traffic))
+            for key, traffic in paths_traffic.items():
+                self.assertAlmostEqual(traffic, dag_traffic[key], places=6)
+
+    def test_dag_path_detail_built_on_request(self):
+        paths_model, _ = self._interface_traffic(
+            "test/igp_routing_topology.csv", "paths"
+        )
+        dag_model, _ = self._interface_traffic("test/igp_routing_topology.csv", "dag")
+
+        paths_dmd = paths_model.get_demand_object("A", "F", "dmd_a_f_1")
+        dag_dmd = dag_model.get_demand_object("A", "F", "dmd_a_f_1")
+
+        self.assertIsNone(dag_dmd._path_detail)
+        self.assertEqual(
+            [
+                (
+                    [intf._key for intf in info["items"]],
+                    info["path_traffic"],
+                )
+                for info in dag_dmd.path_detail.values()
+            ],
+            [
+                (
+                    [intf._key for intf in info["items"]],
+                    info["path_traffic"],
+                )
+                for info in paths_dmd.path_detail.values()
+            ],
+        )
+
+    def test_dag_route_path_built_on_request(self):
+        model = Model.load_model_file("test/igp_routing_topology.csv")
+        model.load_propagation = "dag"
+        model.update_simulation()
+        dmd = model.get_demand_object("A", "F", "dmd_a_f_1")
+        int_a_b = model.get_interface_object("A-to-B", "A")
+
+        # The path is only a reference to the shared DAG until it is read
+        self.assertIsNone(dmd._path)
+        self.assertIsNotNone(dmd._dag_route)
+        self.assertIn(dmd, int_a_b.demands(model))
+        self.assertEqual(model.get_unrouted_demand_objects(), [])
+        self.assertIsNone(dmd._path)
+
+        self.assertEqual(dmd.path, dmd._dag_route.paths())
+        self.assertEqual(len(dmd.path), 3)
+
+        # Setting the path drops the DAG reference
+        dmd.path = "Unrouted"
+        self.assertIsNone(dmd._dag_route)
+        self.assertEqual(model.get_unrouted_demand_objects(), [dmd])
+
+    def test_demands_share_dag_route(self):
+        model = Model.load_model_file("test/igp_routing_topology.csv")
+        model.add_demand("A", "F", 10, "dmd_a_f_2")
+        model.update_simulation()
+        dmd_1 = model.get_demand_object("A", "F", "dmd_a_f_1")
+        dmd_2 = model.get_demand_object("A", "F", "dmd_a_f_2")
+        self.assertIs(dmd_1._dag_route, dmd_2._dag_route)
+
+    def test_parallel_link_fabric(self):
+        # 4 hops of 8 parallel links; 8**4 = 4096 distinct paths
+        model = Model(set(), set(), set(), set())
+        model.load_propagation = "dag"
+        node_names = ["A", "B", "C", "D", "E"]
+        for node_name in node_names:
+            model.add_node(Node(node_name))
+        for hop in range(len(node_names) - 1):
+            node_a = model.get_node_object(node_names[hop])
+            node_b = model.get_node_object(node_names[hop + 1])
+            for link in range(8):
+                model.add_circuit(
+                    node_a,
+                    node_b,
+                    "{}-{}_{}".format(node_a.name, node_b.name, link),
+                    "{}-{}_{}".format(node_b.name, node_a.name, link),
+                    capacity=100,
+                )
+        model.add_demand("A", "E", 80, "dmd_a_e")
+        model.update_simulation()
+
+        for interface in model.interface_objects:
+            if interface.node_object.name < interface.remote_node_object.name:
+                self.assertAlmostEqual(interface.traffic, 10.0)
+            else:
+                self.assertEqual(interface.traffic, 0.0)
+
+    def test_bad_load_propagation(self):
+        model = Model.load_model_file("test/igp_routing_topology.csv")
+        model.load_propagation = "foo"
+        with self.assertRaises(ModelException):
+            model.update_simulation()
@@ -0,0 +1,93 @@
+import contextlib
+import io
+import unittest
+
+from pyNTM import Model
+from pyNTM import ModelException
+
+
+INTERFACES_TABLE = [
+    "INTERFACES_TABLE",
+    "node_object_name\tremote_node_object_name\tname\tcost\tcapacity\tcircuit_id",
+    "A\tB\tA-to-B\t10\t100\t1",
+    "B\tA\tB-to-A\t10\t100\t1",
+    "",
+]
+NODES_TABLE = ["NODES_TABLE", "name\tlon\tlat", "A\t50\t0", "C\t0\t25", ""]
+DEMANDS_TABLE = [
+    "DEMANDS_TABLE",
+    "source\tdest\ttraffic\tname",
+    "A\tB\t10\tdmd_a_b_1",
+    "A\tB\t20\tdmd_a_b_1",
+    "",
+]
+
+
+class TestModelFile(unittest.TestCase):
+    def _read_model_data(self, lines):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            model_data = Model._read_model_data(lines)
+        return model_data, output.getvalue()
+
+    def test_file_and_lines_match(self):
+        model = Model.load_model_file("test/model_test_topology.csv")
+        with open("test/model_test_topology.csv", encoding="utf-8-sig") as f:
+            lines = f.read().splitlines()
+        interface_set, node_set, demand_set, lsp_set = Model._read_model_data(lines)
+
+        self.assertEqual(
+            {interface._key for interface in interface_set},
+            {interface._key for interface in model.interface_objects},
+        )
+        self.assertEqual(
+            {(node.name, node.lat, node.lon) for node in node_set},
+            {(node.name, node.lat, node.lon) for node in model.node_objects},
+        )
+        self.assertEqual(
+            {demand._key for demand in demand_set},
+            {demand._key for demand in model.demand_objects},
+        )
+        self.assertEqual(
+            {lsp._key for lsp in lsp_set},
+            {lsp._key for lsp in model.rsvp_lsp_objects},
+        )
+
+    def test_duplicate_demand_line_index(self):
+        (interface_set, node_set, demand_set, lsp_set), output = self._read_model_data(
+            INTERFACES_TABLE + NODES_TABLE + DEMANDS_TABLE
+        )
+        self.assertEqual(len(demand_set), 1)
+        self.assertEqual(next(iter(demand_set)).traffic, 10)
+        self.assertIn("already exists in model; disregarding line 13", output)
+        self.assertIn("RSVP_LSP_TABLE not in file", output)
+
+    def test_tables_out_of_order(self):
+        (interface_set, node_set, demand_set, lsp_set), output = self._read_model_data(
+            DEMANDS_TABLE + NODES_TABLE + INTERFACES_TABLE
+        )
+        self.assertEqual(len(interface_set), 2)
+        self.assertEqual(sorted(node.name for node in node_set), ["A", "B", "C"])
+        self.assertEqual(len(demand_set), 1)
+        self.assertIn("already exists in model; disregarding line 3", output)
+
+    def test_circuit_id_check_before_row_errors(self):
+        lines = INTERFACES_TABLE[:3] + ["B\tA"] + NODES_TABLE + DEMANDS_TABLE
+        with self.assertRaises(ModelException) as context:
+            self._read_model_data(lines)
+        self.assertIn(
+            "Each circuit_id value must appear exactly twice", context.exception.args[0]
+        )
+
+        lines = INTERFACES_TABLE[:4] + ["C\tA"] + NODES_TABLE + DEMANDS_TABLE
+        with self.assertRaises(ModelException) as context:
+            self._read_model_data(lines)
+        self.assertIn(
+            "must be defined for line C\tA, line index 4",
+            context.exception.args[0],
+        )
+
+    def test_missing_table(self):
+        with self.assertRaises(ValueError) as context:
+            self._read_model_data(INTERFACES_TABLE + DEMANDS_TABLE)
+        self.assertEqual(context.exception.args[0], "'NODES_TABLE' is not in list")
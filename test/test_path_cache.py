@@ -0,0 +1,66 @@
+import unittest
+from unittest import mock
+
+from pyNTM import Model
+from pyNTM.path_cache import PathCache
+from pyNTM.spf import SPFDag
+
+
+class TestPathCache(unittest.TestCase):
+    def test_lru(self):
+        cache = PathCache(maxsize=2)
+        self.assertEqual(cache.get("a", 1, lambda: "A"), "A")
+        self.assertEqual(cache.get("b", 1, lambda: "B"), "B")
+        self.assertEqual(cache.get("a", 1, lambda: "new A"), "A")
+        # 'b' is the least recently used entry
+        cache.get("c", 1, lambda: "C")
+        self.assertEqual(cache.get("b", 1, lambda: "new B"), "new B")
+        self.assertEqual(
+            cache.info(), {"hits": 1, "misses": 4, "size": 2, "maxsize": 2}
+        )
+
+    def test_stale_version(self):
+        cache = PathCache()
+        cache.get("a", 1, lambda: "A")
+        self.assertEqual(cache.get("a", 2, lambda: "new A"), "new A")
+        self.assertEqual(cache.get("a", 2, lambda: "newer A"), "new A")
+        self.assertEqual(len(cache), 1)
+
+
+class TestModelPathCache(unittest.TestCase):
+    def setUp(self):
+        self.model = Model.load_model_file("test/model_test_topology.csv")
+        self.model.update_simulation()
+
+    def test_get_shortest_path(self):
+        shortest_path = self.model.get_shortest_path("A", "D")
+        hits = self.model.path_cache_info()["hits"]
+        self.assertEqual(self.model.get_shortest_path("A", "D"), shortest_path)
+        self.assertEqual(self.model.path_cache_info()["hits"], hits + 1)
+
+        # Changing a result does not change the cache
+        shortest_path["path"][0].pop()
+        self.assertNotEqual(self.model.get_shortest_path("A", "D"), shortest_path)
+
+        # A topology change makes the cached paths stale
+        self.model.fail_interface("A-to-D", "A")
+        misses = self.model.path_cache_info()["misses"]
+        self.assertEqual(self.model.get_shortest_path("A", "D")["cost"], 40)
+        self.assertGreater(self.model.path_cache_info()["misses"], misses)
+
+    def test_bandwidth_constrained_paths(self):
+        self.assertEqual(self.model.get_shortest_path("A", "D", 40)["cost"], 40)
+
+        # More reserved bandwidth leaves no 40 unit path through B
+        self.model.get_interface_object("A-to-B", "A").reserved_bandwidth += 20
+        self.assertEqual(self.model.get_shortest_path("A", "D", 40)["cost"], 60)
+
+    def test_spf_dags_shared_across_simulations(self):
+        with mock.patch("pyNTM.model.SPFDag", wraps=SPFDag) as spf_dag:
+            self.model.update_simulation()
+            self.model.get_shortest_path("A", "F")
+            spf_dag.assert_not_called()
+
+            self.model.set_interface_cost("A-to-B", "A", 5)
+            self.model.update_simulation()
+            spf_dag.assert_called()
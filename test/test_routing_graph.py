@@ -0,0 +1,78 @@
+import unittest
+
+from pyNTM import Model
+
+
+class TestRoutingGraph(unittest.TestCase):
+    def setUp(self):
+        self.model = Model.load_model_file("test/igp_routing_topology.csv")
+        self.model.update_simulation()
+
+    def _graph_edges(self, G):
+        return {
+            (node_name, remote_node_name, data["interface"], data["cost"])
+            for node_name, remote_node_name, data in G.edges(data=True)
+        }
+
+    def _assert_graph_current(self):
+        G = self.model._sync_routing_graph()
+        self.assertEqual(
+            self._graph_edges(G),
+            self._graph_edges(
+                self.model._make_weighted_network_graph_mdg(
+                    include_failed_circuits=False
+                )
+            ),
+        )
+
+    def test_graph_matches_built_graph(self):
+        self._assert_graph_current()
+
+    def test_fail_unfail_interface_in_place(self):
+        G = self.model._routing_graph
+        int_a_b = self.model.get_interface_object("A-to-B", "A")
+
+        self.model.fail_interface("A-to-B", "A")
+        self.model.update_simulation()
+        self.assertIs(self.model._routing_graph, G)
+        self.assertNotIn(int_a_b, self.model._routing_graph_edges)
+        self._assert_graph_current()
+
+        self.model.unfail_interface("A-to-B", "A")
+        self.model.update_simulation()
+        self.assertIs(self.model._routing_graph, G)
+        self.assertIn(int_a_b, self.model._routing_graph_edges)
+        self._assert_graph_current()
+
+    def test_cost_change(self):
+        int_a_b = self.model.get_interface_object("A-to-B", "A")
+        int_a_b.cost = 1000
+        self._assert_graph_current()
+        self.assertEqual(self.model._routing_graph["A"]["B"][int_a_b]["cost"], 1000)
+
+        self.model.update_simulation()
+        self.assertEqual(int_a_b.traffic, 0.0)
+
+    def test_interface_removed(self):
+        int_a_b = self.model.get_interface_object("A-to-B", "A")
+        self.model.interface_objects.remove(int_a_b)
+        self._assert_graph_current()
+        self.assertNotIn(int_a_b, self.model._routing_graph_edges)
+
+    def test_change_interface_name(self):
+        self.model.change_interface_name("A", "A-to-B", "A-to-B-changed")
+        self._assert_graph_current()
+        int_a_b = self.model.get_interface_object("A-to-B-changed", "A")
+        self.assertIn(int_a_b, self.model._routing_graph["A"]["B"])
+
+    def test_get_shortest_path_needed_bw(self):
+        # A-to-D has 20 units of capacity
+        self.assertEqual(self.model.get_shortest_path("A", "D")["cost"], 40)
+        shortest_path = self.model.get_shortest_path("A", "D", needed_bw=50)
+        self.assertEqual(shortest_path["cost"], 40)
+        self.assertEqual(
+            sorted(
+                [interface.name for interface in path] for path in shortest_path["path"]
+            ),
+            [["A-to-B", "B-to-D"], ["A-to-B", "B-to-G", "G-to-D"]],
+        )
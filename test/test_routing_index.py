@@ -0,0 +1,100 @@
+import unittest
+
+from pyNTM import FlexModel, RSVP_LSP
+
+
+class TestRoutingIndex(unittest.TestCase):
+    def _load_model(self, model_file, load_propagation="paths"):
+        model = FlexModel.load_model_file(model_file)
+        model.load_propagation = load_propagation
+        model.update_simulation()
+        return model
+
+    def _path_interfaces(self, path):
+        for item in path:
+            if isinstance(item, RSVP_LSP):
+                yield from item.path["interfaces"]
+            else:
+                yield item
+
+    def _assert_matches_scan(self, model):
+        routed_demands = [
+            demand for demand in model.demand_objects if demand._is_routed()
+        ]
+        routed_lsps = [lsp for lsp in model.rsvp_lsp_objects if lsp.path != "Unrouted"]
+
+        for interface in model.interface_objects:
+            self.assertEqual(
+                set(interface.demands(model)),
+                {
+                    demand
+                    for demand in routed_demands
+                    if any(
+                        interface in self._path_interfaces(path) for path in demand.path
+                    )
+                },
+            )
+            self.assertEqual(
+                set(interface.lsps(model)),
+                {lsp for lsp in routed_lsps if interface in lsp.path["interfaces"]},
+            )
+            if not interface.failed:
+                self.assertAlmostEqual(
+                    sum(interface.demand_traffic(model).values()), interface.traffic
+                )
+
+        for lsp in model.rsvp_lsp_objects:
+            self.assertEqual(
+                set(lsp.demands_on_lsp(model)),
+                {
+                    demand
+                    for demand in routed_demands
+                    if any(lsp in path for path in demand.path)
+                },
+            )
+
+    def test_igp_only(self):
+        for load_propagation in ("paths", "dag"):
+            model = self._load_model(
+                "test/parallel_link_model_test_topology_igp_only.csv", load_propagation
+            )
+            model.fail_interface("A-to-B", "A")
+            model.update_simulation()
+            self._assert_matches_scan(model)
+
+    def test_lsps(self):
+        for load_propagation in ("paths", "dag"):
+            model = self._load_model("test/model_test_topology.csv", load_propagation)
+            self._assert_matches_scan(model)
+
+    def test_igp_shortcuts(self):
+        model = self._load_model("test/igp_shortcuts_model_mult_lsps_in_path.csv")
+        self._assert_matches_scan(model)
+        lsp_b_d_1 = model.get_rsvp_lsp("B", "D", "lsp_b_d_1")
+        lsp_d_f_1 = model.get_rsvp_lsp("D", "F", "lsp_d_f_1")
+        self.assertEqual(lsp_b_d_1.traffic_on_lsp(model), 2.5)
+        self.assertEqual(lsp_d_f_1.traffic_on_lsp(model), 13.0)
+
+    def test_index_follows_update_simulation(self):
+        model = self._load_model("test/model_test_topology.csv")
+        interface = model.get_interface_object("A-to-B", "A")
+        self.assertNotEqual(interface.demands(model), [])
+        model.fail_interface("A-to-B", "A")
+        model.update_simulation()
+        self.assertEqual(interface.demands(model), [])
+        self.assertEqual(interface.lsps(model), [])
+
+    def test_index_follows_removed_objects(self):
+        model = self._load_model("test/model_test_topology.csv")
+        lsp = model.get_rsvp_lsp("A", "D", "lsp_a_d_1")
+        interface = lsp.path["interfaces"][0]
+        demand = lsp.demands_on_lsp(model)[0]
+        self.assertIn(demand, interface.demands(model))
+        self.assertIn(lsp, interface.lsps(model))
+
+        model.demand_objects.remove(demand)
+        self.assertNotIn(demand, interface.demands(model))
+        self.assertNotIn(demand, lsp.demands_on_lsp(model))
+
+        model.rsvp_lsp_objects.remove(lsp)
+        self.assertNotIn(lsp, interface.lsps(model))
@@ -0,0 +1,82 @@
+import io
+import unittest
+
+import numpy as np
+
+from pyNTM import FlexModel
+from pyNTM.routing_matrix import RoutingMatrix
+
+
+class TestRoutingMatrix(unittest.TestCase):
+    def _load_model(self, model_file, load_propagation="paths"):
+        model = FlexModel.load_model_file(model_file)
+        model.load_propagation = load_propagation
+        model.update_simulation()
+        return model
+
+    def _assert_reproduces_interface_traffic(self, model, places=7):
+        routing_matrix = model.routing_matrix()
+        interface_traffic = routing_matrix.interface_traffic(
+            routing_matrix.traffic_vector(model)
+        )
+        for interface in model.interface_objects:
+            column = routing_matrix.interface_index[interface._key]
+            if interface.failed:
+                self.assertEqual(interface_traffic[column], 0)
+            else:
+                self.assertAlmostEqual(
+                    interface_traffic[column], interface.traffic, places=places
+                )
+        return routing_matrix
+
+    def test_igp_only(self):
+        for load_propagation in ("paths", "dag"):
+            model = self._load_model(
+                "test/parallel_link_model_test_topology_igp_only.csv", load_propagation
+            )
+            model.fail_interface("A-to-B", "A")
+            model.update_simulation()
+            self._assert_reproduces_interface_traffic(model)
+
+    def test_lsps(self):
+        model = self._load_model("test/model_test_topology.csv")
+        routing_matrix = self._assert_reproduces_interface_traffic(model, places=3)
+
+        # dmd_a_d_1 splits evenly over two LSPs from A to D
+        row = routing_matrix.demand_index[("A", "D", "dmd_a_d_1")]
+        self.assertAlmostEqual(routing_matrix.matrix[row].sum(), 2.0)
+
+    def test_igp_shortcuts(self):
+        model = self._load_model("test/igp_shortcuts_model_mult_lsps_in_path.csv")
+        self._assert_reproduces_interface_traffic(model, places=1)
+
+    def test_unrouted_demand(self):
+        model = self._load_model("test/model_test_topology.csv")
+        model.fail_node("E")
+        model.update_simulation()
+        routing_matrix = model.routing_matrix()
+        for demand in model.get_unrouted_demand_objects():
+            row = routing_matrix.demand_index[demand._key]
+            self.assertEqual(routing_matrix.matrix[row].nnz, 0)
+
+    def test_traffic_matrices(self):
+        model = self._load_model("test/parallel_link_model_test_topology_igp_only.csv")
+        routing_matrix = model.routing_matrix()
+        traffic = routing_matrix.traffic_vector(model)
+        interface_traffic = routing_matrix.interface_traffic(
+            np.column_stack([traffic, 2 * traffic])
+        )
+        self.assertEqual(interface_traffic.shape, (len(model.interface_objects), 2))
+        np.testing.assert_allclose(interface_traffic[:, 1], 2 * interface_traffic[:, 0])
+
+    def test_save_load(self):
+        model = self._load_model("test/model_test_topology.csv")
+        routing_matrix = model.routing_matrix()
+        npz_file = io.BytesIO()
+        routing_matrix.save(npz_file)
+        npz_file.seek(0)
+        loaded = RoutingMatrix.load(npz_file)
+
+        self.assertEqual(loaded.demand_keys, routing_matrix.demand_keys)
+        self.assertEqual(loaded.interface_keys, routing_matrix.interface_keys)
+        self.assertEqual((loaded.matrix != routing_matrix.matrix).nnz, 0)
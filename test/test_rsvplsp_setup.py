@@ -1,8 +1,10 @@
 import unittest
+from unittest import mock
 
 from pyNTM import RSVP_LSP
 from pyNTM import PerformanceModel
 from pyNTM import ModelException
+from pyNTM.spf import SPFDag
 
 
 class TestRSVPLSPInitial(unittest.TestCase):
@@ -28,6 +30,41 @@ class TestRSVPLSPInitial(unittest.TestCase):
     def test_lsp_effective_metric_value(self):
         self.assertEqual(40.0, self.lsp_a_d_1.effective_metric(self.model))
 
+    def test_lsp_effective_metrics_set_together(self):
+        # The simulation fills every routed LSP's metric, with one SPF per
+        # LSP source node
+        routed_lsps = [
+            lsp for lsp in self.model.rsvp_lsp_objects if lsp.path != "Unrouted"
+        ]
+        for lsp in routed_lsps:
+            self.assertIsNotNone(lsp._cached_effective_metric)
+            lsp.clear_effective_metric_cache()
+
+        lsp_sources = {lsp.source_node_object.name for lsp in routed_lsps}
+        self.model._path_cache.clear()
+        with mock.patch("pyNTM.model.SPFDag", wraps=SPFDag) as spf_dag:
+            self.assertEqual(40.0, self.lsp_a_d_1.effective_metric(self.model))
+            self.assertEqual(spf_dag.call_count, len(lsp_sources))
+
+        for lsp in routed_lsps:
+            self.assertEqual(
+                lsp._cached_effective_metric,
+                self.model._get_shortest_path(
+                    lsp.source_node_object.name, lsp.dest_node_object.name
+                )["cost"],
+            )
+
+    def test_lsp_effective_metric_follows_cost_changes(self):
+        model = PerformanceModel.load_model_file("test/model_test_topology.csv")
+        model.update_simulation()
+        lsp_a_d_1 = model.get_rsvp_lsp("A", "D", "lsp_a_d_1")
+        self.assertEqual(40.0, lsp_a_d_1.effective_metric(model))
+
+        # No update_simulation() after the cost change
+        for interface in model.get_node_object("A").interfaces(model):
+            model.set_interface_cost(interface.name, "A", interface.cost + 5)
+        self.assertEqual(45.0, lsp_a_d_1.effective_metric(model))
+
     def test_lsp_repr(self):
         self.assertEqual(
             repr(self.lsp_a_d_1),
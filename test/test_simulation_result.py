@@ -0,0 +1,95 @@
+import pickle
+import unittest
+
+from pyNTM import Model
+from pyNTM import ModelException
+from pyNTM import SimulationResult
+
+
+class TestSimulationResult(unittest.TestCase):
+    def setUp(self):
+        self.model = Model.load_model_file("test/model_test_topology.csv")
+        self.result = self.model.update_simulation()
+
+    def _assert_matches_model(self, result, model):
+        for interface in model.interface_objects:
+            self.assertEqual(
+                result.get_interface_traffic(*interface._key), interface.traffic
+            )
+        for lsp in model.rsvp_lsp_objects:
+            if lsp.path == "Unrouted":
+                self.assertEqual(result.get_lsp_path(*lsp._key), "Unrouted")
+                continue
+            self.assertEqual(
+                result.get_lsp_path(*lsp._key),
+                [interface._key for interface in lsp.path["interfaces"]],
+            )
+        for demand in model.demand_objects:
+            path = result.get_demand_path(*demand._key)
+            if demand.path == "Unrouted":
+                self.assertEqual(path, "Unrouted")
+                continue
+            self.assertEqual(
+                sorted(path),
+                sorted([item._key for item in path] for path in demand.path),
+            )
+
+    def test_result_matches_model(self):
+        self.assertIsInstance(self.result, SimulationResult)
+        self.assertEqual(self.result.versions, self.model.versions.key())
+        demand_paths = {
+            demand._key: sorted([item._key for item in path] for path in demand.path)
+            for demand in self.model.demand_objects
+        }
+
+        self.model.load_propagation = "dag"
+        self.model.fail_interface("A-to-B", "A")
+        result = self.model.update_simulation()
+        self._assert_matches_model(result, self.model)
+        self._assert_matches_model(self.model.simulation_result(), self.model)
+        self.assertEqual(result.get_interface_traffic("A-to-B", "A"), "Down")
+        with self.assertRaises(ModelException):
+            result.get_demand_path("A", "D", "no_such_demand")
+
+        # The earlier result still has the routes it was taken with
+        for key, paths in demand_paths.items():
+            self.assertEqual(sorted(self.result.get_demand_path(*key)), paths)
+
+    def test_immutable_and_picklable(self):
+        with self.assertRaises(AttributeError):
+            self.result.lsp_paths = ()
+        with self.assertRaises(TypeError):
+            self.result.interface_traffic[0] = 0
+        result = pickle.loads(pickle.dumps(self.result))
+        self._assert_matches_model(result, self.model)
+        self.assertEqual(result.demand_routes, self.result.demand_routes)
+
+    def test_result_outlives_model_changes(self):
+        fork = self.model.fork()
+        fork.fail_interface("A-to-B", "A")
+        fork_result = fork.update_simulation()
+
+        # The result of the first simulation is unchanged
+        self._assert_matches_model(self.result, self.model)
+        differences = self.result.compare(fork_result)
+        self.assertEqual(differences[("A-to-B", "A")][1], "Down")
+        for key, (traffic, fork_traffic) in differences.items():
+            self.assertEqual(traffic, self.model.get_interface_object(*key).traffic)
+            self.assertEqual(fork_traffic, fork.get_interface_object(*key).traffic)
+
+        peak = SimulationResult.peak_interface_traffic([self.result, fork_result])
+        for interface in self.model.interface_objects:
+            fork_traffic = fork.get_interface_object(*interface._key).traffic
+            if fork_traffic == "Down":
+                fork_traffic = 0
+            self.assertEqual(
+                peak[interface._key][0], max(interface.traffic, fork_traffic)
+            )
+
+    def test_incremental_update(self):
+        self.model.load_propagation = "dag"
+        self.model.rsvp_lsp_objects = set()
+        self.model.update_simulation()
+        self.model.set_demand_traffic("A", "D", "dmd_a_d_1", 20)
+        result = self.model.update_simulation(incremental=True)
+        self._assert_matches_model(result, self.model)
@@ -0,0 +1,162 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from pyNTM import Model
+from pyNTM import ModelException
+from pyNTM.demand_table import DemandTable
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.model_file = os.path.join(self.directory.name, "model.csv")
+        shutil.copy("test/model_test_topology.csv", self.model_file)
+        self.snapshot_file = self.model_file + ".snapshot"
+
+    def _assert_same_simulation(self, model, loaded):
+        for interface in model.interface_objects:
+            self.assertEqual(
+                loaded.get_interface_object(*interface._key).traffic,
+                interface.traffic,
+            )
+        for lsp in model.rsvp_lsp_objects:
+            loaded_lsp = loaded.get_rsvp_lsp(*lsp._key)
+            self.assertEqual(loaded_lsp.reserved_bandwidth, lsp.reserved_bandwidth)
+        for demand in model.demand_objects:
+            loaded_demand = loaded.get_demand_object(*demand._key)
+            self.assertEqual(
+                sorted([item._key for item in path] for path in loaded_demand.path),
+                sorted([item._key for item in path] for path in demand.path),
+            )
+            self.assertEqual(
+                sorted(
+                    path_info["path_traffic"]
+                    for path_info in loaded_demand.path_detail.values()
+                ),
+                sorted(
+                    path_info["path_traffic"]
+                    for path_info in demand.path_detail.values()
+                ),
+            )
+
+    def test_save_load(self):
+        for load_propagation in ("paths", "dag"):
+            model = Model.load_model_file(self.model_file)
+            model.load_propagation = load_propagation
+            model.update_simulation()
+            model.save_snapshot()
+            loaded = Model.load_snapshot(self.snapshot_file)
+            self._assert_same_simulation(model, loaded)
+
+        # The loaded Model tracks its changes and can be updated incrementally
+        before = loaded.versions.key()
+        loaded.fail_interface("A-to-B", "A")
+        loaded.set_demand_traffic("A", "D", "dmd_a_d_1", 20)
+        self.assertNotEqual(loaded.versions.key(), before)
+        loaded.update_simulation(incremental=True)
+        model.fail_interface("A-to-B", "A")
+        model.set_demand_traffic("A", "D", "dmd_a_d_1", 20)
+        model.update_simulation()
+        for interface in model.interface_objects:
+            if interface.traffic == "Down":
+                continue
+            self.assertAlmostEqual(
+                loaded.get_interface_object(*interface._key).traffic,
+                interface.traffic,
+            )
+
+    def _assert_not_reused(self):
+        loaded = Model.load_model_file(self.model_file, use_snapshot=True)
+        self.assertEqual(loaded.get_interface_object("A-to-B", "A").traffic, 0)
+
+    def test_load_model_file_reuses_snapshot(self):
+        model = Model.load_model_file(self.model_file, use_snapshot=True)
+        model.update_simulation()
+        model.save_snapshot()
+        with mock.patch.object(Model, "_read_model_data") as read_model_data:
+            loaded = Model.load_model_file(self.model_file, use_snapshot=True)
+            read_model_data.assert_not_called()
+        self._assert_same_simulation(model, loaded)
+
+        # Only reused when asked for
+        loaded = Model.load_model_file(self.model_file)
+        self.assertEqual(loaded.get_interface_object("A-to-B", "A").traffic, 0)
+
+        # Not reused when the model file changes
+        with open(self.model_file, "a") as f:
+            f.write("\n")
+        self._assert_not_reused()
+
+        # Not reused for a Model loaded without use_snapshot
+        model = Model.load_model_file(self.model_file)
+        model.update_simulation()
+        model.save_snapshot()
+        self._assert_not_reused()
+
+    def test_changed_model_snapshot_not_reused(self):
+        # Including changes that are not versioned
+        for change in (
+            lambda model: setattr(
+                model.get_interface_object("A-to-B", "A"), "cost", 100
+            ),
+            lambda model: setattr(model.get_node_object("A"), "lat", 999),
+            lambda model: setattr(model, "load_propagation", "dag"),
+            lambda model: model.add_srlg("srlg_1"),
+            lambda model: setattr(
+                model.get_demand_object("A", "F", "dmd_a_f_1"), "name", "renamed"
+            ),
+        ):
+            model = Model.load_model_file(self.model_file, use_snapshot=True)
+            change(model)
+            model.update_simulation()
+            model.save_snapshot()
+            self._assert_not_reused()
+
+        # The snapshot keeps the SRLG memberships
+        model = Model.load_model_file(self.model_file, use_snapshot=True)
+        model.add_srlg("srlg_1")
+        model.get_node_object("A").add_to_srlg("srlg_1", model)
+        model.update_simulation()
+        model.save_snapshot()
+        self._assert_not_reused()
+        loaded = Model.load_snapshot(self.snapshot_file)
+        self.assertEqual(
+            {srlg.name for srlg in loaded.get_node_object("A").srlgs}, {"srlg_1"}
+        )
+
+    def test_demand_table(self):
+        model = Model.load_model_file(self.model_file)
+        model.set_demand_table(DemandTable.from_demands(model.demand_objects))
+        model.demand_objects = set()
+        model.update_simulation()
+        model.save_snapshot(self.snapshot_file)
+        loaded = Model.load_snapshot(self.snapshot_file)
+        self._assert_same_simulation(model, loaded)
+
+        # The table is mapped from the snapshot copy-on-write
+        table = loaded.demand_table
+        self.assertEqual(table.traffic.tolist(), model.demand_table.traffic.tolist())
+        table.traffic[table.find("A", "F", "dmd_a_f_1")] = 60
+        self.assertEqual(
+            Model.load_snapshot(self.snapshot_file).demand_table.traffic.tolist(),
+            model.demand_table.traffic.tolist(),
+        )
+
+    def test_bad_snapshot(self):
+        with open(self.snapshot_file, "wb") as f:
+            f.write(b"not a snapshot")
+        with self.assertRaises(ModelException):
+            Model.load_snapshot(self.snapshot_file)
+        # load_model_file reads the model file instead
+        self.assertEqual(
+            len(
+                Model.load_model_file(self.model_file, use_snapshot=True).demand_objects
+            ),
+            4,
+        )
+        with self.assertRaises(ModelException):
+            Model(set(), set(), set(), set()).save_snapshot()
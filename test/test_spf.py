@@ -0,0 +1,157 @@
+import unittest
+
+import networkx as nx
+
+from pyNTM import Model
+from pyNTM.spf import DagRoute
+from pyNTM.spf import SPFDag
+
+
+class TestSPFDag(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.model = Model.load_model_file(
+            "test/parallel_link_model_test_topology_igp_only.csv"
+        )
+        self.model.update_simulation()
+        self.G = self.model._make_weighted_network_graph_mdg(
+            include_failed_circuits=False
+        )
+
+    def test_node_paths_match_all_shortest_paths(self):
+        node_names = sorted(node.name for node in self.model.node_objects)
+        for source in node_names:
+            spf_dag = SPFDag(self.G, source)
+            for dest in node_names:
+                try:
+                    expected = list(
+                        nx.all_shortest_paths(self.G, source, dest, weight="cost")
+                    )
+                except nx.NetworkXNoPath:
+                    self.assertFalse(spf_dag.is_reachable(dest))
+                    continue
+                self.assertEqual(list(spf_dag.node_paths(dest)), expected)
+
+    def test_interface_paths_match_get_all_paths_mdg(self):
+        spf_dag = SPFDag(self.G, "A")
+        nx_sp = list(nx.all_shortest_paths(self.G, "A", "E", weight="cost"))
+        self.assertEqual(
+            spf_dag.interface_paths("E"), self.model._get_all_paths_mdg(self.G, nx_sp)
+        )
+
+    def test_cost(self):
+        spf_dag = SPFDag(self.G, "A")
+        self.assertEqual(
+            spf_dag.cost("E"),
+            nx.shortest_path_length(self.G, "A", "E", weight="cost"),
+        )
+
+    def test_no_path(self):
+        spf_dag = SPFDag(self.G, "A")
+        with self.assertRaises(nx.NetworkXNoPath):
+            spf_dag.node_paths("Z")
+        with self.assertRaises(nx.NetworkXNoPath):
+            spf_dag.cost("Z")
+
+    def test_demands_sharing_source_match_per_demand_routing(self):
+        for demand in self.model.demand_objects:
+            src = demand.source_node_object.name
+            dest = demand.dest_node_object.name
+            try:
+                nx_sp = list(nx.all_shortest_paths(self.G, src, dest, weight="cost"))
+            except nx.NetworkXNoPath:
+                self.assertEqual(demand.path, "Unrouted")
+                continue
+            expected = self.model._normalize_multidigraph_paths(
+                self.model._get_all_paths_mdg(self.G, nx_sp)
+            )
+            self.assertEqual(demand.path, expected)
+
+    def test_interface_traffic(self):
+        spf_dag = SPFDag(self.G, "A")
+        int_a_b = self.model.get_interface_object("A-to-B", "A")
+        int_a_b_2 = self.model.get_interface_object("A-to-B_2", "A")
+        int_b_e = self.model.get_interface_object("B-to-E", "B")
+        int_b_e_2 = self.model.get_interface_object("B-to-E_2", "B")
+        int_b_e_3 = self.model.get_interface_object("B-to-E_3", "B")
+
+        self.assertEqual(
+            spf_dag.interface_traffic("E", 24),
+            {
+                int_a_b: 12.0,
+                int_a_b_2: 12.0,
+                int_b_e: 8.0,
+                int_b_e_2: 8.0,
+                int_b_e_3: 8.0,
+            },
+        )
+
+    def test_next_hops(self):
+        spf_dag = SPFDag(self.G, "A")
+        next_hops = spf_dag.next_hops("E")
+        self.assertEqual(set(next_hops), {"A", "B"})
+        self.assertEqual(len(next_hops["A"]), 2)
+        self.assertEqual(len(next_hops["B"]), 3)
+
+    def test_shared_ecmp_links(self):
+        ecmp_links = {}
+        spf_dag_a = SPFDag(self.G, "A", ecmp_links)
+        spf_dag_d = SPFDag(self.G, "D", ecmp_links)
+        self.assertIs(spf_dag_a._ecmp_links, spf_dag_d._ecmp_links)
+        self.assertEqual(
+            spf_dag_a.ecmp_links("A", "B"), SPFDag(self.G, "A").ecmp_links("A", "B")
+        )
+
+    def test_dag_route_paths(self):
+        spf_dag = SPFDag(self.G, "A")
+        dag_route = DagRoute(spf_dag, "E")
+        self.assertEqual(
+            dag_route.paths(),
+            self.model._normalize_multidigraph_paths(spf_dag.interface_paths("E")),
+        )
+        self.assertEqual(dag_route.node_names(), {"A", "B", "E"})
+        self.assertEqual(
+            dag_route.interfaces(),
+            {
+                interface
+                for egress_interfaces in spf_dag.next_hops("E").values()
+                for interface in egress_interfaces
+            },
+        )
+
+    def _assert_same_dag(self, spf_dag, expected):
+        self.assertEqual(spf_dag.dist, expected.dist)
+        for node_name in expected.dist:
+            self.assertEqual(
+                {
+                    node: set(interfaces)
+                    for node, interfaces in spf_dag.next_hops(node_name).items()
+                },
+                {
+                    node: set(interfaces)
+                    for node, interfaces in expected.next_hops(node_name).items()
+                },
+            )
+
+    def test_repair(self):
+        G = self.model._sync_routing_graph().copy()
+        spf_dag = SPFDag(G, "A")
+        int_a_b = self.model.get_interface_object("A-to-B", "A")
+        int_a_d = self.model.get_interface_object("A-to-D", "A")
+
+        # ECMP link removed: E is still reached the same way, over fewer links
+        G.remove_edge("A", "B", key=int_a_b)
+        repaired, changed = spf_dag.repair(G, {("A", "B")}, {})
+        self._assert_same_dag(repaired, SPFDag(G, "A"))
+        self.assertIn("E", changed)
+        self.assertNotIn("C", changed)
+        self.assertIn(int_a_b, spf_dag.ecmp_links("A", "B"))
+
+        # Cost decrease on an edge that was not on a shortest path
+        G["A"]["D"][int_a_d]["cost"] = 1
+        repaired_2, changed = repaired.repair(G, {("A", "D")}, {})
+        self._assert_same_dag(repaired_2, SPFDag(G, "A"))
+        self.assertIn("D", changed)
+
+        # Changes that do not touch the DAG
+        self.assertEqual(repaired_2.repair(G, {("E", "B")}, {}), (repaired_2, set()))
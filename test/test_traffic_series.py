@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+
+from pyNTM import FlexModel
+from pyNTM import ModelException
+
+
+class TestTrafficSeries(unittest.TestCase):
+    scales = (1, 0.5, 2, 1.5)
+
+    def _load_model(self, model_file):
+        model = FlexModel.load_model_file(model_file)
+        model.update_simulation()
+        return model
+
+    def _series(self, model):
+        demand_keys = sorted(demand._key for demand in model.demand_objects)
+        traffic = np.outer(
+            [model.demand_objects.lookup("key", key)[0].traffic for key in demand_keys],
+            self.scales,
+        )
+        return model.evaluate_traffic_series(traffic, demand_keys)
+
+    def _assert_matches_simulation(self, model_file, series):
+        # Each time step matches a full simulation with the step's traffic
+        for step, scale in enumerate(self.scales):
+            model = FlexModel.load_model_file(model_file)
+            for demand in model.demand_objects:
+                demand.traffic = demand.traffic * scale
+            model.update_simulation()
+            for row, interface_key in enumerate(series["interfaces"]):
+                interface = model.interface_objects.lookup("key", interface_key)[0]
+                self.assertAlmostEqual(
+                    series["traffic"][row, step], interface.traffic, places=3
+                )
+
+    def test_igp_only(self):
+        model_file = "test/parallel_link_model_test_topology_igp_only.csv"
+        model = self._load_model(model_file)
+        model.fail_interface("A-to-B", "A")
+        model.update_simulation()
+        series = self._series(model)
+
+        self.assertEqual(series["rerouted_demands"], [])
+        self.assertEqual(
+            series["utilization"].shape,
+            (len(model.interface_objects), len(self.scales)),
+        )
+        for row, interface_key in enumerate(series["interfaces"]):
+            interface = model.interface_objects.lookup("key", interface_key)[0]
+            if interface.failed:
+                self.assertTrue(np.isnan(series["utilization"][row]).all())
+                self.assertTrue(np.isnan(series["peak_utilization"][row]))
+                continue
+            self.assertAlmostEqual(
+                series["utilization"][row, 0], interface.utilization, places=2
+            )
+            self.assertAlmostEqual(
+                series["peak_utilization"][row], series["utilization"][row, 2]
+            )
+            self.assertAlmostEqual(
+                series["p95_utilization"][row],
+                np.percentile(series["utilization"][row], 95),
+            )
+
+    def test_configured_setup_bandwidth_lsps(self):
+        model = FlexModel.load_model_file("test/model_test_topology.csv")
+        for lsp in model.rsvp_lsp_objects:
+            lsp.configured_setup_bandwidth = 10
+        model.update_simulation()
+        series = self._series(model)
+
+        # LSP paths do not depend on the traffic, so nothing is rerouted
+        self.assertEqual(series["rerouted_demands"], [])
+        for row, interface_key in enumerate(series["interfaces"]):
+            interface = model.interface_objects.lookup("key", interface_key)[0]
+            self.assertAlmostEqual(
+                series["traffic"][row, 2], 2 * interface.traffic, places=3
+            )
+
+    def test_auto_bandwidth_lsps(self):
+        model_file = "test/model_test_topology.csv"
+        model = self._load_model(model_file)
+        series = self._series(model)
+
+        self.assertEqual(
+            series["rerouted_demands"],
+            [("A", "D", "dmd_a_d_1"), ("A", "D", "dmd_a_d_2"), ("F", "E", "dmd_f_e_1")],
+        )
+        self._assert_matches_simulation(model_file, series)
+
+        # The model itself is not rerouted
+        self.assertEqual(model.get_demand_object("A", "D", "dmd_a_d_1").traffic, 80)
+
+    def test_bad_traffic(self):
+        model = self._load_model("test/model_test_topology.csv")
+        with self.assertRaises(ModelException):
+            model.evaluate_traffic_series([1, 2, 3, 4])
+        with self.assertRaises(ModelException):
+            model.evaluate_traffic_series([[1, 2]], [("A", "B", "no_such_demand")])
@@ -0,0 +1,126 @@
+import pickle
+import unittest
+from unittest import mock
+
+from pyNTM import Model
+from pyNTM import Node
+
+
+class TestModelVersions(unittest.TestCase):
+    def setUp(self):
+        self.model = Model.load_model_file("test/model_test_topology.csv")
+        self.model.update_simulation()
+
+    def _assert_bumps(self, kind, change, *other_kinds):
+        versions = self.model.versions
+        before = versions.key()
+        change()
+        for other_kind, version in zip(versions.kinds, before):
+            if other_kind == kind:
+                self.assertGreater(versions[kind], version)
+            elif other_kind not in other_kinds:
+                self.assertEqual(versions[other_kind], version, other_kind)
+
+    def test_setters_bump_versions(self):
+        interface = self.model.get_interface_object("A-to-B", "A")
+        demand = self.model.get_demand_object("A", "D", "dmd_a_d_1")
+        lsp = self.model.get_rsvp_lsp("A", "D", "lsp_a_d_1")
+        node = self.model.get_node_object("A")
+
+        self._assert_bumps("metrics", lambda: setattr(interface, "cost", 5))
+        self._assert_bumps("capacity", lambda: setattr(interface, "capacity", 200))
+        self._assert_bumps(
+            "capacity", lambda: setattr(interface, "percent_reservable_bandwidth", 50)
+        )
+        self._assert_bumps("demands", lambda: setattr(demand, "traffic", 10))
+        self._assert_bumps("lsps", lambda: setattr(lsp, "manual_metric", 5))
+        self._assert_bumps(
+            "lsps", lambda: setattr(lsp, "configured_setup_bandwidth", 10)
+        )
+        self._assert_bumps("lsps", lambda: setattr(node, "igp_shortcuts_enabled", True))
+        self._assert_bumps(
+            "topology",
+            lambda: self.model.fail_interface("A-to-B", "A"),
+            "reservations",
+        )
+
+    def test_membership_bumps_versions(self):
+        self._assert_bumps("demands", lambda: self.model.add_demand("A", "B", 10, "x"))
+        self._assert_bumps("lsps", lambda: self.model.add_rsvp_lsp("A", "B", "x"))
+
+        # Objects taken out of the Model no longer bump its versions
+        demand = self.model.get_demand_object("A", "B", "x")
+        self.model.demand_objects.remove(demand)
+        before = self.model.versions.key()
+        demand.traffic = 20
+        self.assertEqual(self.model.versions.key(), before)
+
+    def test_simulation_only_bumps_reservations(self):
+        self._assert_bumps("reservations", self.model.update_simulation)
+
+    def test_node_equality(self):
+        self.assertEqual(self.model.get_node_object("A"), Node("A", 0, 50))
+
+    def test_parallel_groups_reused(self):
+        lsp_groups = self.model._get_parallel_lsp_groups()
+        demand_groups = self.model._get_parallel_demand_groups()
+        self.model.update_simulation()
+        self.assertIs(self.model._get_parallel_lsp_groups(), lsp_groups)
+        self.assertIs(self.model._get_parallel_demand_groups(), demand_groups)
+        self.assertEqual(self.model.parallel_lsp_groups(), lsp_groups)
+        self.assertEqual(self.model.parallel_demand_groups(), demand_groups)
+
+        self.model.add_rsvp_lsp("A", "B", "lsp_a_b_1")
+        self.model.add_demand("A", "B", 10, "dmd_a_b_1")
+        self.assertIn("A-B", self.model.parallel_lsp_groups())
+        self.assertIn("A-B", self.model.parallel_demand_groups())
+
+    def test_parallel_groups_returned_are_copies(self):
+        unrouted = {
+            lsp for lsp in self.model.rsvp_lsp_objects if lsp.path == "Unrouted"
+        }
+        self.model.parallel_lsp_groups().pop("A-D")
+        self.model.parallel_lsp_groups()["F-E"].clear()
+        self.model.parallel_demand_groups().pop("A-D")
+        self.model.update_simulation()
+        self.assertIn("A-D", self.model.parallel_lsp_groups())
+        self.assertTrue(self.model.parallel_lsp_groups()["F-E"])
+        self.assertIn("A-D", self.model.parallel_demand_groups())
+        self.assertEqual(
+            {lsp for lsp in self.model.rsvp_lsp_objects if lsp.path == "Unrouted"},
+            unrouted,
+        )
+
+    def test_direct_traffic_edit_is_incremental(self):
+        self.model.get_demand_object("A", "F", "dmd_a_f_1").traffic = 60
+        with mock.patch.object(self.model, "_route_lsps") as route_lsps:
+            self.model.update_simulation(incremental=True)
+            route_lsps.assert_not_called()
+        traffic = {
+            interface._key: interface.traffic
+            for interface in self.model.interface_objects
+        }
+
+        self.model.update_simulation()
+        for interface in self.model.interface_objects:
+            self.assertAlmostEqual(traffic[interface._key], interface.traffic)
+
+    def test_lsp_change_falls_back_to_full_update(self):
+        self.model.get_rsvp_lsp("A", "D", "lsp_a_d_1").manual_metric = 5
+        with mock.patch.object(
+            self.model, "_route_lsps", wraps=self.model._route_lsps
+        ) as route_lsps:
+            self.model.update_simulation(incremental=True)
+            route_lsps.assert_called_once()
+
+    def test_pickle(self):
+        model = pickle.loads(pickle.dumps(self.model))
+        before = model.versions.key()
+        model.get_demand_object("A", "D", "dmd_a_d_1").traffic = 10
+        self.assertGreater(model.versions["demands"], before[3])
+        self.assertEqual(self.model.versions.key(), before)
+
+        model.add_demand("A", "B", 10, "dmd_a_b_1")
+        self.assertEqual(
+            model.demand_objects._version, self.model.demand_objects._version + 1
+        )